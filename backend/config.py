@@ -6,6 +6,7 @@ class Settings(BaseSettings):
     PROJECT_NAME: str = "Atlas VPN Panel"
     VERSION: str = "6.0.0"
     API_PREFIX: str = "/api"
+    DEBUG: bool = False
     
     BASE_DIR: Path = Path(__file__).resolve().parent.parent
     DATA_DIR: Path = BASE_DIR / "data"
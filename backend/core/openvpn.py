@@ -10,15 +10,21 @@ import shutil
 import asyncio
 import threading
 import re
+import shlex
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Iterator
+from types import MappingProxyType, SimpleNamespace
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Iterator, Union
 from fastapi import HTTPException
-from datetime import datetime
+from datetime import datetime, timezone
+import bisect
+import functools
 import qrcode
-import io
-import base64
+import binascii
+import struct
+import zlib
 from urllib.parse import urlparse
 from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
 
 from backend.core.config import (
     OPENVPN_ATLAS_DB_PATH,
@@ -38,11 +44,163 @@ from backend.core.config import (
 from backend.core.pki import PKIManager
 from backend.services.protocols.base_vpn_service import BaseVPNService
 
+try:
+    # Optional libsystemd bindings: one long-lived D-Bus connection instead of forking systemctl.
+    from pystemd.systemd1 import Unit as SystemdUnit
+except ImportError:  # pragma: no cover - pystemd is optional
+    SystemdUnit = None
+
 logger = logging.getLogger(__name__)
 
+QR_ERROR_CORRECTION = qrcode.constants.ERROR_CORRECT_L
+# Any mask decodes; pinning one skips the 8-way mask penalty search.
+QR_MASK_PATTERN = 0
+# Byte-mode payload capacity per QR version (index 0 -> version 1).
+QR_BYTE_CAPACITY = tuple(
+    (bit_limit - 4 - qrcode.util.length_in_bits(qrcode.util.MODE_8BIT_BYTE, version)) // 8
+    for version, bit_limit in enumerate(qrcode.util.BIT_LIMIT_TABLE[QR_ERROR_CORRECTION])
+    if version
+)
+# The panel scales the image down to 256 px; 4 px per module still scans reliably and
+# cuts the pixel data the PNG encoder has to walk by more than 6x versus 10 px.
+QR_BOX_SIZE = 4
+QR_BORDER = 4
+# QR bitmaps are 1-bit and highly repetitive: level 1 is far faster than the default
+# level 6 for a negligible size difference, and the data URI is short-lived anyway.
+QR_PNG_COMPRESSION_LEVEL = 1
+QR_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# Pristine compressor copied per image so zlib state is allocated once per process.
+_qr_png_compressor_template = zlib.compressobj(QR_PNG_COMPRESSION_LEVEL, zlib.DEFLATED, 15, 9)
+_qr_png_compressor_lock = threading.Lock()
+_qr_builders = threading.local()
+PNG_DATA_URI_PREFIX = b"data:image/png;base64,"
+# Multiple of 3 so each chunk base64-encodes without padding.
+QR_BASE64_CHUNK_BYTES = 3 * 16 * 1024
+# QR delivery only helps camera-based mobile onboarding; desktop clients import the .ovpn file.
+QR_CODE_OS_TYPES = frozenset({"ios", "android"})
+QR_CODE_UNSPECIFIED_OS_TYPES = frozenset({"", "default"})
+# (unix second, ISO string) of the last client config header timestamp.
+_generated_timestamp: Tuple[int, str] = (-1, "")
+
 # Detect if running on Linux (production) or Mac/Windows (development)
 IS_LINUX = platform.system() == "Linux"
 
+# `systemctl show --property=ActiveState,UnitFileState` emits short KEY=value lines.
+SYSTEMCTL_SHOW_PROPERTIES = "ActiveState,UnitFileState"
+SYSTEMCTL_SHOW_RE = re.compile(rb"^(ActiveState|UnitFileState)=(\S*)$", re.MULTILINE)
+ENABLED_UNIT_FILE_STATES = frozenset({b"enabled", b"static", b"indirect", b"generated"})
+SERVICE_CONTROL_ACTIONS = frozenset({"start", "stop", "restart", "enable", "disable"})
+# Actions that queue a systemd job, as systemctl verbs and org.freedesktop.systemd1.Unit methods
+# (enable/disable are synchronous Manager calls). restart uses the unit's ExecReload when it has one.
+SYSTEMCTL_JOB_VERBS = {"start": "start", "stop": "stop", "restart": "reload-or-restart"}
+SYSTEMD_UNIT_JOB_METHODS = {"start": "Start", "stop": "Stop", "restart": "ReloadOrRestart"}
+SYSTEMCTL_JOB_SHOW_RE = re.compile(rb"^(ActiveState|Job)=(\S*)$", re.MULTILINE)
+# Jobs are always queued without blocking; callers that wait poll the unit for at most this long
+# and otherwise report the job as still running, so a slow unit can't pin a request worker.
+SERVICE_JOB_SETTLE_TIMEOUT_SECONDS = 10.0
+SERVICE_JOB_POLL_INTERVAL_SECONDS = 0.25
+TRANSITIONAL_ACTIVE_STATES = frozenset({b"activating", b"deactivating", b"reloading"})
+# Collapse dashboard/health-check polling bursts into a single systemctl fork.
+SERVICE_STATUS_CACHE_TTL_SECONDS = 1.0
+# Status file rewrite interval; fresh enough for the management-unavailable fallback.
+STATUS_LOG_REFRESH_SECONDS = 5
+# `load-stats` replies with a single "SUCCESS: nclients=N,bytesin=N,bytesout=N" line.
+MANAGEMENT_LOAD_STATS_RE = re.compile(r"\b(nclients|bytesin|bytesout)=(\d+)")
+# Hostname of a bare domain or URL: optional scheme and userinfo, stop at port/path.
+CERT_DOMAIN_RE = re.compile(r"(?:[a-z][a-z0-9+.-]*://)?(?:[^@/?#\s]*@)?([^/:?#@\s]+)", re.IGNORECASE)
+# First PEM certificate block of an easy-rsa issued cert (which prefixes it with a text dump).
+PEM_CERTIFICATE_RE = re.compile(r"-----BEGIN CERTIFICATE-----\s+.*?\s+-----END CERTIFICATE-----", re.DOTALL)
+# Header stamp that changes on every render; ignored when deciding whether server.conf changed.
+SERVER_CONF_GENERATED_RE = re.compile(r"^# Generated: .*$", re.MULTILINE)
+# Accepted server.conf values; anything else is rejected by `generate_server_config`.
+SERVER_PROTOCOLS = frozenset({"udp", "tcp", "udp6", "tcp6"})
+UDP_PROTOCOLS = frozenset({"udp", "udp6"})
+TCP_PROTOCOLS = frozenset({"tcp", "tcp6"})
+SERVER_DEVICE_TYPES = frozenset({"tun", "tap"})
+SERVER_TLS_VERSIONS = frozenset({"1.2", "1.3"})
+SERVER_TLS_MODES = frozenset({"tls-crypt", "tls-auth", "none"})
+SERVER_AUTH_DIGESTS = frozenset({"SHA256", "SHA384", "SHA512"})
+# Directives that would silently disable DCO; dropped from custom/pushed server directives.
+DCO_INCOMPATIBLE_DIRECTIVES = ("comp-lzo", "compress", "disable-dco", "packet-filter")
+# DCO-capable AEAD ciphers; also the client suite when none is stored.
+DEFAULT_DATA_CIPHERS = "AES-256-GCM:AES-128-GCM:CHACHA20-POLY1305"
+# Client lines mentioning compression are dropped outright; Apple additionally rejects
+# these directives by name (the directive itself or the directive followed by arguments).
+COMPRESSION_DIRECTIVE_RE = re.compile(r"comp-lzo|compress", re.IGNORECASE)
+APPLE_BLOCKED_DIRECTIVE_RE = re.compile(
+    r"(?:sndbuf|rcvbuf|comp-lzo|compress|explicit-exit-notify|block-outside-dns)(?: |$)",
+    re.IGNORECASE,
+)
+# Apple clients manage MTU/keepalive themselves; iOS additionally rejects persistence directives.
+APPLE_DROPPED_DIRECTIVE_PREFIXES = ("tun-mtu ", "mssfix ", "keepalive ")
+IOS_DROPPED_DIRECTIVES = frozenset({"persist-key", "persist-tun", "resolv-retry infinite"})
+# Tuning directives Android/Windows/Linux clients negotiate themselves; Android also drops persistence.
+CLIENT_TUNING_DIRECTIVE_PREFIXES = ("tun-mtu ", "mssfix ", "keepalive ", "sndbuf ", "rcvbuf ")
+ANDROID_DROPPED_DIRECTIVES = frozenset({"resolv-retry infinite", "persist-key", "persist-tun"})
+# Settings consumed by `_build_client_transport_directives`, copied out in one pass.
+OBFUSCATION_SETTING_KEYS = (
+    "obfuscation_mode",
+    "proxy_server",
+    "proxy_address",
+    "proxy_port",
+    "spoofed_host",
+    "socks_server",
+    "socks_port",
+    "stunnel_port",
+    "sni_domain",
+    "cdn_domain",
+    "ws_path",
+    "ws_port",
+)
+# OS name -> extra directives tuned for that client platform.
+OS_SPECIFIC_DIRECTIVES = MappingProxyType({
+    "windows": "setenv opt block-outside-dns\nregister-dns",
+    "mac": "resolv-retry 30\nroute-delay 2",
+    "macos": "resolv-retry 30\nroute-delay 2",
+    "ios": "resolv-retry 30\nexplicit-exit-notify",
+    "mac_ios": "resolv-retry 30\nexplicit-exit-notify",
+    "android": "explicit-exit-notify\nremote-cert-tls server",
+    "linux": "resolv-retry infinite\nscript-security 2",
+})
+# OS name -> (builder method, os_type forwarded to it); other names use `_generate_default_config`.
+CLIENT_CONFIG_BUILDERS = {
+    "ios": ("_generate_apple_config", "ios"),
+    "mac": ("_generate_apple_config", "mac"),
+    "macos": ("_generate_apple_config", "macos"),
+    "android": ("_generate_android_config", None),
+    "windows": ("_generate_windows_config", None),
+    "win": ("_generate_windows_config", None),
+}
+# OS name -> per-OS custom directive setting appended by `_generate_default_config`.
+CUSTOM_DIRECTIVE_SETTING_KEYS = {
+    "ios": "custom_ios",
+    "android": "custom_android",
+    "windows": "custom_windows",
+    "mac": "custom_mac",
+    "macos": "custom_mac",
+}
+# Distinct settings combinations (one per OS verbosity/MSS variant) worth keeping rendered.
+CLIENT_SETTINGS_BLOCK_CACHE_SIZE = 64
+# CA/TLS keys plus a cert and key per recently rendered client.
+PKI_FILE_CACHE_SIZE = 512
+# Exact spellings seen from settings/UI; anything else goes through the full normalization.
+TRANSPORT_PROTOCOLS = {
+    None: "udp",
+    "": "udp",
+    "udp": "udp",
+    "UDP": "udp",
+    "udp6": "udp",
+    "tcp": "tcp",
+    "TCP": "tcp",
+    "tcp6": "tcp",
+    "tcp-server": "tcp",
+    "tcp6-server": "tcp",
+}
+# Firewall commands travel as (argv, display string) so the string is joined once.
+FirewallCommand = Tuple[Tuple[str, ...], str]
+# Per-rule markers echoed by the batched firewall script (see `_run_firewall_batch`).
+FIREWALL_BATCH_STATUS_RE = re.compile(r"^(OK|FALLBACK|FAIL):(\d+)$", re.MULTILINE)
+
 
 class OpenVPNConfig:
     """
@@ -84,41 +242,35 @@ class OpenVPNConfig:
     SERVICE_CANDIDATES = OPENVPN_SERVICE_CANDIDATES
 
 
-class MockOpenVPNResponse:
-    """Mock responses for development environment"""
-    
-    @staticmethod
-    def easyrsa_build_client(client_name: str) -> str:
-        return f"""
+# Canned dev-mode command output; only the client name varies per call.
+MOCK_EASYRSA_BUILD_CLIENT_OUTPUT = """
 Note: using Easy-RSA configuration from: /etc/openvpn/easy-rsa/vars
 Using SSL: openssl OpenSSL 3.0.2 15 Mar 2022 (Library: OpenSSL 3.0.2 15 Mar 2022)
 
 Notice
 ------
 Keypair and certificate request completed. Your files are:
-req: /etc/openvpn/easy-rsa/pki/reqs/{client_name}.req
-key: /etc/openvpn/easy-rsa/pki/private/{client_name}.key
+req: /etc/openvpn/easy-rsa/pki/reqs/$client_name.req
+key: /etc/openvpn/easy-rsa/pki/private/$client_name.key
 
 Notice
 ------
-Certificate created at: /etc/openvpn/easy-rsa/pki/issued/{client_name}.crt
+Certificate created at: /etc/openvpn/easy-rsa/pki/issued/$client_name.crt
 """
-    
-    @staticmethod
-    def easyrsa_revoke(client_name: str) -> str:
-        return f"""
+
+MOCK_EASYRSA_REVOKE_OUTPUT = """
 Note: using Easy-RSA configuration from: /etc/openvpn/easy-rsa/vars
 Using SSL: openssl OpenSSL 3.0.2 15 Mar 2022
 
 Please confirm you wish to revoke the certificate with the following subject:
 
 subject=
-    commonName                = {client_name}
+    commonName                = $client_name
 
 Type the word 'yes' to continue, or any other input to abort.
   Continue with revocation: yes
 
-Revoking Certificate {client_name}.
+Revoking Certificate $client_name.
 Data Base Updated
 
 IMPORTANT!!!
@@ -126,10 +278,8 @@ IMPORTANT!!!
 Revocation was successful. You must run gen-crl and upload a CRL to your
 infrastructure in order to prevent the revoked cert from being accepted.
 """
-    
-    @staticmethod
-    def systemctl_status() -> str:
-        return """
+
+MOCK_SYSTEMCTL_STATUS_OUTPUT = """
 ● openvpn-server@server.service - OpenVPN service for server
      Loaded: loaded (/lib/systemd/system/openvpn-server@.service; enabled; vendor preset: enabled)
      Active: active (running) since Tue 2026-02-25 14:00:00 UTC; 1h ago
@@ -147,6 +297,55 @@ Feb 25 14:00:00 atlas systemd[1]: Starting OpenVPN service for server...
 Feb 25 14:00:00 atlas systemd[1]: Started OpenVPN service for server.
 """
 
+MOCK_SYSTEMCTL_SHOW_OUTPUT = "ActiveState=active\nUnitFileState=enabled\n"
+
+
+class MockOpenVPNResponse:
+    """Mock responses for development environment"""
+    
+    @staticmethod
+    def easyrsa_build_client(client_name: str) -> str:
+        return MOCK_EASYRSA_BUILD_CLIENT_OUTPUT.replace("$client_name", client_name)
+    
+    @staticmethod
+    def easyrsa_revoke(client_name: str) -> str:
+        return MOCK_EASYRSA_REVOKE_OUTPUT.replace("$client_name", client_name)
+    
+    @staticmethod
+    def systemctl_status() -> str:
+        return MOCK_SYSTEMCTL_STATUS_OUTPUT
+
+    @staticmethod
+    def systemctl_show() -> str:
+        return MOCK_SYSTEMCTL_SHOW_OUTPUT
+
+    @staticmethod
+    def easyrsa(cmd: List[str]) -> Optional[str]:
+        _, verb, client_name, *_ = (*cmd, "", "")
+        if verb == "build-client-full":
+            return MockOpenVPNResponse.easyrsa_build_client(client_name or "client")
+        if verb == "revoke":
+            return MockOpenVPNResponse.easyrsa_revoke(client_name or "client")
+        if verb == "gen-crl":
+            return "CRL generated successfully"
+        return None
+
+    @staticmethod
+    def systemctl(cmd: List[str]) -> Optional[str]:
+        _, action, *_ = (*cmd, "unknown")
+        if action == "status":
+            return MockOpenVPNResponse.systemctl_status()
+        if action == "show":
+            return MockOpenVPNResponse.systemctl_show()
+        return f"Service {action} completed successfully"
+
+
+# Dev-mode command handlers keyed on the executable basename; None falls back to a generic reply.
+MOCK_COMMAND_HANDLERS = {
+    "easyrsa": MockOpenVPNResponse.easyrsa,
+    "systemctl": MockOpenVPNResponse.systemctl,
+}
+
 
 def validate_openvpn_readiness(general_settings, openvpn_settings) -> List[str]:
     """
@@ -180,6 +379,177 @@ def validate_openvpn_readiness(general_settings, openvpn_settings) -> List[str]:
     return missing
 
 
+def _qr_version_for_payload(payload: bytes) -> int:
+    """Return the smallest QR version that fits a byte-mode payload."""
+    index = bisect.bisect_left(QR_BYTE_CAPACITY, len(payload))
+    if index >= len(QR_BYTE_CAPACITY):
+        raise ValueError(
+            f"Payload of {len(payload)} bytes exceeds QR capacity ({QR_BYTE_CAPACITY[-1]} bytes)"
+        )
+    return index + 1
+
+
+def qr_code_enabled_for_os(os_type: Optional[str]) -> bool:
+    """
+    Return whether a QR code is worth rendering for the target client OS.
+    Unspecified platforms keep the caller's explicit opt-in; desktop platforms never get one.
+    """
+    normalized = (os_type or "").strip().lower()
+    return normalized in QR_CODE_OS_TYPES or normalized in QR_CODE_UNSPECIFIED_OS_TYPES
+
+
+def _png_chunk(chunk_type: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + chunk_type + data + struct.pack(">I", zlib.crc32(chunk_type + data))
+
+
+def _encode_qr_png(modules: List[List[bool]], box_size: int = QR_BOX_SIZE, border: int = QR_BORDER) -> bytes:
+    """Encode a QR module matrix as a 1-bit greyscale PNG (dark modules are black)."""
+    size = (len(modules) + 2 * border) * box_size
+    row_bytes = (size + 7) // 8
+    padding = "0" * (row_bytes * 8 - size)
+    quiet = "1" * (border * box_size)
+    dark, light = "0" * box_size, "1" * box_size
+
+    blank_scanline = b"\x00" + int("1" * size + padding, 2).to_bytes(row_bytes, "big")
+    border_block = blank_scanline * (border * box_size)
+
+    with _qr_png_compressor_lock:
+        compressor = _qr_png_compressor_template.copy()
+
+    idat = [compressor.compress(border_block)]
+    for module_row in modules:
+        bits = quiet + "".join(dark if module else light for module in module_row) + quiet + padding
+        scanline = b"\x00" + int(bits, 2).to_bytes(row_bytes, "big")
+        idat.append(compressor.compress(scanline * box_size))
+    idat.append(compressor.compress(border_block))
+    idat.append(compressor.flush())
+
+    header = struct.pack(">IIBBBBB", size, size, 1, 0, 0, 0, 0)
+    return b"".join((
+        QR_PNG_SIGNATURE,
+        _png_chunk(b"IHDR", header),
+        _png_chunk(b"IDAT", b"".join(idat)),
+        _png_chunk(b"IEND", b""),
+    ))
+
+
+def _build_png_data_uri(png_bytes: bytes) -> str:
+    """
+    Base64-encode PNG bytes into a single preallocated data URI buffer.
+    Encoding in bounded chunks avoids holding a full-size base64 copy next to the result.
+    """
+    prefix_length = len(PNG_DATA_URI_PREFIX)
+    out = bytearray(prefix_length + 4 * ((len(png_bytes) + 2) // 3))
+    out[:prefix_length] = PNG_DATA_URI_PREFIX
+
+    png_view = memoryview(png_bytes)
+    offset = prefix_length
+    for start in range(0, len(png_bytes), QR_BASE64_CHUNK_BYTES):
+        encoded = binascii.b2a_base64(png_view[start:start + QR_BASE64_CHUNK_BYTES], newline=False)
+        out[offset:offset + len(encoded)] = encoded
+        offset += len(encoded)
+
+    return out.decode("ascii")
+
+
+def _get_qr_builder() -> qrcode.QRCode:
+    """Return this thread's reusable QRCode builder (call clear() before each use)."""
+    qr = getattr(_qr_builders, "qr", None)
+    if qr is None:
+        qr = qrcode.QRCode(
+            error_correction=QR_ERROR_CORRECTION,
+            box_size=QR_BOX_SIZE,
+            border=QR_BORDER,
+            mask_pattern=QR_MASK_PATTERN,
+        )
+        _qr_builders.qr = qr
+    return qr
+
+
+def render_qr_data_uri(config_content: str) -> str:
+    """
+    Render a config payload as a base64 PNG data URI.
+
+    Runs on the calling thread; each thread reuses its own QRCode builder, so
+    concurrent request workers never share encoder state.
+    """
+    payload = config_content.encode("utf-8")
+    qr = _get_qr_builder()
+    qr.clear()
+    qr.version = _qr_version_for_payload(payload)
+    qr.add_data(payload, optimize=0)
+    qr.make(fit=False)
+
+    # Encode the module matrix straight to PNG; no PIL/PyPNG image object needed.
+    png_bytes = _encode_qr_png(qr.modules)
+    return _build_png_data_uri(png_bytes)
+
+
+def _render_qr_data_uri_or_none(config_content: str) -> Optional[str]:
+    try:
+        return render_qr_data_uri(config_content)
+    except Exception as e:
+        logger.error(f"QR code generation failed: {e}")
+        return None
+
+
+def _generated_timestamp_iso() -> str:
+    """UTC timestamp for config headers, formatted at most once per wall-clock second."""
+    global _generated_timestamp
+    second = int(time.time())
+    cached_second, cached_value = _generated_timestamp
+    if cached_second != second:
+        cached_value = datetime.fromtimestamp(second, timezone.utc).replace(tzinfo=None).isoformat()
+        _generated_timestamp = (second, cached_value)
+    return cached_value
+
+
+@functools.lru_cache(maxsize=PKI_FILE_CACHE_SIZE)
+def _read_pki_file_cached(path: str, mtime_ns: int, size: int) -> str:
+    with open(path, "r") as f:
+        return f.read()
+
+
+def _read_pki_file(path: Path) -> str:
+    """Read a PKI file, reusing the cached content until its mtime or size changes."""
+    stat_result = os.stat(path)
+    return _read_pki_file_cached(str(path), stat_result.st_mtime_ns, stat_result.st_size)
+
+
+def _write_file_atomic(path: Path, content: str) -> None:
+    """
+    Replace a file in one write + rename so readers never see a truncated config.
+    An existing file keeps its permission bits.
+    """
+    data = content.encode("utf-8")
+    try:
+        mode = os.stat(path).st_mode & 0o7777
+    except FileNotFoundError:
+        mode = 0o644
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+        os.fchmod(fd, mode)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp_path, path)
+
+
+def _normalize_setting_value(value: Any) -> str:
+    """Stripped, lower-cased setting; values that are already normalized are returned as-is."""
+    if isinstance(value, str) and value.islower() and not value[0].isspace() and not value[-1].isspace():
+        return value
+    return str(value).strip().lower()
+
+
+def _firewall_command(*argv: str) -> FirewallCommand:
+    return argv, " ".join(argv)
+
+
 def _safe_int(value, default=None):
     """Stage 2: The Safe Builder - Convert to int safely."""
     try:
@@ -190,6 +560,218 @@ def _safe_int(value, default=None):
         return default
 
 
+def _proxy_target(server_address: str, obfuscation_settings: Dict[str, any]) -> str:
+    proxy_server = (obfuscation_settings.get("proxy_server") or "").strip()
+    proxy_address = (obfuscation_settings.get("proxy_address") or "").strip()
+    return proxy_server or proxy_address or server_address
+
+
+def _stealth_transport(server_address: str, obfuscation_settings: Dict[str, any]) -> Tuple[str, str, List[str]]:
+    directives: List[str] = ["http-proxy-retry"]
+    spoofed_host = (obfuscation_settings.get("spoofed_host") or "").strip()
+    if spoofed_host:
+        directives.append(f"http-proxy-option CUSTOM-HEADER Host {spoofed_host}")
+    return "tcp", f"remote {server_address} 443", directives
+
+
+def _http_proxy_basic_transport(server_address: str, obfuscation_settings: Dict[str, any]) -> Tuple[str, str, List[str]]:
+    proxy_port = int(obfuscation_settings.get("proxy_port") or 8080)
+    directives = [
+        f"http-proxy {_proxy_target(server_address, obfuscation_settings)} {proxy_port}",
+        "http-proxy-retry",
+    ]
+    return "tcp", f"remote {server_address} 443", directives
+
+
+def _http_proxy_advanced_transport(server_address: str, obfuscation_settings: Dict[str, any]) -> Tuple[str, str, List[str]]:
+    protocol, remote_line, directives = _http_proxy_basic_transport(server_address, obfuscation_settings)
+    spoofed_host = (obfuscation_settings.get("spoofed_host") or "").strip()
+    if spoofed_host:
+        directives.append(f"http-proxy-option CUSTOM-HEADER Host {spoofed_host}")
+    return protocol, remote_line, directives
+
+
+def _socks5_transport(server_address: str, obfuscation_settings: Dict[str, any]) -> Tuple[str, str, List[str]]:
+    socks_server = (obfuscation_settings.get("socks_server") or "").strip()
+    socks_target = socks_server or _proxy_target(server_address, obfuscation_settings)
+    socks_target_port = int(obfuscation_settings.get("socks_port") or 1080)
+    directives = [
+        f"socks-proxy {socks_target} {socks_target_port}",
+        "socks-proxy-retry",
+    ]
+    return "tcp", f"remote {server_address} 443", directives
+
+
+def _tls_tunnel_transport(server_address: str, obfuscation_settings: Dict[str, any]) -> Tuple[str, str, List[str]]:
+    stunnel_port = int(obfuscation_settings.get("stunnel_port") or 443)
+    sni_domain = (obfuscation_settings.get("sni_domain") or "").strip()
+    directives = [
+        "# TLS tunnel mode: run local Stunnel client before connecting.",
+    ]
+    if sni_domain:
+        directives.append(f"# TLS SNI domain hint: {sni_domain}")
+    return "tcp", f"remote 127.0.0.1 {stunnel_port}", directives
+
+
+def _websocket_cdn_transport(server_address: str, obfuscation_settings: Dict[str, any]) -> Tuple[str, str, List[str]]:
+    ws_path = (obfuscation_settings.get("ws_path") or "/stream").strip() or "/stream"
+    ws_port = int(obfuscation_settings.get("ws_port") or 8080)
+    cdn_host = OpenVPNManager._extract_remote_hostname(obfuscation_settings.get("cdn_domain") or "")
+    directives = [
+        f"# WebSocket path hint: {ws_path}",
+        f"# Local WebSocket port hint: {ws_port}",
+    ]
+    return "tcp", f"remote {cdn_host or server_address} 443", directives
+
+
+@functools.lru_cache(maxsize=32)
+def _cipher_suite_directives(raw: Union[str, Tuple[Any, ...]]) -> Tuple[str, str]:
+    if isinstance(raw, tuple):
+        data_ciphers = ":".join(stripped for cipher in raw if cipher and (stripped := cipher.strip()))
+    else:
+        data_ciphers = raw.strip() or DEFAULT_DATA_CIPHERS
+    fallback = data_ciphers.split(":")[0].strip() if ":" in data_ciphers else data_ciphers
+    return data_ciphers, fallback
+
+
+def _normalize_cipher_suite(raw: Any) -> Tuple[str, str]:
+    """Return (data-ciphers, data-ciphers-fallback) for a stored list or colon-separated cipher suite."""
+    raw = raw or DEFAULT_DATA_CIPHERS
+    if isinstance(raw, list):
+        return _cipher_suite_directives(tuple(raw))
+    return _cipher_suite_directives(str(raw))
+
+
+def _is_dco_incompatible_directive(directive: str) -> bool:
+    normalized = str(directive or "").strip().lower()
+    if not normalized:
+        return False
+
+    normalized = normalized.strip('"\'')
+    return any(
+        normalized == blocked or normalized.startswith(f"{blocked} ")
+        for blocked in DCO_INCOMPATIBLE_DIRECTIVES
+    )
+
+
+def _iter_route_push_lines(push_custom_routes: str) -> Iterator[str]:
+    """Yield `push "route ..."` lines for comma or newline separated routes."""
+    for segment in push_custom_routes.replace(",", "\n").splitlines():
+        route = segment.strip()
+        if route:
+            yield f'push "route {route.replace("route ", "").strip()}"'
+
+
+def _iter_advanced_push_lines(advanced_client_push: str) -> Iterator[str]:
+    """Yield advanced push directives, wrapping bare ones and skipping DCO-incompatible ones."""
+    for line in advanced_client_push.splitlines():
+        directive = line.strip()
+        if not directive:
+            continue
+        is_push = directive.startswith("push ")
+        directive_body = directive[5:].strip().strip('"').strip("'") if is_push else directive
+        if _is_dco_incompatible_directive(directive_body):
+            logger.warning("Skipping DCO-incompatible advanced push directive: %s", directive)
+            continue
+        yield directive if is_push else f'push "{directive}"'
+
+
+def _stripped_setting(value: Any) -> str:
+    return (value or "").strip()
+
+
+def _auth_nocache_enabled(value: Any) -> bool:
+    return _normalize_setting_value(value) not in {"0", "false", "no", "off"}
+
+
+# (setting, default when missing, caster) for the typed values every client builder reads.
+CLIENT_SETTING_FIELDS = (
+    ("device_type", "tun", _normalize_setting_value),
+    ("auth_digest", None, lambda value: str(value or "SHA256").strip().upper()),
+    ("tls_version_min", None, lambda value: str(value or "1.2").strip()),
+    ("tls_mode", None, lambda value: _normalize_setting_value(value or "tls-crypt")),
+    ("verbosity", None, _safe_int),
+    ("tun_mtu", None, _safe_int),
+    ("mssfix", None, _safe_int),
+    ("sndbuf", None, _safe_int),
+    ("rcvbuf", None, _safe_int),
+    ("explicit_exit_notify", None, _safe_int),
+    ("keepalive_ping", None, _safe_int),
+    ("keepalive_timeout", None, _safe_int),
+    ("tcp_nodelay", False, bool),
+    ("redirect_gateway", False, bool),
+    ("fast_io", False, bool),
+    ("persist_key", True, bool),
+    ("persist_tun", True, bool),
+    ("primary_dns", None, _stripped_setting),
+    ("secondary_dns", None, _stripped_setting),
+    ("push_custom_routes", None, _stripped_setting),
+    ("enable_auth_nocache", True, _auth_nocache_enabled),
+)
+
+
+def _read_client_setting_values(openvpn_settings: Dict[str, any]) -> SimpleNamespace:
+    """Cast the client builder settings in one pass over `CLIENT_SETTING_FIELDS`."""
+    get = openvpn_settings.get
+    return SimpleNamespace(**{key: caster(get(key, default)) for key, default, caster in CLIENT_SETTING_FIELDS})
+
+
+# Obfuscation mode -> (protocol, remote line, extra directives); unknown modes use the plain transport.
+OBFUSCATION_TRANSPORT_BUILDERS = {
+    "stealth": _stealth_transport,
+    "http_proxy_basic": _http_proxy_basic_transport,
+    "http_proxy_advanced": _http_proxy_advanced_transport,
+    "socks5_proxy_injection": _socks5_transport,
+    "tls_tunnel": _tls_tunnel_transport,
+    "websocket_cdn": _websocket_cdn_transport,
+}
+
+
+@functools.lru_cache(maxsize=CLIENT_SETTINGS_BLOCK_CACHE_SIZE)
+def _render_client_settings_block(
+    verbosity: int,
+    client_data_ciphers: str,
+    data_cipher_fallback: str,
+    auth_digest: str,
+    tls_version_min: str,
+    tls_mode: str,
+    tun_mtu: Optional[int],
+    mssfix: Optional[int],
+    keepalive_ping: Optional[int],
+    keepalive_timeout: Optional[int],
+    push_custom_routes: str,
+) -> Tuple[str, ...]:
+    """Render the settings-only part of the client base config (remote-cert-tls through routes).
+
+    Every client and OS variant rendered from the same settings shares this
+    block, so it is built once per distinct settings tuple and extended as-is.
+    """
+    lines: List[str] = ["remote-cert-tls server", f"verb {verbosity}"]
+
+    if client_data_ciphers:
+        lines.append(f"data-ciphers {client_data_ciphers}")
+    if data_cipher_fallback:
+        lines.append(f"data-ciphers-fallback {data_cipher_fallback}")
+    if auth_digest:
+        lines.append(f"auth {auth_digest}")
+    if tls_version_min:
+        lines.append(f"tls-version-min {tls_version_min}")
+    if tls_mode == "tls-auth":
+        lines.append("key-direction 1")
+
+    if tun_mtu:
+        lines.append(f"tun-mtu {int(tun_mtu)}")
+    if mssfix:
+        lines.append(f"mssfix {int(mssfix)}")
+    if keepalive_ping and keepalive_timeout:
+        lines.append(f"keepalive {int(keepalive_ping)} {int(keepalive_timeout)}")
+
+    if push_custom_routes:
+        lines.extend(f"route {route_clean}" for route_line in push_custom_routes.splitlines() if (route_clean := route_line.strip()))
+
+    return tuple(lines)
+
+
 class OpenVPNManager(BaseVPNService):
     """
     Core OpenVPN management logic.
@@ -202,6 +784,15 @@ class OpenVPNManager(BaseVPNService):
         self.is_production = IS_LINUX
         self.protocol_name = "openvpn"
         self.service_name = self.config.SERVICE_NAME
+        # Unit name detection forks systemctl per candidate; redo it only when it may have changed.
+        self._service_name_stale = False
+        self._status_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+        self._status_cache_lock = threading.Lock()
+        self._systemd_unit: Optional[Tuple[str, Any]] = None
+        self._settings_cache: Optional[Tuple[int, Dict[str, Any], Dict[str, Any]]] = None
+        self._settings_version = 0
+        self._settings_cache_lock = threading.Lock()
+        self._status_log_cache: Optional[Tuple[Tuple[int, int], List[Dict[str, Any]]]] = None
         self.pki_manager = PKIManager(
             easyrsa_dir=self.config.EASYRSA_DIR,
             pki_dir=self.config.PKI_DIR,
@@ -239,6 +830,15 @@ class OpenVPNManager(BaseVPNService):
         )
         return self.config.SERVICE_NAME
 
+    def _refresh_service_name_if_stale(self) -> None:
+        if not self._service_name_stale or not self.is_production:
+            return
+        self._service_name_stale = False
+        try:
+            self.service_name = self._resolve_service_name()
+        except Exception as exc:
+            logger.warning("OpenVPN service unit re-detection failed: %s", exc)
+
     def _get_server_conf_paths(self) -> Tuple[Path, Path]:
         """Return (primary, compatibility_copy) server.conf paths."""
         if self.service_name == "openvpn@server":
@@ -340,6 +940,23 @@ class OpenVPNManager(BaseVPNService):
 
     def get_active_sessions(self) -> List[Dict[str, Any]]:
         """Return active OpenVPN sessions from management interface (status 3)."""
+        success, response = self._send_management_command("status 3")
+        return self._parse_active_sessions(success, response)
+
+    def get_load_stats(self, timeout: float = 1.5) -> Dict[str, Any]:
+        """Return server-wide client count and byte totals via management `load-stats`."""
+        success, response = self._send_management_command("load-stats", timeout=timeout)
+        stats = dict(MANAGEMENT_LOAD_STATS_RE.findall(response)) if success else {}
+        return {
+            "success": bool(success and stats),
+            "clients": _safe_int(stats.get("nclients"), 0),
+            "bytes_in": _safe_int(stats.get("bytesin"), 0),
+            "bytes_out": _safe_int(stats.get("bytesout"), 0),
+            "message": response,
+        }
+
+    def _parse_active_sessions(self, success: bool, response: str) -> List[Dict[str, Any]]:
+        """Parse a `status 3` reply into sessions, falling back to the status log."""
         def _split_status_fields(line: str) -> List[str]:
             return [segment.strip() for segment in re.split(r"[\t,]", line)]
 
@@ -385,9 +1002,18 @@ class OpenVPNManager(BaseVPNService):
         def _parse_status_log_sessions() -> List[Dict[str, Any]]:
             sessions: List[Dict[str, Any]] = []
             status_path = self.config.STATUS_LOG
-            if not status_path.exists():
+            try:
+                stat_result = status_path.stat()
+            except OSError:
                 return sessions
 
+            # OpenVPN rewrites the file every STATUS_LOG_REFRESH_SECONDS; reuse the
+            # parsed rows until it does.
+            file_key = (stat_result.st_mtime_ns, stat_result.st_size)
+            cached = self._status_log_cache
+            if cached is not None and cached[0] == file_key:
+                return [dict(session) for session in cached[1]]
+
             try:
                 client_header_map: Dict[str, int] = {}
                 for raw_line in status_path.read_text(errors="ignore").splitlines():
@@ -428,9 +1054,9 @@ class OpenVPNManager(BaseVPNService):
             except Exception:
                 return sessions
 
+            self._status_log_cache = (file_key, [dict(session) for session in sessions])
             return sessions
 
-        success, response = self._send_management_command("status 3")
         if not success:
             return _parse_status_log_sessions()
 
@@ -482,7 +1108,9 @@ class OpenVPNManager(BaseVPNService):
         checked_at = datetime.utcnow()
         host, port = self._get_management_socket_target()
 
-        socket_probe_success, socket_probe_response = self._send_management_command("state", timeout=1.5)
+        load_stats = self.get_load_stats(timeout=1.5)
+        socket_probe_success = load_stats["success"]
+        socket_probe_response = load_stats["message"]
         status_success, status_response = self._send_management_command("status 3", timeout=2.5)
         status_payload = (status_response or "").strip()
 
@@ -511,7 +1139,7 @@ class OpenVPNManager(BaseVPNService):
             active_source = "status_log"
             fallback_reason = "management_unparsed_response"
 
-        sessions = self.get_active_sessions()
+        sessions = self._parse_active_sessions(status_success, status_response)
         usernames = {
             str(session.get("username") or "").strip()
             for session in sessions
@@ -542,9 +1170,14 @@ class OpenVPNManager(BaseVPNService):
                 "target": {"host": host, "port": port},
                 "socket": {
                     "reachable": bool(socket_probe_success),
-                    "probe_command": "state",
+                    "probe_command": "load-stats",
                     "message": socket_probe_response,
                 },
+                "load_stats": {
+                    "clients": load_stats["clients"],
+                    "bytes_in": load_stats["bytes_in"],
+                    "bytes_out": load_stats["bytes_out"],
+                },
                 "status_query": {
                     "success": bool(status_success),
                     "command": "status 3",
@@ -617,7 +1250,40 @@ class OpenVPNManager(BaseVPNService):
         return {"protocol": self.protocol_name, "users": usage_by_user, "session_count": len(sessions)}
 
     def _load_runtime_settings(self) -> Tuple[Dict[str, any], Dict[str, any]]:
-        """Load persisted OpenVPN and General settings from SQLite."""
+        """
+        Return persisted OpenVPN and General settings, served from cache while fresh.
+
+        The cache is tagged with ``_settings_version`` and dropped by
+        ``invalidate_settings_cache()`` whenever the settings rows are written.
+        Callers receive copies so they can mutate the dicts freely.
+        """
+        with self._settings_cache_lock:
+            cached = self._settings_cache
+            version = self._settings_version
+            if cached is not None and cached[0] == version:
+                return dict(cached[1]), dict(cached[2])
+
+        openvpn_settings, general_settings, loaded = self._query_runtime_settings()
+        if loaded:
+            with self._settings_cache_lock:
+                if self._settings_version == version:
+                    self._settings_cache = (version, dict(openvpn_settings), dict(general_settings))
+        return openvpn_settings, general_settings
+
+    def invalidate_settings_cache(self) -> None:
+        """Drop cached runtime settings (and PKI file contents) so the next read goes back to disk."""
+        with self._settings_cache_lock:
+            self._settings_version += 1
+            self._settings_cache = None
+        _read_pki_file_cached.cache_clear()
+
+    def _query_runtime_settings(self) -> Tuple[Dict[str, any], Dict[str, any], bool]:
+        """Load persisted OpenVPN and General settings from SQLite.
+
+        Returns:
+            Tuple of (openvpn settings, general settings, loaded) where ``loaded``
+            is False when the database could not be read and defaults were used.
+        """
         openvpn_defaults: Dict[str, any] = {
             "port": 1194,
             "protocol": "udp",
@@ -682,45 +1348,30 @@ class OpenVPNManager(BaseVPNService):
         }
 
         try:
-            from backend.database import SessionLocal
-
-            def _load_first_row_values(db, table_name: str, candidate_columns: List[str]) -> Dict[str, Any]:
-                table_exists = db.execute(
-                    text(
-                        "SELECT name FROM sqlite_master "
-                        "WHERE type='table' AND name=:table_name"
-                    ),
-                    {"table_name": table_name},
-                ).fetchone()
-                if not table_exists:
-                    return {}
+            from backend.database import engine
 
-                table_info = db.execute(text(f"PRAGMA table_info({table_name})")).fetchall()
-                existing_columns = {row[1] for row in table_info}
-                selected_columns = [column for column in candidate_columns if column in existing_columns]
-                if not selected_columns:
+            def _load_first_row_values(conn, table_name: str, candidate_columns) -> Dict[str, Any]:
+                # One round-trip per table: missing tables/columns simply yield fewer keys.
+                try:
+                    row = conn.execute(
+                        text(f"SELECT * FROM {table_name} ORDER BY id ASC LIMIT 1")
+                    ).mappings().first()
+                except OperationalError as exc:
+                    if "no such table" in str(exc):
+                        return {}
+                    raise
+                if not row:
                     return {}
+                return {column: row[column] for column in candidate_columns if column in row}
 
-                select_sql = (
-                    f"SELECT {', '.join(selected_columns)} "
-                    f"FROM {table_name} ORDER BY id ASC LIMIT 1"
-                )
-                row = db.execute(text(select_sql)).mappings().first()
-                return dict(row) if row else {}
-
-            db = SessionLocal()
-            try:
-                openvpn_values = _load_first_row_values(
-                    db,
-                    "openvpn_settings",
-                    list(openvpn_defaults.keys()),
-                )
+            with engine.connect() as conn:
+                openvpn_values = _load_first_row_values(conn, "openvpn_settings", openvpn_defaults)
                 for key, value in openvpn_values.items():
-                    if key in openvpn_defaults and value is not None:
+                    if value is not None:
                         openvpn_defaults[key] = value
 
                 general_values = _load_first_row_values(
-                    db,
+                    conn,
                     "general_settings",
                     ["server_address", "public_ipv4_address", "public_ipv6_address", "global_ipv6_support"],
                 )
@@ -736,12 +1387,11 @@ class OpenVPNManager(BaseVPNService):
                     general_defaults["public_ipv4_address"] = persisted_ipv4 or None
                     general_defaults["public_ipv6_address"] = persisted_ipv6 or None
                     general_defaults["global_ipv6_support"] = bool(general_values.get("global_ipv6_support", False))
-            finally:
-                db.close()
         except Exception as exc:
             logger.warning("Failed to load runtime settings from database: %s", exc)
+            return openvpn_defaults, general_defaults, False
 
-        return openvpn_defaults, general_defaults
+        return openvpn_defaults, general_defaults, True
 
     def _resolve_sqlite_db_path(self) -> str:
         """
@@ -1391,75 +2041,122 @@ if __name__ == "__main__":
             except Exception as exc:
                 logger.warning("Failed to chmod %s to 600: %s", path, exc)
     
-    def _run_command(self, cmd: List[str], check: bool = True) -> Tuple[bool, str, str]:
+    def _run_command(
+        self,
+        cmd: List[str],
+        check: bool = True,
+        text: bool = True,
+    ) -> Tuple[bool, Union[str, bytes], Union[str, bytes]]:
         """
         Execute system command with mock support for development.
         
         Args:
             cmd: Command and arguments as list
             check: Raise exception on non-zero exit code
+            text: Decode output as UTF-8; pass False to receive raw bytes
             
         Returns:
             Tuple of (success, stdout, stderr)
         """
+        def _result(success: bool, stdout: str, stderr: str) -> Tuple[bool, Union[str, bytes], Union[str, bytes]]:
+            if text:
+                return success, stdout, stderr
+            return success, stdout.encode(), stderr.encode()
+
         try:
             if not cmd:
-                return False, "", "No command provided"
+                return _result(False, "", "No command provided")
 
             if not self.is_production:
                 # Mock responses for development
-                logger.info(f"[MOCK] Would execute: {' '.join(cmd)}")
-                
-                if "easyrsa" in cmd[0]:
-                    if "build-client-full" in cmd:
-                        client_name = cmd[2] if len(cmd) > 2 else "client"
-                        return True, MockOpenVPNResponse.easyrsa_build_client(client_name), ""
-                    elif "revoke" in cmd:
-                        client_name = cmd[2] if len(cmd) > 2 else "client"
-                        return True, MockOpenVPNResponse.easyrsa_revoke(client_name), ""
-                    elif "gen-crl" in cmd:
-                        return True, "CRL generated successfully", ""
+                cmd_str = shlex.join(cmd)
+                logger.info("[MOCK] Would execute: %s", cmd_str)
                 
-                elif "systemctl" in cmd[0]:
-                    if "status" in cmd:
-                        return True, MockOpenVPNResponse.systemctl_status(), ""
-                    else:
-                        action = cmd[1] if len(cmd) > 1 else "unknown"
-                        return True, f"Service {action} completed successfully", ""
-                
-                return True, f"Mock command executed: {' '.join(cmd)}", ""
+                handler = MOCK_COMMAND_HANDLERS.get(os.path.basename(cmd[0]))
+                mock_output = handler(cmd) if handler is not None else None
+                if mock_output is not None:
+                    return _result(True, mock_output, "")
+
+                return _result(True, f"Mock command executed: {cmd_str}", "")
             
             if not self._command_exists(cmd[0]):
                 warning_message = f"System command not found: {cmd[0]}"
                 logger.warning(warning_message)
-                return False, "", warning_message
+                return _result(False, "", warning_message)
 
             # Production: execute real command
             result = subprocess.run(
                 cmd,
                 capture_output=True,
-                text=True,
+                text=text,
                 check=check
             )
             return result.returncode == 0, result.stdout, result.stderr
             
         except subprocess.CalledProcessError as e:
-            logger.error(f"Command failed: {' '.join(cmd)}\nError: {e.stderr}")
+            error_text = e.stderr.decode("utf-8", errors="replace") if isinstance(e.stderr, bytes) else e.stderr
+            logger.error("Command failed: %s\nError: %s", shlex.join(cmd), error_text)
             return False, e.stdout, e.stderr
         except FileNotFoundError as e:
             logger.warning(f"Command not found: {cmd[0]}")
-            return False, "", str(e)
+            return _result(False, "", str(e))
         except Exception as e:
             logger.error(f"Unexpected error running command: {e}")
-            return False, "", str(e)
+            return _result(False, "", str(e))
 
     def _command_exists(self, command: str) -> bool:
         if not self.is_production:
             return True
         return shutil.which(command) is not None
 
+    def _run_firewall_batch(
+        self,
+        rules: List[Tuple[FirewallCommand, Optional[FirewallCommand]]],
+    ) -> Tuple[Optional[int], List[str], str]:
+        """
+        Run firewall rules in a single shell, stopping at the first rule that fails.
+
+        Args:
+            rules: (command, fallback) pairs; the fallback only runs when its command fails
+
+        Returns:
+            Tuple of (index of the failed rule or None, executed commands, stderr)
+        """
+        script_lines: List[str] = []
+        for index, (cmd, fallback) in enumerate(rules):
+            if fallback:
+                script_lines.append(
+                    f"if {shlex.join(cmd[0])} >/dev/null; then echo OK:{index}; "
+                    f"elif {shlex.join(fallback[0])} >/dev/null; then echo FALLBACK:{index}; "
+                    f"else echo FAIL:{index}; exit 1; fi"
+                )
+            else:
+                script_lines.append(
+                    f"if {shlex.join(cmd[0])} >/dev/null; then echo OK:{index}; "
+                    f"else echo FAIL:{index}; exit 1; fi"
+                )
+
+        success, stdout, stderr = self._run_command(["sh", "-c", "\n".join(script_lines)], check=False)
+
+        executed_commands: List[str] = []
+        completed = 0
+        for status, index in FIREWALL_BATCH_STATUS_RE.findall(stdout or ""):
+            cmd, fallback = rules[int(index)]
+            executed_commands.append(cmd[1])
+            if status != "OK" and fallback:
+                executed_commands.append(fallback[1])
+            if status != "FAIL":
+                completed += 1
+
+        if success and completed == len(rules):
+            return None, executed_commands, stderr
+        return completed, executed_commands, (stderr or "").strip()
+
     @staticmethod
     def _normalize_transport_protocol(protocol: str) -> str:
+        known = TRANSPORT_PROTOCOLS.get(protocol)
+        if known is not None:
+            return known
         normalized = (protocol or "udp").lower().strip()
         if normalized.startswith("tcp"):
             return "tcp"
@@ -1493,56 +2190,48 @@ if __name__ == "__main__":
                 "commands": [],
             }
 
-        commands: List[List[str]] = []
-        allow_rule = ["ufw", "allow", f"{new_port}/{new_proto}"]
-        commands.append(allow_rule)
+        allow_rule = _firewall_command("ufw", "allow", f"{new_port}/{new_proto}")
+        rules: List[Tuple[FirewallCommand, Optional[FirewallCommand]]] = [(allow_rule, None)]
 
         if old_port != new_port or old_proto != new_proto:
-            commands.append(["ufw", "delete", "allow", f"{old_port}/{old_proto}"])
+            rules.append(
+                (
+                    _firewall_command("ufw", "delete", "allow", f"{old_port}/{old_proto}"),
+                    _firewall_command("ufw", "deny", f"{old_port}/{old_proto}"),
+                )
+            )
 
         if not self.is_production:
-            for cmd in commands:
-                logger.info(f"[MOCK] Would execute firewall command: {' '.join(cmd)}")
+            for cmd, _ in rules:
+                logger.info(f"[MOCK] Would execute firewall command: {cmd[1]}")
             return {
                 "success": True,
                 "message": "Firewall rules updated (mock)",
                 "is_mock": True,
-                "commands": [" ".join(cmd) for cmd in commands],
+                "commands": [cmd[1] for cmd, _ in rules],
             }
 
-        allow_success, _, allow_error = self._run_command(allow_rule, check=False)
-        if not allow_success:
+        failed_index, executed_commands, stderr = self._run_firewall_batch(rules)
+        if failed_index == 0:
             return {
                 "success": False,
-                "message": f"Failed to allow new firewall rule: {allow_error}",
+                "message": f"Failed to allow new firewall rule: {stderr}",
                 "is_mock": False,
-                "commands": [" ".join(allow_rule)],
+                "commands": [allow_rule[1]],
+            }
+        if failed_index is not None:
+            return {
+                "success": False,
+                "message": f"Failed to remove old firewall rule: {stderr}",
+                "is_mock": False,
+                "commands": executed_commands,
             }
-
-        old_rule_results: List[str] = []
-        if len(commands) > 1:
-            delete_cmd = commands[1]
-            delete_success, _, delete_error = self._run_command(delete_cmd, check=False)
-            if not delete_success:
-                deny_cmd = ["ufw", "deny", f"{old_port}/{old_proto}"]
-                deny_success, _, deny_error = self._run_command(deny_cmd, check=False)
-                old_rule_results.append(" ".join(delete_cmd))
-                old_rule_results.append(" ".join(deny_cmd))
-                if not deny_success:
-                    return {
-                        "success": False,
-                        "message": f"Failed to remove old firewall rule: {delete_error or deny_error}",
-                        "is_mock": False,
-                        "commands": [" ".join(allow_rule), *old_rule_results],
-                    }
-            else:
-                old_rule_results.append(" ".join(delete_cmd))
 
         return {
             "success": True,
             "message": "Firewall rules updated",
             "is_mock": False,
-            "commands": [" ".join(allow_rule), *old_rule_results],
+            "commands": executed_commands,
         }
 
     def sync_system_general_settings(
@@ -1585,23 +2274,25 @@ if __name__ == "__main__":
             }
 
         if not self.is_production:
-            for cmd in commands:
-                logger.info(f"[MOCK] Would execute general system command: {' '.join(cmd)}")
+            mock_commands = [" ".join(cmd) for cmd in commands]
+            for cmd_str in mock_commands:
+                logger.info("[MOCK] Would execute general system command: %s", cmd_str)
             return {
                 "success": True,
                 "message": "General system settings updated (mock)",
                 "is_mock": True,
-                "commands": [*port_sync_result.get("commands", []), *[" ".join(cmd) for cmd in commands]],
+                "commands": [*port_sync_result.get("commands", []), *mock_commands],
             }
 
         executed_commands: List[str] = []
         for cmd in commands:
+            cmd_str = " ".join(cmd)
             success, _, stderr = self._run_command(cmd, check=False)
-            executed_commands.append(" ".join(cmd))
+            executed_commands.append(cmd_str)
             if not success:
                 return {
                     "success": False,
-                    "message": f"Failed to apply general system command: {' '.join(cmd)}. {stderr}".strip(),
+                    "message": f"Failed to apply general system command: {cmd_str}. {stderr}".strip(),
                     "is_mock": False,
                     "commands": executed_commands,
                 }
@@ -1645,42 +2336,35 @@ if __name__ == "__main__":
                 "commands": [],
             }
 
-        commands: List[List[str]] = []
-        for port in allow_ports:
-            commands.append(["ufw", "allow", f"{port}/tcp"])
-
-        for port in remove_ports:
-            commands.append(["ufw", "delete", "allow", f"{port}/tcp"])
+        rules: List[Tuple[FirewallCommand, Optional[FirewallCommand]]] = [
+            (_firewall_command("ufw", "allow", f"{port}/tcp"), None) for port in allow_ports
+        ]
+        rules.extend(
+            (
+                _firewall_command("ufw", "delete", "allow", f"{port}/tcp"),
+                _firewall_command("ufw", "deny", f"{port}/tcp"),
+            )
+            for port in remove_ports
+        )
 
         if not self.is_production:
-            for cmd in commands:
-                logger.info(f"[MOCK] Would execute HTTPS firewall command: {' '.join(cmd)}")
+            for cmd, _ in rules:
+                logger.info(f"[MOCK] Would execute HTTPS firewall command: {cmd[1]}")
             return {
                 "success": True,
                 "message": "HTTPS firewall rules updated (mock)",
                 "is_mock": True,
-                "commands": [" ".join(cmd) for cmd in commands],
+                "commands": [cmd[1] for cmd, _ in rules],
             }
 
-        executed_commands: List[str] = []
-        for cmd in commands:
-            success, _, stderr = self._run_command(cmd, check=False)
-            executed_commands.append(" ".join(cmd))
-            if not success:
-                if cmd[:3] == ["ufw", "delete", "allow"]:
-                    deny_cmd = ["ufw", "deny", cmd[-1]]
-                    deny_success, _, deny_error = self._run_command(deny_cmd, check=False)
-                    executed_commands.append(" ".join(deny_cmd))
-                    if deny_success:
-                        continue
-                    stderr = deny_error or stderr
-
-                return {
-                    "success": False,
-                    "message": f"Failed to update HTTPS firewall rules: {stderr}".strip(),
-                    "is_mock": False,
-                    "commands": executed_commands,
-                }
+        failed_index, executed_commands, stderr = self._run_firewall_batch(rules)
+        if failed_index is not None:
+            return {
+                "success": False,
+                "message": f"Failed to update HTTPS firewall rules: {stderr}".strip(),
+                "is_mock": False,
+                "commands": executed_commands,
+            }
 
         return {
             "success": True,
@@ -1695,13 +2379,10 @@ if __name__ == "__main__":
         if not candidate:
             raise ValueError("Domain is required")
 
-        parsed = urlparse(candidate if "://" in candidate else f"//{candidate}")
-        domain = (parsed.hostname or "").strip().lower()
-        if not domain:
-            domain = candidate.split("/")[0].split(":")[0].strip().lower()
-        if not domain:
+        match = CERT_DOMAIN_RE.match(candidate)
+        if not match:
             raise ValueError("Domain is invalid")
-        return domain
+        return match.group(1).lower()
 
     def _build_ssl_targets(self, domains: List[str]) -> List[Tuple[str, str]]:
         targets: List[Tuple[str, str]] = []
@@ -1733,53 +2414,61 @@ if __name__ == "__main__":
             email,
         ]
 
-    def _stream_mock_ssl_issue_logs(self, targets: List[Tuple[str, str]], email: str) -> Iterator[str]:
+    async def _stream_mock_ssl_issue_logs(
+        self,
+        targets: List[Tuple[str, str]],
+        email: str,
+    ) -> AsyncIterator[str]:
         for label, domain in targets:
             command = self._build_certbot_command(domain, email)
             yield f">>> Starting SSL issuance for {label}..."
-            time.sleep(0.25)
+            await asyncio.sleep(0.25)
             yield f"$ {' '.join(command)}"
-            time.sleep(0.25)
+            await asyncio.sleep(0.25)
             yield f"Saving debug log to /var/log/letsencrypt/letsencrypt-{domain}.log"
-            time.sleep(0.25)
+            await asyncio.sleep(0.25)
             yield f"Requesting a certificate for {domain}"
-            time.sleep(0.4)
+            await asyncio.sleep(0.4)
             yield "Successfully received certificate"
-            time.sleep(0.2)
+            await asyncio.sleep(0.2)
             yield f"Certificate is saved at: /etc/letsencrypt/live/{domain}/fullchain.pem"
-            time.sleep(0.2)
+            await asyncio.sleep(0.2)
             yield f"Key is saved at: /etc/letsencrypt/live/{domain}/privkey.pem"
-            time.sleep(0.2)
+            await asyncio.sleep(0.2)
             yield ">>> Success!"
-            time.sleep(0.2)
+            await asyncio.sleep(0.2)
 
         yield ">>> SSL issuance completed for all requested domains."
 
-    def _stream_production_ssl_issue_logs(self, targets: List[Tuple[str, str]], email: str) -> Iterator[str]:
+    async def _stream_production_ssl_issue_logs(
+        self,
+        targets: List[Tuple[str, str]],
+        email: str,
+    ) -> AsyncIterator[str]:
         for label, domain in targets:
             command = self._build_certbot_command(domain, email)
             yield f">>> Starting SSL issuance for {label}..."
             yield f"$ {' '.join(command)}"
 
-            process = subprocess.Popen(
-                command,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1,
+            process = await asyncio.create_subprocess_exec(
+                *command,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT,
             )
 
             try:
                 if process.stdout is not None:
-                    for line in process.stdout:
-                        rendered = line.rstrip("\n")
+                    async for line in process.stdout:
+                        rendered = line.decode("utf-8", errors="replace").rstrip("\n")
                         if rendered:
                             yield rendered
+                return_code = await process.wait()
             finally:
-                if process.stdout is not None:
-                    process.stdout.close()
+                # Client went away mid-stream: don't leave certbot running unattended.
+                if process.returncode is None:
+                    process.kill()
+                    await process.wait()
 
-            return_code = process.wait()
             if return_code != 0:
                 yield f">>> Error: SSL issuance failed for {label} with exit code {return_code}."
                 return
@@ -1788,11 +2477,11 @@ if __name__ == "__main__":
 
         yield ">>> SSL issuance completed for all requested domains."
 
-    def stream_ssl_issue_logs(
+    async def stream_ssl_issue_logs(
         self,
         domains: List[str],
         email: str,
-    ) -> Iterator[str]:
+    ) -> AsyncIterator[str]:
         normalized_email = (email or "").strip()
         if not normalized_email:
             raise ValueError("Let's Encrypt email is required")
@@ -1801,14 +2490,20 @@ if __name__ == "__main__":
 
         if not self.is_production:
             yield ">>> Running in development mode with mock SSL logs."
-            yield from self._stream_mock_ssl_issue_logs(targets, normalized_email)
+            async for line in self._stream_mock_ssl_issue_logs(targets, normalized_email):
+                yield line
             return
 
-        yield from self._stream_production_ssl_issue_logs(targets, normalized_email)
+        async for line in self._stream_production_ssl_issue_logs(targets, normalized_email):
+            yield line
     
     def check_easyrsa_installed(self) -> bool:
         """Check if Easy-RSA is installed"""
         return self.pki_manager.is_easyrsa_available()
+
+    def refresh_tools(self) -> None:
+        """Re-detect Easy-RSA after it was installed or moved while the backend runs."""
+        self.pki_manager.refresh_tools()
     
     def initialize_pki(self) -> Dict[str, any]:
         """
@@ -1850,19 +2545,20 @@ if __name__ == "__main__":
                 logger.warning("Client certificate creation failed for %s: %s", client_name, result.get("message"))
         return result
     
-    def revoke_client_certificate(self, client_name: str) -> Dict[str, any]:
+    def revoke_client_certificate(self, client_name: str, revoked_at: Optional[datetime] = None) -> Dict[str, any]:
         """
         Revoke client certificate using Easy-RSA 3.
         
         Args:
             client_name: Client identifier to revoke
+            revoked_at: Revocation time shared by a batch; defaults to now (UTC)
             
         Returns:
             Dict with success status
         """
         result = self.pki_manager.revoke_client(client_name)
         if result.get("success"):
-            result["revoked_at"] = datetime.utcnow().isoformat()
+            result["revoked_at"] = (revoked_at or datetime.utcnow()).isoformat()
         else:
             logger.warning("Client certificate revoke failed for %s: %s", client_name, result.get("message"))
         return result
@@ -1904,11 +2600,7 @@ if __name__ == "__main__":
     def _extract_strict_pem_certificate(raw_cert_content: str, cert_path: Path) -> str:
         """Extract only the PEM certificate block and drop any surrounding metadata/text."""
         cert_text = (raw_cert_content or "").strip()
-        pem_match = re.search(
-            r"-----BEGIN CERTIFICATE-----\s+.*?\s+-----END CERTIFICATE-----",
-            cert_text,
-            flags=re.DOTALL,
-        )
+        pem_match = PEM_CERTIFICATE_RE.search(cert_text)
         if not pem_match:
             raise ValueError(f"Invalid client certificate format (missing PEM block) in {cert_path}")
         return pem_match.group(0).strip()
@@ -1916,17 +2608,16 @@ if __name__ == "__main__":
     def _get_client_materials(self, client_name: str, tls_mode: str = "tls-crypt") -> Tuple[str, str, str, str]:
         """Return CA cert, client cert, client key, and TLS auth/crypt key content."""
         material_paths = self._preflight_client_pki_materials(client_name, tls_mode=tls_mode)
-        with open(self.config.CA_CERT, 'r') as f:
-            ca_cert = f.read()
-        with open(material_paths["client_cert"], 'r') as f:
-            client_cert = self._extract_strict_pem_certificate(f.read(), material_paths["client_cert"])
-        with open(material_paths["client_key"], 'r') as f:
-            client_key = f.read()
+        ca_cert = _read_pki_file(self.config.CA_CERT)
+        client_cert = self._extract_strict_pem_certificate(
+            _read_pki_file(material_paths["client_cert"]),
+            material_paths["client_cert"],
+        )
+        client_key = _read_pki_file(material_paths["client_key"])
         ta_key = ""
         tls_key_path = material_paths.get("tls_key")
         if tls_key_path is not None:
-            with open(tls_key_path, 'r') as f:
-                ta_key = f.read()
+            ta_key = _read_pki_file(tls_key_path)
         return ca_cert, client_cert, client_key, ta_key
 
     def _get_base_config(
@@ -1959,7 +2650,7 @@ if __name__ == "__main__":
             "# Atlas VPN - OpenVPN Client Configuration",
             f"# OS: {os_label}",
             f"# Client: {client_name}",
-            f"# Generated: {datetime.utcnow().isoformat()}",
+            f"# Generated: {_generated_timestamp_iso()}",
             "",
             "client",
             f"dev {device_type}",
@@ -1974,35 +2665,21 @@ if __name__ == "__main__":
         if persist_tun:
             lines.append("persist-tun")
 
-        lines.extend([
-            "remote-cert-tls server",
-            f"verb {int(verbosity)}",
-        ])
-
-        if client_data_ciphers:
-            lines.append(f"data-ciphers {client_data_ciphers}")
-        if data_cipher_fallback:
-            lines.append(f"data-ciphers-fallback {data_cipher_fallback}")
-        if auth_digest:
-            lines.append(f"auth {auth_digest}")
-        if tls_version_min:
-            lines.append(f"tls-version-min {tls_version_min}")
-        if tls_mode == "tls-auth":
-            lines.append("key-direction 1")
-
-        if tun_mtu:
-            lines.append(f"tun-mtu {int(tun_mtu)}")
-        if mssfix:
-            lines.append(f"mssfix {int(mssfix)}")
-        if keepalive_ping and keepalive_timeout:
-            lines.append(f"keepalive {int(keepalive_ping)} {int(keepalive_timeout)}")
-
-        if push_custom_routes:
-            for route_line in push_custom_routes.splitlines():
-                route_clean = route_line.strip()
-                if route_clean:
-                    lines.append(f"route {route_clean}")
-
+        lines.extend(
+            _render_client_settings_block(
+                int(verbosity),
+                client_data_ciphers,
+                data_cipher_fallback,
+                auth_digest,
+                tls_version_min,
+                tls_mode,
+                tun_mtu,
+                mssfix,
+                keepalive_ping,
+                keepalive_timeout,
+                push_custom_routes,
+            )
+        )
         return lines
 
     @staticmethod
@@ -2022,17 +2699,29 @@ if __name__ == "__main__":
         redirect_gateway: bool,
     ) -> None:
         ipv6_remote = f"remote {server_ipv6} {int(server_port)}"
-        if ipv6_remote not in lines:
-            insert_index = 0
-            for idx, line in enumerate(lines):
-                if line.strip().startswith("remote "):
-                    insert_index = idx + 1
-                    break
-            lines.insert(insert_index, ipv6_remote)
+        # The primary remote sits in the base config's short header, so this stops early.
+        remote_index = next((idx for idx, line in enumerate(lines) if line.startswith("remote ")), -1)
+        if ipv6_remote not in lines[max(remote_index, 0):remote_index + 2]:
+            lines.insert(remote_index + 1, ipv6_remote)
 
         if redirect_gateway and "route-ipv6 2000::/3" not in lines:
             lines.append("route-ipv6 2000::/3")
 
+    @staticmethod
+    def _drop_client_directives(
+        lines: List[str],
+        prefixes: Tuple[str, ...],
+        dropped: frozenset = frozenset(),
+    ) -> List[str]:
+        """Filter generated lines, normalizing each line once for all prefix/exact checks."""
+        kept: List[str] = []
+        for line in lines:
+            lowered = line.strip().lower()
+            if lowered in dropped or lowered.startswith(prefixes):
+                continue
+            kept.append(line)
+        return kept
+
     def _append_certificate_blocks(
         self,
         lines: List[str],
@@ -2075,9 +2764,9 @@ if __name__ == "__main__":
         """Apply obfuscation directives in a reusable way for all client builders."""
         if prebuilt_directives is not None:
             for directive in prebuilt_directives:
-                normalized = (directive or "").strip().lower()
-                if normalized and "comp-lzo" not in normalized and "compress" not in normalized:
-                    lines.append((directive or "").strip())
+                stripped = (directive or "").strip()
+                if stripped and not COMPRESSION_DIRECTIVE_RE.search(stripped):
+                    lines.append(stripped)
             return
 
         proxy_server = (openvpn_settings.get("proxy_server") or "").strip()
@@ -2156,22 +2845,11 @@ if __name__ == "__main__":
             lines.append("socket-flags TCP_NODELAY")
 
     def _apply_apple_restrictions(self, lines: List[str], ensure_persistence: bool = True) -> List[str]:
-        blocked_directives = (
-            "sndbuf",
-            "rcvbuf",
-            "comp-lzo",
-            "compress",
-            "explicit-exit-notify",
-            "block-outside-dns",
-        )
-
         sanitized_lines: List[str] = []
         for line in lines:
             stripped = line.strip()
-            lowered = stripped.lower()
-            if stripped and not stripped.startswith("#"):
-                if any(lowered == directive or lowered.startswith(f"{directive} ") for directive in blocked_directives):
-                    continue
+            if stripped and not stripped.startswith("#") and APPLE_BLOCKED_DIRECTIVE_RE.match(stripped):
+                continue
             sanitized_lines.append(line)
 
         if ensure_persistence:
@@ -2197,11 +2875,11 @@ if __name__ == "__main__":
         Standalone Apple (iOS/macOS) config generator with strict whitelist.
         NO sndbuf, NO rcvbuf, NO block-outside-dns, NO comp-lzo/compress.
         """
-        device_type = str(openvpn_settings.get("device_type", "tun")).strip().lower()
-        resolved_protocol = str(protocol or openvpn_settings.get("protocol", "udp")).strip().lower()
-        obfuscation_mode = str(openvpn_settings.get("obfuscation_mode") or "standard").strip().lower()
+        client_settings = _read_client_setting_values(openvpn_settings)
+        resolved_protocol = _normalize_setting_value(protocol or openvpn_settings.get("protocol", "udp"))
+        obfuscation_mode = _normalize_setting_value(openvpn_settings.get("obfuscation_mode") or "standard")
         effective_protocol = "tcp" if obfuscation_mode != "standard" else resolved_protocol
-        is_tcp = "tcp" in effective_protocol.lower()
+        is_tcp = "tcp" in effective_protocol
 
         resolved_server = (
             (server_address or "").strip()
@@ -2210,20 +2888,7 @@ if __name__ == "__main__":
         )
         resolved_port = int(server_port if server_port is not None else openvpn_settings.get("port", 1194))
 
-        obfuscation_settings = {
-            "obfuscation_mode": openvpn_settings.get("obfuscation_mode"),
-            "proxy_server": openvpn_settings.get("proxy_server"),
-            "proxy_address": openvpn_settings.get("proxy_address"),
-            "proxy_port": openvpn_settings.get("proxy_port"),
-            "spoofed_host": openvpn_settings.get("spoofed_host"),
-            "socks_server": openvpn_settings.get("socks_server"),
-            "socks_port": openvpn_settings.get("socks_port"),
-            "stunnel_port": openvpn_settings.get("stunnel_port"),
-            "sni_domain": openvpn_settings.get("sni_domain"),
-            "cdn_domain": openvpn_settings.get("cdn_domain"),
-            "ws_path": openvpn_settings.get("ws_path"),
-            "ws_port": openvpn_settings.get("ws_port"),
-        }
+        obfuscation_settings = {key: openvpn_settings.get(key) for key in OBFUSCATION_SETTING_KEYS}
 
         (
             client_protocol,
@@ -2236,59 +2901,39 @@ if __name__ == "__main__":
             obfuscation_settings=obfuscation_settings,
         )
 
-        raw_data_ciphers = openvpn_settings.get("data_ciphers") or "AES-256-GCM:AES-128-GCM:CHACHA20-POLY1305"
-        if isinstance(raw_data_ciphers, list):
-            client_data_ciphers = ":".join([c.strip() for c in raw_data_ciphers if c and c.strip()])
-        else:
-            client_data_ciphers = str(raw_data_ciphers).strip() or "AES-256-GCM:AES-128-GCM:CHACHA20-POLY1305"
-
-        fallback = client_data_ciphers.split(":")[0].strip() if ":" in client_data_ciphers else client_data_ciphers
-        auth_digest = str(openvpn_settings.get("auth_digest") or "SHA256").strip().upper()
-        tls_version_min = str(openvpn_settings.get("tls_version_min") or "1.2").strip()
-        tls_mode = str(openvpn_settings.get("tls_mode") or "tls-crypt").strip().lower()
-
-        verbosity = _safe_int(openvpn_settings.get("verbosity"))
-        tun_mtu = _safe_int(openvpn_settings.get("tun_mtu"))
-        mssfix = _safe_int(openvpn_settings.get("mssfix"))
-        apple_mssfix = mssfix if mssfix and mssfix > 0 else None
-        keepalive_ping = _safe_int(openvpn_settings.get("keepalive_ping"))
-        keepalive_timeout = _safe_int(openvpn_settings.get("keepalive_timeout"))
-        tcp_nodelay = bool(openvpn_settings.get("tcp_nodelay", False))
-        redirect_gateway = bool(openvpn_settings.get("redirect_gateway", False))
+        client_data_ciphers, fallback = _normalize_cipher_suite(openvpn_settings.get("data_ciphers"))
+
+        apple_mssfix = client_settings.mssfix if client_settings.mssfix and client_settings.mssfix > 0 else None
         ipv6_enabled, server_ipv6 = self._resolve_client_ipv6_context(general_settings)
-        primary_dns = (openvpn_settings.get("primary_dns") or "").strip()
-        secondary_dns = (openvpn_settings.get("secondary_dns") or "").strip()
-        push_custom_routes = (openvpn_settings.get("push_custom_routes") or "").strip()
 
-        os_name = (os_type or "").strip().lower()
-        is_macos = os_name in {"mac", "macos"}
+        is_macos = _normalize_setting_value(os_type or "") in {"mac", "macos"}
 
         lines = self._get_base_config(
             os_label="macOS" if is_macos else "iOS",
             client_name=client_name,
-            device_type=device_type,
+            device_type=client_settings.device_type,
             client_protocol=client_protocol,
             client_remote_line=client_remote_line,
             client_data_ciphers=client_data_ciphers,
             data_cipher_fallback=fallback,
-            auth_digest=auth_digest,
-            tls_version_min=tls_version_min,
-            tls_mode=tls_mode,
-            tun_mtu=tun_mtu,
+            auth_digest=client_settings.auth_digest,
+            tls_version_min=client_settings.tls_version_min,
+            tls_mode=client_settings.tls_mode,
+            tun_mtu=client_settings.tun_mtu,
             mssfix=apple_mssfix,
-            keepalive_ping=keepalive_ping,
-            keepalive_timeout=keepalive_timeout,
-            redirect_gateway=redirect_gateway,
+            keepalive_ping=client_settings.keepalive_ping,
+            keepalive_timeout=client_settings.keepalive_timeout,
+            redirect_gateway=client_settings.redirect_gateway,
             ipv6_enabled=ipv6_enabled,
-            primary_dns=primary_dns,
-            secondary_dns=secondary_dns,
-            push_custom_routes=push_custom_routes,
+            primary_dns=client_settings.primary_dns,
+            secondary_dns=client_settings.secondary_dns,
+            push_custom_routes=client_settings.push_custom_routes,
             persist_key=is_macos,
             persist_tun=is_macos,
-            verbosity=verbosity if verbosity is not None else 3,
+            verbosity=client_settings.verbosity if client_settings.verbosity is not None else 3,
         )
 
-        if tcp_nodelay and is_tcp:
+        if client_settings.tcp_nodelay and is_tcp:
             lines.append("tcp-nodelay")
 
         if ipv6_enabled:
@@ -2296,7 +2941,7 @@ if __name__ == "__main__":
                 lines,
                 server_ipv6=server_ipv6,
                 server_port=resolved_port,
-                redirect_gateway=redirect_gateway,
+                redirect_gateway=client_settings.redirect_gateway,
             )
 
         self._apply_obfuscation(
@@ -2308,60 +2953,45 @@ if __name__ == "__main__":
         )
         
         # CONDITIONAL: Custom Apple-specific directives from DB
-        custom_apple = (openvpn_settings.get("custom_mac") if os_name in {"mac", "macos"} else openvpn_settings.get("custom_ios"))
+        custom_apple = openvpn_settings.get("custom_mac" if is_macos else "custom_ios")
         custom_apple = (custom_apple or "").strip()
-        blocked_directives = (
-            "sndbuf",
-            "rcvbuf",
-            "comp-lzo",
-            "compress",
-            "explicit-exit-notify",
-            "block-outside-dns",
-        )
         if custom_apple:
             lines.append("")
             lines.append("# Custom Apple Directives")
             for custom_line in custom_apple.splitlines():
                 custom_clean = custom_line.strip()
                 if custom_clean and not custom_clean.startswith("#"):
-                    custom_lower = custom_clean.lower()
-                    if any(custom_lower == directive or custom_lower.startswith(f"{directive} ") for directive in blocked_directives):
+                    if APPLE_BLOCKED_DIRECTIVE_RE.match(custom_clean):
                         continue
                     lines.append(custom_clean)
         
         # AUTHENTICATION: auth-user-pass and conditional auth-nocache (BEFORE certificates)
         lines.append("")
         lines.append("auth-user-pass")
-        enable_auth_nocache = str(openvpn_settings.get("enable_auth_nocache", True)).strip().lower() not in {"0", "false", "no", "off"}
-        if enable_auth_nocache:
+        if client_settings.enable_auth_nocache:
             lines.append("auth-nocache")
         
-        ca_cert, client_cert, client_key, ta_key = self._get_client_materials(client_name, tls_mode=tls_mode)
+        ca_cert, client_cert, client_key, ta_key = self._get_client_materials(client_name, tls_mode=client_settings.tls_mode)
         self._append_certificate_blocks(
             lines,
             ca_cert=ca_cert,
             client_cert=client_cert,
             client_key=client_key,
             ta_key=ta_key,
-            tls_mode=tls_mode,
+            tls_mode=client_settings.tls_mode,
         )
 
-        sanitized_lines = self._apply_apple_restrictions(lines, ensure_persistence=is_macos)
-        sanitized_lines = [
-            line
-            for line in sanitized_lines
-            if not line.strip().lower().startswith("tun-mtu ")
-            and not line.strip().lower().startswith("mssfix ")
-            and not line.strip().lower().startswith("keepalive ")
-        ]
-        if not is_macos:
-            sanitized_lines = [
-                line
-                for line in sanitized_lines
-                if line.strip().lower() not in {"persist-key", "persist-tun", "resolv-retry infinite"}
-            ]
-        sanitized_lines.append("")
-        return "\n".join(sanitized_lines)
+        # Single pass over the restricted lines: normalize each once, then join once.
+        config_lines: List[str] = []
+        for line in self._apply_apple_restrictions(lines, ensure_persistence=is_macos):
+            lowered = line.strip().lower()
+            if lowered.startswith(APPLE_DROPPED_DIRECTIVE_PREFIXES):
+                continue
+            if not is_macos and lowered in IOS_DROPPED_DIRECTIVES:
+                continue
+            config_lines.append(line)
+        config_lines.append("")
+        return "\n".join(config_lines)
 
     def _generate_android_config(
         self,
@@ -2373,9 +3003,9 @@ if __name__ == "__main__":
         protocol: str,
     ) -> str:
         """Generate Android config using global settings with Android-specific smart filtering."""
-        device_type = str(openvpn_settings.get("device_type", "tun")).strip().lower()
-        resolved_protocol = str(protocol or openvpn_settings.get("protocol", "udp")).strip().lower()
-        obfuscation_mode = str(openvpn_settings.get("obfuscation_mode") or "standard").strip().lower()
+        client_settings = _read_client_setting_values(openvpn_settings)
+        resolved_protocol = _normalize_setting_value(protocol or openvpn_settings.get("protocol", "udp"))
+        obfuscation_mode = _normalize_setting_value(openvpn_settings.get("obfuscation_mode") or "standard")
         effective_protocol = "tcp" if obfuscation_mode != "standard" else resolved_protocol
 
         resolved_server = (
@@ -2385,20 +3015,7 @@ if __name__ == "__main__":
         )
         resolved_port = int(server_port if server_port is not None else openvpn_settings.get("port", 1194))
 
-        obfuscation_settings = {
-            "obfuscation_mode": openvpn_settings.get("obfuscation_mode"),
-            "proxy_server": openvpn_settings.get("proxy_server"),
-            "proxy_address": openvpn_settings.get("proxy_address"),
-            "proxy_port": openvpn_settings.get("proxy_port"),
-            "spoofed_host": openvpn_settings.get("spoofed_host"),
-            "socks_server": openvpn_settings.get("socks_server"),
-            "socks_port": openvpn_settings.get("socks_port"),
-            "stunnel_port": openvpn_settings.get("stunnel_port"),
-            "sni_domain": openvpn_settings.get("sni_domain"),
-            "cdn_domain": openvpn_settings.get("cdn_domain"),
-            "ws_path": openvpn_settings.get("ws_path"),
-            "ws_port": openvpn_settings.get("ws_port"),
-        }
+        obfuscation_settings = {key: openvpn_settings.get(key) for key in OBFUSCATION_SETTING_KEYS}
 
         (
             client_protocol,
@@ -2411,62 +3028,39 @@ if __name__ == "__main__":
             obfuscation_settings=obfuscation_settings,
         )
 
-        is_udp = "udp" in client_protocol.lower()
+        is_tcp = "tcp" in client_protocol
+        is_udp = "udp" in client_protocol
 
-        raw_data_ciphers = openvpn_settings.get("data_ciphers") or "AES-256-GCM:AES-128-GCM:CHACHA20-POLY1305"
-        if isinstance(raw_data_ciphers, list):
-            client_data_ciphers = ":".join([c.strip() for c in raw_data_ciphers if c and c.strip()])
-        else:
-            client_data_ciphers = str(raw_data_ciphers).strip() or "AES-256-GCM:AES-128-GCM:CHACHA20-POLY1305"
-
-        data_cipher_fallback = client_data_ciphers.split(":")[0].strip() if ":" in client_data_ciphers else client_data_ciphers
-        auth_digest = str(openvpn_settings.get("auth_digest") or "SHA256").strip().upper()
-        tls_version_min = str(openvpn_settings.get("tls_version_min") or "1.2").strip()
-        tls_mode = str(openvpn_settings.get("tls_mode") or "tls-crypt").strip().lower()
-        redirect_gateway = bool(openvpn_settings.get("redirect_gateway", False))
-        primary_dns = (openvpn_settings.get("primary_dns") or "").strip()
-        secondary_dns = (openvpn_settings.get("secondary_dns") or "").strip()
-        push_custom_routes = (openvpn_settings.get("push_custom_routes") or "").strip()
-        tun_mtu = _safe_int(openvpn_settings.get("tun_mtu"))
-        mssfix = _safe_int(openvpn_settings.get("mssfix"))
-        sndbuf = _safe_int(openvpn_settings.get("sndbuf"))
-        rcvbuf = _safe_int(openvpn_settings.get("rcvbuf"))
-        fast_io = bool(openvpn_settings.get("fast_io", False))
-        explicit_exit_notify = _safe_int(openvpn_settings.get("explicit_exit_notify"))
-        keepalive_ping = _safe_int(openvpn_settings.get("keepalive_ping"))
-        keepalive_timeout = _safe_int(openvpn_settings.get("keepalive_timeout"))
-        tcp_nodelay = bool(openvpn_settings.get("tcp_nodelay", False))
-        persist_key = bool(openvpn_settings.get("persist_key", True))
-        persist_tun = bool(openvpn_settings.get("persist_tun", True))
+        client_data_ciphers, data_cipher_fallback = _normalize_cipher_suite(openvpn_settings.get("data_ciphers"))
 
         ipv6_enabled, server_ipv6 = self._resolve_client_ipv6_context(general_settings)
 
         lines = self._get_base_config(
             os_label="ANDROID",
             client_name=client_name,
-            device_type=device_type,
+            device_type=client_settings.device_type,
             client_protocol=client_protocol,
             client_remote_line=client_remote_line,
             client_data_ciphers=client_data_ciphers,
             data_cipher_fallback=data_cipher_fallback,
-            auth_digest=auth_digest,
-            tls_version_min=tls_version_min,
-            tls_mode=tls_mode,
-            tun_mtu=tun_mtu,
-            mssfix=mssfix,
-            keepalive_ping=keepalive_ping,
-            keepalive_timeout=keepalive_timeout,
-            redirect_gateway=redirect_gateway,
+            auth_digest=client_settings.auth_digest,
+            tls_version_min=client_settings.tls_version_min,
+            tls_mode=client_settings.tls_mode,
+            tun_mtu=client_settings.tun_mtu,
+            mssfix=client_settings.mssfix,
+            keepalive_ping=client_settings.keepalive_ping,
+            keepalive_timeout=client_settings.keepalive_timeout,
+            redirect_gateway=client_settings.redirect_gateway,
             ipv6_enabled=ipv6_enabled,
-            primary_dns=primary_dns,
-            secondary_dns=secondary_dns,
-            push_custom_routes=push_custom_routes,
-            persist_key=persist_key,
-            persist_tun=persist_tun,
+            primary_dns=client_settings.primary_dns,
+            secondary_dns=client_settings.secondary_dns,
+            push_custom_routes=client_settings.push_custom_routes,
+            persist_key=client_settings.persist_key,
+            persist_tun=client_settings.persist_tun,
             verbosity=3,
         )
 
-        if tcp_nodelay and "tcp" in client_protocol.lower():
+        if client_settings.tcp_nodelay and is_tcp:
             lines.append("tcp-nodelay")
 
         if ipv6_enabled:
@@ -2474,15 +3068,15 @@ if __name__ == "__main__":
                 lines,
                 server_ipv6=server_ipv6,
                 server_port=resolved_port,
-                redirect_gateway=redirect_gateway,
+                redirect_gateway=client_settings.redirect_gateway,
             )
 
         self._apply_android_optimizations(
             lines,
-            sndbuf=sndbuf,
-            rcvbuf=rcvbuf,
-            fast_io=fast_io,
-            explicit_exit_notify=explicit_exit_notify,
+            sndbuf=client_settings.sndbuf,
+            rcvbuf=client_settings.rcvbuf,
+            fast_io=client_settings.fast_io,
+            explicit_exit_notify=client_settings.explicit_exit_notify,
             is_udp=is_udp,
         )
 
@@ -2500,27 +3094,20 @@ if __name__ == "__main__":
             lines.append("# Custom ANDROID Directives")
             for custom_line in custom_android.splitlines():
                 custom_clean = custom_line.strip()
-                custom_lower = custom_clean.lower()
                 if custom_clean and not custom_clean.startswith("#"):
-                    if "comp-lzo" in custom_lower or "compress" in custom_lower:
+                    if COMPRESSION_DIRECTIVE_RE.search(custom_clean):
                         continue
                     lines.append(custom_clean)
 
-        lines = [
-            line
-            for line in lines
-            if line.strip().lower() not in {"resolv-retry infinite", "persist-key", "persist-tun"}
-            and not line.strip().lower().startswith("tun-mtu ")
-            and not line.strip().lower().startswith("mssfix ")
-            and not line.strip().lower().startswith("keepalive ")
-            and not line.strip().lower().startswith("sndbuf ")
-            and not line.strip().lower().startswith("rcvbuf ")
-        ]
+        lines = self._drop_client_directives(
+            lines,
+            CLIENT_TUNING_DIRECTIVE_PREFIXES,
+            dropped=ANDROID_DROPPED_DIRECTIVES,
+        )
 
         lines.append("")
         lines.append("auth-user-pass")
-        enable_auth_nocache = str(openvpn_settings.get("enable_auth_nocache", True)).strip().lower() not in {"0", "false", "no", "off"}
-        if enable_auth_nocache:
+        if client_settings.enable_auth_nocache:
             lines.append("auth-nocache")
 
         ca_cert, client_cert, client_key, ta_key = self._get_client_materials(client_name)
@@ -2530,7 +3117,7 @@ if __name__ == "__main__":
             client_cert=client_cert,
             client_key=client_key,
             ta_key=ta_key,
-            tls_mode=tls_mode,
+            tls_mode=client_settings.tls_mode,
         )
 
         lines.append("")
@@ -2545,9 +3132,9 @@ if __name__ == "__main__":
         server_port: int,
         protocol: str,
     ) -> str:
-        device_type = str(openvpn_settings.get("device_type", "tun")).strip().lower()
-        resolved_protocol = str(protocol or openvpn_settings.get("protocol", "udp")).strip().lower()
-        obfuscation_mode = str(openvpn_settings.get("obfuscation_mode") or "standard").strip().lower()
+        client_settings = _read_client_setting_values(openvpn_settings)
+        resolved_protocol = _normalize_setting_value(protocol or openvpn_settings.get("protocol", "udp"))
+        obfuscation_mode = _normalize_setting_value(openvpn_settings.get("obfuscation_mode") or "standard")
         effective_protocol = "tcp" if obfuscation_mode != "standard" else resolved_protocol
 
         resolved_server = (
@@ -2557,20 +3144,7 @@ if __name__ == "__main__":
         )
         resolved_port = int(server_port if server_port is not None else openvpn_settings.get("port", 1194))
 
-        obfuscation_settings = {
-            "obfuscation_mode": openvpn_settings.get("obfuscation_mode"),
-            "proxy_server": openvpn_settings.get("proxy_server"),
-            "proxy_address": openvpn_settings.get("proxy_address"),
-            "proxy_port": openvpn_settings.get("proxy_port"),
-            "spoofed_host": openvpn_settings.get("spoofed_host"),
-            "socks_server": openvpn_settings.get("socks_server"),
-            "socks_port": openvpn_settings.get("socks_port"),
-            "stunnel_port": openvpn_settings.get("stunnel_port"),
-            "sni_domain": openvpn_settings.get("sni_domain"),
-            "cdn_domain": openvpn_settings.get("cdn_domain"),
-            "ws_path": openvpn_settings.get("ws_path"),
-            "ws_port": openvpn_settings.get("ws_port"),
-        }
+        obfuscation_settings = {key: openvpn_settings.get(key) for key in OBFUSCATION_SETTING_KEYS}
 
         (
             client_protocol,
@@ -2583,75 +3157,53 @@ if __name__ == "__main__":
             obfuscation_settings=obfuscation_settings,
         )
 
-        is_tcp = "tcp" in client_protocol.lower()
-        is_udp = "udp" in client_protocol.lower()
+        is_tcp = "tcp" in client_protocol
+        is_udp = "udp" in client_protocol
 
-        raw_data_ciphers = openvpn_settings.get("data_ciphers") or "AES-256-GCM:AES-128-GCM:CHACHA20-POLY1305"
-        if isinstance(raw_data_ciphers, list):
-            client_data_ciphers = ":".join([cipher.strip() for cipher in raw_data_ciphers if cipher and cipher.strip()])
-        else:
-            client_data_ciphers = str(raw_data_ciphers).strip() or "AES-256-GCM:AES-128-GCM:CHACHA20-POLY1305"
-
-        data_cipher_fallback = client_data_ciphers.split(":")[0].strip() if ":" in client_data_ciphers else client_data_ciphers
-        auth_digest = str(openvpn_settings.get("auth_digest") or "SHA256").strip().upper()
-        tls_version_min = str(openvpn_settings.get("tls_version_min") or "1.2").strip()
-        tls_mode = str(openvpn_settings.get("tls_mode") or "tls-crypt").strip().lower()
-        tun_mtu = _safe_int(openvpn_settings.get("tun_mtu"))
-        mssfix = _safe_int(openvpn_settings.get("mssfix"))
-        sndbuf = _safe_int(openvpn_settings.get("sndbuf"))
-        rcvbuf = _safe_int(openvpn_settings.get("rcvbuf"))
-        keepalive_ping = _safe_int(openvpn_settings.get("keepalive_ping"))
-        keepalive_timeout = _safe_int(openvpn_settings.get("keepalive_timeout"))
-        redirect_gateway = bool(openvpn_settings.get("redirect_gateway", False))
-        primary_dns = (openvpn_settings.get("primary_dns") or "").strip()
-        secondary_dns = (openvpn_settings.get("secondary_dns") or "").strip()
-        push_custom_routes = (openvpn_settings.get("push_custom_routes") or "").strip()
-        persist_key = bool(openvpn_settings.get("persist_key", True))
-        persist_tun = bool(openvpn_settings.get("persist_tun", True))
+        client_data_ciphers, data_cipher_fallback = _normalize_cipher_suite(openvpn_settings.get("data_ciphers"))
 
         ipv6_enabled, server_ipv6 = self._resolve_client_ipv6_context(general_settings)
 
         lines = self._get_base_config(
             os_label="WINDOWS",
             client_name=client_name,
-            device_type=device_type,
+            device_type=client_settings.device_type,
             client_protocol=client_protocol,
             client_remote_line=client_remote_line,
             client_data_ciphers=client_data_ciphers,
             data_cipher_fallback=data_cipher_fallback,
-            auth_digest=auth_digest,
-            tls_version_min=tls_version_min,
-            tls_mode=tls_mode,
-            tun_mtu=tun_mtu,
-            mssfix=mssfix,
-            keepalive_ping=keepalive_ping,
-            keepalive_timeout=keepalive_timeout,
-            redirect_gateway=redirect_gateway,
+            auth_digest=client_settings.auth_digest,
+            tls_version_min=client_settings.tls_version_min,
+            tls_mode=client_settings.tls_mode,
+            tun_mtu=client_settings.tun_mtu,
+            mssfix=client_settings.mssfix,
+            keepalive_ping=client_settings.keepalive_ping,
+            keepalive_timeout=client_settings.keepalive_timeout,
+            redirect_gateway=client_settings.redirect_gateway,
             ipv6_enabled=ipv6_enabled,
-            primary_dns=primary_dns,
-            secondary_dns=secondary_dns,
-            push_custom_routes=push_custom_routes,
-            persist_key=persist_key,
-            persist_tun=persist_tun,
+            primary_dns=client_settings.primary_dns,
+            secondary_dns=client_settings.secondary_dns,
+            push_custom_routes=client_settings.push_custom_routes,
+            persist_key=client_settings.persist_key,
+            persist_tun=client_settings.persist_tun,
             verbosity=3,
         )
 
-        explicit_exit_notify = _safe_int(openvpn_settings.get("explicit_exit_notify"))
-        if explicit_exit_notify and is_udp:
-            lines.append(f"explicit-exit-notify {int(explicit_exit_notify)}")
+        if client_settings.explicit_exit_notify and is_udp:
+            lines.append(f"explicit-exit-notify {int(client_settings.explicit_exit_notify)}")
 
         if ipv6_enabled:
             self._inject_ipv6_client_directives(
                 lines,
                 server_ipv6=server_ipv6,
                 server_port=resolved_port,
-                redirect_gateway=redirect_gateway,
+                redirect_gateway=client_settings.redirect_gateway,
             )
 
         self._apply_windows_optimizations(
             lines,
-            sndbuf=sndbuf,
-            rcvbuf=rcvbuf,
+            sndbuf=client_settings.sndbuf,
+            rcvbuf=client_settings.rcvbuf,
             is_tcp=is_tcp,
         )
 
@@ -2669,26 +3221,16 @@ if __name__ == "__main__":
             lines.append("# Custom WINDOWS Directives")
             for custom_line in custom_windows.splitlines():
                 custom_clean = custom_line.strip()
-                custom_lower = custom_clean.lower()
                 if custom_clean and not custom_clean.startswith("#"):
-                    if "comp-lzo" in custom_lower or "compress" in custom_lower:
+                    if COMPRESSION_DIRECTIVE_RE.search(custom_clean):
                         continue
                     lines.append(custom_clean)
 
-        lines = [
-            line
-            for line in lines
-            if not line.strip().lower().startswith("tun-mtu ")
-            and not line.strip().lower().startswith("mssfix ")
-            and not line.strip().lower().startswith("keepalive ")
-            and not line.strip().lower().startswith("sndbuf ")
-            and not line.strip().lower().startswith("rcvbuf ")
-        ]
+        lines = self._drop_client_directives(lines, CLIENT_TUNING_DIRECTIVE_PREFIXES)
 
         lines.append("")
         lines.append("auth-user-pass")
-        enable_auth_nocache = str(openvpn_settings.get("enable_auth_nocache", True)).strip().lower() not in {"0", "false", "no", "off"}
-        if enable_auth_nocache:
+        if client_settings.enable_auth_nocache:
             lines.append("auth-nocache")
 
         ca_cert, client_cert, client_key, ta_key = self._get_client_materials(client_name)
@@ -2698,7 +3240,7 @@ if __name__ == "__main__":
             client_cert=client_cert,
             client_key=client_key,
             ta_key=ta_key,
-            tls_mode=tls_mode,
+            tls_mode=client_settings.tls_mode,
         )
 
         lines.append("")
@@ -2714,12 +3256,12 @@ if __name__ == "__main__":
         protocol: str,
         os_type: str,
     ) -> str:
-        os_name = (os_type or "default").strip().lower()
+        client_settings = _read_client_setting_values(openvpn_settings)
+        os_name = _normalize_setting_value(os_type or "default")
         os_label = os_name.upper() if os_name else "GENERIC"
 
-        device_type = str(openvpn_settings.get("device_type", "tun")).strip().lower()
-        resolved_protocol = str(protocol or openvpn_settings.get("protocol", "udp")).strip().lower()
-        obfuscation_mode = str(openvpn_settings.get("obfuscation_mode") or "standard").strip().lower()
+        resolved_protocol = _normalize_setting_value(protocol or openvpn_settings.get("protocol", "udp"))
+        obfuscation_mode = _normalize_setting_value(openvpn_settings.get("obfuscation_mode") or "standard")
         effective_protocol = "tcp" if obfuscation_mode != "standard" else resolved_protocol
 
         resolved_server = (
@@ -2729,20 +3271,7 @@ if __name__ == "__main__":
         )
         resolved_port = int(server_port if server_port is not None else openvpn_settings.get("port", 1194))
 
-        obfuscation_settings = {
-            "obfuscation_mode": openvpn_settings.get("obfuscation_mode"),
-            "proxy_server": openvpn_settings.get("proxy_server"),
-            "proxy_address": openvpn_settings.get("proxy_address"),
-            "proxy_port": openvpn_settings.get("proxy_port"),
-            "spoofed_host": openvpn_settings.get("spoofed_host"),
-            "socks_server": openvpn_settings.get("socks_server"),
-            "socks_port": openvpn_settings.get("socks_port"),
-            "stunnel_port": openvpn_settings.get("stunnel_port"),
-            "sni_domain": openvpn_settings.get("sni_domain"),
-            "cdn_domain": openvpn_settings.get("cdn_domain"),
-            "ws_path": openvpn_settings.get("ws_path"),
-            "ws_port": openvpn_settings.get("ws_port"),
-        }
+        obfuscation_settings = {key: openvpn_settings.get(key) for key in OBFUSCATION_SETTING_KEYS}
 
         (
             client_protocol,
@@ -2755,56 +3284,35 @@ if __name__ == "__main__":
             obfuscation_settings=obfuscation_settings,
         )
 
-        is_tcp = "tcp" in client_protocol.lower()
-        is_udp = "udp" in client_protocol.lower()
+        is_tcp = "tcp" in client_protocol
+        is_udp = "udp" in client_protocol
 
-        raw_data_ciphers = openvpn_settings.get("data_ciphers") or "AES-256-GCM:AES-128-GCM:CHACHA20-POLY1305"
-        if isinstance(raw_data_ciphers, list):
-            client_data_ciphers = ":".join([cipher.strip() for cipher in raw_data_ciphers if cipher and cipher.strip()])
-        else:
-            client_data_ciphers = str(raw_data_ciphers).strip() or "AES-256-GCM:AES-128-GCM:CHACHA20-POLY1305"
-
-        data_cipher_fallback = client_data_ciphers.split(":")[0].strip() if ":" in client_data_ciphers else client_data_ciphers
-        auth_digest = str(openvpn_settings.get("auth_digest") or "SHA256").strip().upper()
-        tls_version_min = str(openvpn_settings.get("tls_version_min") or "1.2").strip()
-        tls_mode = str(openvpn_settings.get("tls_mode") or "tls-crypt").strip().lower()
-        tun_mtu = _safe_int(openvpn_settings.get("tun_mtu"))
-        mssfix = _safe_int(openvpn_settings.get("mssfix"))
-        sndbuf = _safe_int(openvpn_settings.get("sndbuf"))
-        rcvbuf = _safe_int(openvpn_settings.get("rcvbuf"))
-        keepalive_ping = _safe_int(openvpn_settings.get("keepalive_ping"))
-        keepalive_timeout = _safe_int(openvpn_settings.get("keepalive_timeout"))
-        redirect_gateway = bool(openvpn_settings.get("redirect_gateway", False))
-        primary_dns = (openvpn_settings.get("primary_dns") or "").strip()
-        secondary_dns = (openvpn_settings.get("secondary_dns") or "").strip()
-        push_custom_routes = (openvpn_settings.get("push_custom_routes") or "").strip()
-        persist_key = bool(openvpn_settings.get("persist_key", True))
-        persist_tun = bool(openvpn_settings.get("persist_tun", True))
+        client_data_ciphers, data_cipher_fallback = _normalize_cipher_suite(openvpn_settings.get("data_ciphers"))
 
         ipv6_enabled, server_ipv6 = self._resolve_client_ipv6_context(general_settings)
 
         lines = self._get_base_config(
             os_label=os_label,
             client_name=client_name,
-            device_type=device_type,
+            device_type=client_settings.device_type,
             client_protocol=client_protocol,
             client_remote_line=client_remote_line,
             client_data_ciphers=client_data_ciphers,
             data_cipher_fallback=data_cipher_fallback,
-            auth_digest=auth_digest,
-            tls_version_min=tls_version_min,
-            tls_mode=tls_mode,
-            tun_mtu=tun_mtu,
-            mssfix=mssfix,
-            keepalive_ping=keepalive_ping,
-            keepalive_timeout=keepalive_timeout,
-            redirect_gateway=redirect_gateway,
+            auth_digest=client_settings.auth_digest,
+            tls_version_min=client_settings.tls_version_min,
+            tls_mode=client_settings.tls_mode,
+            tun_mtu=client_settings.tun_mtu,
+            mssfix=client_settings.mssfix,
+            keepalive_ping=client_settings.keepalive_ping,
+            keepalive_timeout=client_settings.keepalive_timeout,
+            redirect_gateway=client_settings.redirect_gateway,
             ipv6_enabled=ipv6_enabled,
-            primary_dns=primary_dns,
-            secondary_dns=secondary_dns,
-            push_custom_routes=push_custom_routes,
-            persist_key=persist_key,
-            persist_tun=persist_tun,
+            primary_dns=client_settings.primary_dns,
+            secondary_dns=client_settings.secondary_dns,
+            push_custom_routes=client_settings.push_custom_routes,
+            persist_key=client_settings.persist_key,
+            persist_tun=client_settings.persist_tun,
             verbosity=3,
         )
 
@@ -2818,35 +3326,25 @@ if __name__ == "__main__":
                     "setenv opt down-pre",
                 ]
             )
-            lines = [
-                line
-                for line in lines
-                if not line.strip().lower().startswith("tun-mtu ")
-                and not line.strip().lower().startswith("mssfix ")
-                and not line.strip().lower().startswith("keepalive ")
-                and not line.strip().lower().startswith("sndbuf ")
-                and not line.strip().lower().startswith("rcvbuf ")
-            ]
+            lines = self._drop_client_directives(lines, CLIENT_TUNING_DIRECTIVE_PREFIXES)
 
-        if os_name != "linux" and sndbuf:
-            lines.append(f"sndbuf {int(sndbuf)}")
-        if os_name != "linux" and rcvbuf:
-            lines.append(f"rcvbuf {int(rcvbuf)}")
+        if os_name != "linux" and client_settings.sndbuf:
+            lines.append(f"sndbuf {int(client_settings.sndbuf)}")
+        if os_name != "linux" and client_settings.rcvbuf:
+            lines.append(f"rcvbuf {int(client_settings.rcvbuf)}")
 
-        tcp_nodelay = bool(openvpn_settings.get("tcp_nodelay", False))
-        if tcp_nodelay and is_tcp:
+        if client_settings.tcp_nodelay and is_tcp:
             lines.append("tcp-nodelay")
 
-        explicit_exit_notify = _safe_int(openvpn_settings.get("explicit_exit_notify"))
-        if explicit_exit_notify and is_udp:
-            lines.append(f"explicit-exit-notify {int(explicit_exit_notify)}")
+        if client_settings.explicit_exit_notify and is_udp:
+            lines.append(f"explicit-exit-notify {int(client_settings.explicit_exit_notify)}")
 
         if ipv6_enabled:
             self._inject_ipv6_client_directives(
                 lines,
                 server_ipv6=server_ipv6,
                 server_port=resolved_port,
-                redirect_gateway=redirect_gateway,
+                redirect_gateway=client_settings.redirect_gateway,
             )
 
         self._apply_obfuscation(
@@ -2857,28 +3355,21 @@ if __name__ == "__main__":
             prebuilt_directives=obfuscation_directives,
         )
 
-        os_custom_map = {
-            "ios": openvpn_settings.get("custom_ios"),
-            "android": openvpn_settings.get("custom_android"),
-            "windows": openvpn_settings.get("custom_windows"),
-            "mac": openvpn_settings.get("custom_mac"),
-            "macos": openvpn_settings.get("custom_mac"),
-        }
-        custom_directives = os_custom_map.get(os_name)
+        custom_setting_key = CUSTOM_DIRECTIVE_SETTING_KEYS.get(os_name)
+        custom_directives = openvpn_settings.get(custom_setting_key) if custom_setting_key else None
         if custom_directives and (custom_directives or "").strip():
             lines.append("")
             lines.append(f"# Custom {os_name.upper()} Directives")
             for line in (custom_directives or "").strip().splitlines():
-                cleaned = line.strip().lower()
+                cleaned = line.strip()
                 if cleaned:
-                    if "comp-lzo" in cleaned or "compress" in cleaned:
+                    if COMPRESSION_DIRECTIVE_RE.search(cleaned):
                         continue
-                    lines.append(line.strip())
+                    lines.append(cleaned)
 
         lines.append("")
         lines.append("auth-user-pass")
-        enable_auth_nocache = str(openvpn_settings.get("enable_auth_nocache", True)).strip().lower() not in {"0", "false", "no", "off"}
-        if enable_auth_nocache:
+        if client_settings.enable_auth_nocache:
             lines.append("auth-nocache")
 
         ca_cert, client_cert, client_key, ta_key = self._get_client_materials(client_name)
@@ -2888,7 +3379,7 @@ if __name__ == "__main__":
             client_cert=client_cert,
             client_key=client_key,
             ta_key=ta_key,
-            tls_mode=tls_mode,
+            tls_mode=client_settings.tls_mode,
         )
 
         lines.append("")
@@ -2914,61 +3405,7 @@ if __name__ == "__main__":
         Returns:
             Complete .ovpn configuration as string
         """
-        normalized_os = (os_type or "default").strip().lower()
-
-        builder_registry = {
-            "ios": lambda ovpn, gen, remote, remote_port, transport_proto: self._generate_apple_config(
-                client_name=client_name,
-                openvpn_settings=ovpn,
-                general_settings=gen,
-                server_address=remote,
-                server_port=remote_port,
-                protocol=transport_proto,
-                os_type="ios",
-            ),
-            "mac": lambda ovpn, gen, remote, remote_port, transport_proto: self._generate_apple_config(
-                client_name=client_name,
-                openvpn_settings=ovpn,
-                general_settings=gen,
-                server_address=remote,
-                server_port=remote_port,
-                protocol=transport_proto,
-                os_type="mac",
-            ),
-            "macos": lambda ovpn, gen, remote, remote_port, transport_proto: self._generate_apple_config(
-                client_name=client_name,
-                openvpn_settings=ovpn,
-                general_settings=gen,
-                server_address=remote,
-                server_port=remote_port,
-                protocol=transport_proto,
-                os_type="macos",
-            ),
-            "android": lambda ovpn, gen, remote, remote_port, transport_proto: self._generate_android_config(
-                client_name=client_name,
-                openvpn_settings=ovpn,
-                general_settings=gen,
-                server_address=remote,
-                server_port=remote_port,
-                protocol=transport_proto,
-            ),
-            "windows": lambda ovpn, gen, remote, remote_port, transport_proto: self._generate_windows_config(
-                client_name=client_name,
-                openvpn_settings=ovpn,
-                general_settings=gen,
-                server_address=remote,
-                server_port=remote_port,
-                protocol=transport_proto,
-            ),
-            "win": lambda ovpn, gen, remote, remote_port, transport_proto: self._generate_windows_config(
-                client_name=client_name,
-                openvpn_settings=ovpn,
-                general_settings=gen,
-                server_address=remote,
-                server_port=remote_port,
-                protocol=transport_proto,
-            ),
-        }
+        normalized_os = _normalize_setting_value(os_type or "default")
 
         try:
             openvpn_settings, general_settings = self._load_runtime_settings()
@@ -2990,23 +3427,27 @@ if __name__ == "__main__":
                 )
 
             resolved_server_port = int(server_port if server_port is not None else (openvpn_settings.get("port") or 1194))
-            resolved_protocol = str(protocol or openvpn_settings.get("protocol") or "udp").strip().lower()
-            tls_mode = str(openvpn_settings.get("tls_mode") or "tls-crypt").strip().lower()
+            resolved_protocol = _normalize_setting_value(protocol or openvpn_settings.get("protocol") or "udp")
+            tls_mode = _normalize_setting_value(openvpn_settings.get("tls_mode") or "tls-crypt")
 
             # Preflight required PKI material presence before any builder is executed.
             self._preflight_client_pki_materials(client_name, tls_mode=tls_mode)
 
-            builder = builder_registry.get(normalized_os)
-            if builder:
-                return builder(
-                    openvpn_settings,
-                    {
+            builder_spec = CLIENT_CONFIG_BUILDERS.get(normalized_os)
+            if builder_spec:
+                builder_name, builder_os_type = builder_spec
+                builder_kwargs = {"os_type": builder_os_type} if builder_os_type else {}
+                return getattr(self, builder_name)(
+                    client_name=client_name,
+                    openvpn_settings=openvpn_settings,
+                    general_settings={
                         **general_settings,
                         "server_address": resolved_server_address,
                     },
-                    resolved_server_address,
-                    resolved_server_port,
-                    resolved_protocol,
+                    server_address=resolved_server_address,
+                    server_port=resolved_server_port,
+                    protocol=resolved_protocol,
+                    **builder_kwargs,
                 )
 
             return self._generate_default_config(
@@ -3042,68 +3483,10 @@ if __name__ == "__main__":
         default_protocol: str,
         obfuscation_settings: Dict[str, any],
     ) -> Tuple[str, str, List[str]]:
-        mode = str(obfuscation_settings.get("obfuscation_mode", "standard") or "standard").strip().lower()
-
-        proxy_server = (obfuscation_settings.get("proxy_server") or "").strip()
-        proxy_address = (obfuscation_settings.get("proxy_address") or "").strip()
-        proxy_target = proxy_server or proxy_address or server_address
-        proxy_port = int(obfuscation_settings.get("proxy_port") or 8080)
-        spoofed_host = (obfuscation_settings.get("spoofed_host") or "").strip()
-        socks_server = (obfuscation_settings.get("socks_server") or "").strip()
-        socks_port = obfuscation_settings.get("socks_port")
-        stunnel_port = int(obfuscation_settings.get("stunnel_port") or 443)
-        sni_domain = (obfuscation_settings.get("sni_domain") or "").strip()
-        ws_path = (obfuscation_settings.get("ws_path") or "/stream").strip() or "/stream"
-        ws_port = int(obfuscation_settings.get("ws_port") or 8080)
-        cdn_raw = (obfuscation_settings.get("cdn_domain") or "").strip()
-        cdn_host = self._extract_remote_hostname(cdn_raw)
-
-        if mode == "stealth":
-            directives: List[str] = ["http-proxy-retry"]
-            if spoofed_host:
-                directives.append(f"http-proxy-option CUSTOM-HEADER Host {spoofed_host}")
-            return "tcp", f"remote {server_address} 443", directives
-
-        if mode == "http_proxy_basic":
-            directives = [
-                f"http-proxy {proxy_target} {proxy_port}",
-                "http-proxy-retry",
-            ]
-            return "tcp", f"remote {server_address} 443", directives
-
-        if mode == "http_proxy_advanced":
-            directives: List[str] = [
-                f"http-proxy {proxy_target} {proxy_port}",
-                "http-proxy-retry",
-            ]
-            if spoofed_host:
-                directives.append(f"http-proxy-option CUSTOM-HEADER Host {spoofed_host}")
-            return "tcp", f"remote {server_address} 443", directives
-
-        if mode == "socks5_proxy_injection":
-            socks_target = socks_server or proxy_target
-            socks_target_port = int(socks_port or 1080)
-            directives = [
-                f"socks-proxy {socks_target} {socks_target_port}",
-                "socks-proxy-retry",
-            ]
-            return "tcp", f"remote {server_address} 443", directives
-
-        if mode == "tls_tunnel":
-            directives = [
-                "# TLS tunnel mode: run local Stunnel client before connecting.",
-            ]
-            if sni_domain:
-                directives.append(f"# TLS SNI domain hint: {sni_domain}")
-            return "tcp", f"remote 127.0.0.1 {stunnel_port}", directives
-
-        if mode == "websocket_cdn":
-            remote_target = cdn_host or server_address
-            directives = [
-                f"# WebSocket path hint: {ws_path}",
-                f"# Local WebSocket port hint: {ws_port}",
-            ]
-            return "tcp", f"remote {remote_target} 443", directives
+        mode = _normalize_setting_value(obfuscation_settings.get("obfuscation_mode") or "standard")
+        builder = OBFUSCATION_TRANSPORT_BUILDERS.get(mode)
+        if builder is not None:
+            return builder(server_address, obfuscation_settings)
 
         return default_protocol, f"remote {server_address} {default_port}", []
 
@@ -3115,68 +3498,14 @@ if __name__ == "__main__":
         if server_port is not None and protocol:
             return int(server_port), str(protocol).strip().lower()
 
-        try:
-            from backend.database import SessionLocal
-            from backend.models.openvpn_settings import OpenVPNSettings
-
-            db = SessionLocal()
-            try:
-                settings = db.query(OpenVPNSettings).order_by(OpenVPNSettings.id.asc()).first()
-                if settings:
-                    resolved_port = int(server_port if server_port is not None else settings.port)
-                    resolved_protocol = str(protocol or settings.protocol).strip().lower()
-                    return resolved_port, resolved_protocol
-            finally:
-                db.close()
-        except Exception as exc:
-            logger.warning(f"Falling back to default OpenVPN transport settings: {exc}")
-
-        resolved_port = int(server_port if server_port is not None else 1194)
-        resolved_protocol = str(protocol or "udp").strip().lower()
+        openvpn_settings, _ = self._load_runtime_settings()
+        resolved_port = int(server_port if server_port is not None else openvpn_settings.get("port") or 1194)
+        resolved_protocol = str(protocol or openvpn_settings.get("protocol") or "udp").strip().lower()
         return resolved_port, resolved_protocol
 
     def _resolve_client_obfuscation_settings(self) -> Dict[str, any]:
-        try:
-            from backend.database import SessionLocal
-            from backend.models.openvpn_settings import OpenVPNSettings
-
-            db = SessionLocal()
-            try:
-                settings = db.query(OpenVPNSettings).order_by(OpenVPNSettings.id.asc()).first()
-                if settings:
-                    return {
-                        "obfuscation_mode": settings.obfuscation_mode,
-                        "proxy_server": settings.proxy_server,
-                        "proxy_address": settings.proxy_address,
-                        "proxy_port": settings.proxy_port,
-                        "spoofed_host": settings.spoofed_host,
-                        "socks_server": settings.socks_server,
-                        "socks_port": settings.socks_port,
-                        "stunnel_port": settings.stunnel_port,
-                        "sni_domain": settings.sni_domain,
-                        "cdn_domain": settings.cdn_domain,
-                        "ws_path": settings.ws_path,
-                        "ws_port": settings.ws_port,
-                    }
-            finally:
-                db.close()
-        except Exception as exc:
-            logger.warning(f"Falling back to default obfuscation settings: {exc}")
-
-        return {
-            "obfuscation_mode": "standard",
-            "proxy_server": None,
-            "proxy_address": None,
-            "proxy_port": 8080,
-            "spoofed_host": "speedtest.net",
-            "socks_server": None,
-            "socks_port": None,
-            "stunnel_port": 443,
-            "sni_domain": None,
-            "cdn_domain": None,
-            "ws_path": "/stream",
-            "ws_port": 8080,
-        }
+        openvpn_settings, _ = self._load_runtime_settings()
+        return {key: openvpn_settings.get(key) for key in OBFUSCATION_SETTING_KEYS}
 
     def _resolve_client_remote_address(
         self,
@@ -3187,45 +3516,13 @@ if __name__ == "__main__":
         if explicit_address:
             return explicit_address
 
-        try:
-            from backend.database import SessionLocal
-            from backend.models.general_settings import GeneralSettings
-
-            db = SessionLocal()
-            try:
-                settings = db.query(GeneralSettings).order_by(GeneralSettings.id.asc()).first()
-                if settings:
-                    persisted_address = (settings.server_address or "").strip()
-                    if persisted_address:
-                        return persisted_address
-            finally:
-                db.close()
-        except Exception as exc:
-            logger.warning(f"Falling back to default client remote address: {exc}")
-
-        return ""
+        _, general_settings = self._load_runtime_settings()
+        return str(general_settings.get("server_address") or "").strip()
 
     def generate_server_config(self, settings: Optional[Dict[str, any]] = None) -> Dict[str, any]:
         """Generate OpenVPN 2.6 server.conf content from persisted settings."""
         try:
-            dco_data_ciphers = "AES-256-GCM:AES-128-GCM:CHACHA20-POLY1305"
-
-            def _is_dco_incompatible_directive(directive: str) -> bool:
-                normalized = str(directive or "").strip().lower()
-                if not normalized:
-                    return False
-
-                normalized = normalized.strip('"\'')
-                return (
-                    normalized == "comp-lzo"
-                    or normalized.startswith("comp-lzo ")
-                    or normalized == "compress"
-                    or normalized.startswith("compress ")
-                    or normalized == "disable-dco"
-                    or normalized.startswith("disable-dco ")
-                    or normalized == "packet-filter"
-                    or normalized.startswith("packet-filter ")
-                )
+            dco_data_ciphers = DEFAULT_DATA_CIPHERS
 
             runtime_openvpn_settings, _ = self._load_runtime_settings()
             effective_settings: Dict[str, any] = dict(runtime_openvpn_settings)
@@ -3282,14 +3579,6 @@ if __name__ == "__main__":
             auth_digest = str(settings.get("auth_digest", "SHA256")).upper().strip()
             reneg_sec = int(settings.get("reneg_sec", 3600))
 
-            def _safe_int(value, default=None):
-                try:
-                    if value is None or (isinstance(value, str) and not value.strip()):
-                        return default
-                    return int(value)
-                except (ValueError, TypeError):
-                    return default
-
             tun_mtu = _safe_int(settings.get("tun_mtu"))
             mssfix = _safe_int(settings.get("mssfix"))
             sndbuf = _safe_int(settings.get("sndbuf"))
@@ -3306,17 +3595,17 @@ if __name__ == "__main__":
 
             custom_directives = (settings.get("custom_directives") or "").strip()
 
-            if protocol not in {"udp", "tcp", "udp6", "tcp6"}:
+            if protocol not in SERVER_PROTOCOLS:
                 raise ValueError("Protocol must be udp, tcp, udp6, or tcp6")
-            if device_type not in {"tun", "tap"}:
+            if device_type not in SERVER_DEVICE_TYPES:
                 raise ValueError("Device type must be tun or tap")
             if topology != "subnet":
                 raise ValueError("Topology must be subnet")
-            if tls_version_min not in {"1.2", "1.3"}:
+            if tls_version_min not in SERVER_TLS_VERSIONS:
                 raise ValueError("TLS minimum version must be 1.2 or 1.3")
-            if tls_mode not in {"tls-crypt", "tls-auth", "none"}:
+            if tls_mode not in SERVER_TLS_MODES:
                 raise ValueError("TLS mode must be tls-crypt, tls-auth, or none")
-            if auth_digest not in {"SHA256", "SHA384", "SHA512"}:
+            if auth_digest not in SERVER_AUTH_DIGESTS:
                 raise ValueError("Auth digest must be SHA256, SHA384, or SHA512")
 
             push_lines: List[str] = []
@@ -3333,27 +3622,12 @@ if __name__ == "__main__":
             if block_outside_dns:
                 push_lines.append('push "block-outside-dns"')
             # Custom Routes (comma or newline separated)
-            push_custom_routes = (settings.get("push_custom_routes") or "").strip()
             if push_custom_routes:
-                for route in [seg.strip() for seg in push_custom_routes.replace(',', '\n').splitlines() if seg.strip()]:
-                    # Normalize and prepend push route
-                    sanitized = route.replace('route ', '').strip()
-                    push_lines.append(f'push "route {sanitized}"')
-            
+                push_lines.extend(_iter_route_push_lines(push_custom_routes))
+
             advanced_client_push = (settings.get("advanced_client_push") or "").strip()
             if advanced_client_push:
-                for directive in [line.strip() for line in advanced_client_push.splitlines() if line.strip()]:
-                    if directive.startswith("push "):
-                        directive_body = directive[5:].strip().strip('"').strip("'")
-                        if _is_dco_incompatible_directive(directive_body):
-                            logger.warning("Skipping DCO-incompatible advanced push directive: %s", directive)
-                            continue
-                        push_lines.append(directive)
-                    else:
-                        if _is_dco_incompatible_directive(directive):
-                            logger.warning("Skipping DCO-incompatible advanced push directive: %s", directive)
-                            continue
-                        push_lines.append(f'push "{directive}"')
+                push_lines.extend(_iter_advanced_push_lines(advanced_client_push))
 
             if tls_mode == "tls-crypt":
                 tls_key_path = self.config.TLS_CRYPT_KEY if self.config.TLS_CRYPT_KEY.exists() else self.config.TA_KEY
@@ -3365,7 +3639,7 @@ if __name__ == "__main__":
 
             server_lines: List[str] = [
                 "# Atlas VPN - OpenVPN Server Configuration",
-                f"# Generated: {datetime.utcnow().isoformat()}",
+                f"# Generated: {_generated_timestamp_iso()}",
                 "# Optimized for Data Channel Offload (DCO) - OpenVPN 2.6+.",
                 "",
                 f"port {port}",
@@ -3417,19 +3691,19 @@ if __name__ == "__main__":
                 server_lines.append(f"sndbuf {int(sndbuf)}")
             if rcvbuf and int(rcvbuf) > 0:
                 server_lines.append(f"rcvbuf {int(rcvbuf)}")
-            if fast_io and protocol in {"udp", "udp6"}:
+            if fast_io and protocol in UDP_PROTOCOLS:
                 server_lines.append("fast-io")
-            if tcp_nodelay and protocol in {"tcp", "tcp6"}:
+            if tcp_nodelay and protocol in TCP_PROTOCOLS:
                 server_lines.append("tcp-nodelay")
             if tun_mtu and int(tun_mtu) > 0:
                 server_lines.append(f"tun-mtu {int(tun_mtu)}")
             if mssfix and int(mssfix) > 0:
                 server_lines.append(f"mssfix {int(mssfix)}")
-            if protocol in {"udp", "udp6"} and explicit_exit_notify and int(explicit_exit_notify) > 0:
+            if protocol in UDP_PROTOCOLS and explicit_exit_notify and int(explicit_exit_notify) > 0:
                 server_lines.append(f"explicit-exit-notify {int(explicit_exit_notify)}")
             if management_port and int(management_port) > 0:
                 server_lines.append(f"management 127.0.0.1 {int(management_port)}")
-            server_lines.append(f"status {self.config.STATUS_LOG}")
+            server_lines.append(f"status {self.config.STATUS_LOG} {STATUS_LOG_REFRESH_SECONDS}")
             server_lines.append("status-version 2")
             server_lines.append("suppress-timestamps")
 
@@ -3460,7 +3734,7 @@ if __name__ == "__main__":
 
             if custom_directives:
                 server_lines.append("")
-                for directive in [line.strip() for line in custom_directives.splitlines() if line.strip()]:
+                for directive in (stripped for line in custom_directives.splitlines() if (stripped := line.strip())):
                     if _is_dco_incompatible_directive(directive):
                         logger.warning("Skipping DCO-incompatible server custom directive: %s", directive)
                         continue
@@ -3472,12 +3746,18 @@ if __name__ == "__main__":
             primary_conf_path, compatibility_conf_path = self._get_server_conf_paths()
 
             if self.is_production:
-                primary_conf_path.parent.mkdir(parents=True, exist_ok=True)
-                primary_conf_path.write_text(server_conf)
+                existing_conf = self._read_unchanged_server_conf(primary_conf_path, server_conf)
+                if existing_conf is not None:
+                    # Same settings as on disk: keep the file (and its Generated stamp) untouched.
+                    server_conf = existing_conf
+                else:
+                    primary_conf_path.parent.mkdir(parents=True, exist_ok=True)
+                    _write_file_atomic(primary_conf_path, server_conf)
 
                 try:
-                    compatibility_conf_path.parent.mkdir(parents=True, exist_ok=True)
-                    compatibility_conf_path.write_text(server_conf)
+                    if self._read_unchanged_server_conf(compatibility_conf_path, server_conf) is None:
+                        compatibility_conf_path.parent.mkdir(parents=True, exist_ok=True)
+                        _write_file_atomic(compatibility_conf_path, server_conf)
                 except Exception as compat_exc:
                     logger.warning(
                         "Failed to write compatibility OpenVPN server config at %s: %s",
@@ -3511,18 +3791,20 @@ if __name__ == "__main__":
                 "error": str(e),
             }
 
+    @staticmethod
+    def _read_unchanged_server_conf(conf_path: Path, server_conf: str) -> Optional[str]:
+        """Return the on-disk server.conf if it only differs from ``server_conf`` by its Generated stamp."""
+        try:
+            existing_conf = conf_path.read_text()
+        except OSError:
+            return None
+        if SERVER_CONF_GENERATED_RE.sub("", existing_conf, 1) != SERVER_CONF_GENERATED_RE.sub("", server_conf, 1):
+            return None
+        return existing_conf
+
     def _get_os_specific_directives(self, os_type: str) -> str:
         """Return additional directives optimized for target client OS."""
-        directives_by_os = {
-            "windows": "setenv opt block-outside-dns\nregister-dns",
-            "mac": "resolv-retry 30\nroute-delay 2",
-            "macos": "resolv-retry 30\nroute-delay 2",
-            "ios": "resolv-retry 30\nexplicit-exit-notify",
-            "mac_ios": "resolv-retry 30\nexplicit-exit-notify",
-            "android": "explicit-exit-notify\nremote-cert-tls server",
-            "linux": "resolv-retry infinite\nscript-security 2"
-        }
-        return directives_by_os.get(os_type, "")
+        return OS_SPECIFIC_DIRECTIVES.get(os_type, "")
     
     def generate_qr_code(self, config_content: str) -> Optional[str]:
         """
@@ -3534,57 +3816,62 @@ if __name__ == "__main__":
         Returns:
             Base64 encoded PNG image
         """
-        try:
-            qr = qrcode.QRCode(
-                version=None,  # Auto-determine size
-                error_correction=qrcode.constants.ERROR_CORRECT_L,
-                box_size=10,
-                border=4,
-            )
-            qr.add_data(config_content)
-            qr.make(fit=True)
-            
-            img = qr.make_image(fill_color="black", back_color="white")
-            
-            # Convert to base64
-            buffer = io.BytesIO()
-            img.save(buffer, format='PNG')
-            img_str = base64.b64encode(buffer.getvalue()).decode()
-            
-            return f"data:image/png;base64,{img_str}"
-            
-        except Exception as e:
-            logger.error(f"QR code generation failed: {e}")
-            return None
-    
-    def get_service_status(self) -> Dict[str, any]:
+        return _render_qr_data_uri_or_none(config_content)
+
+    def get_service_status(self, verbose: bool = False) -> Dict[str, any]:
         """
-        Get OpenVPN service status using systemctl.
+        Get OpenVPN service status via pystemd D-Bus (when installed) or systemctl.
         
+        Args:
+            verbose: Also collect full `systemctl status` output (journal excerpt included)
+            
         Returns:
             Dict with service status information
         """
+        self._refresh_service_name_if_stale()
+        if not verbose:
+            with self._status_cache_lock:
+                cached = self._status_cache
+                if (
+                    cached is not None
+                    and time.monotonic() - cached[0] < SERVICE_STATUS_CACHE_TTL_SECONDS
+                    and cached[1].get("service_name") == self.service_name
+                ):
+                    return dict(cached[1])
+
         try:
-            success, stdout, stderr = self._run_command([
-                "systemctl",
-                "status",
-                self.service_name
-            ], check=False)
-            
-            # Parse systemctl output
-            is_active = "active (running)" in stdout
-            is_enabled = "enabled" in stdout
+            active_state, unit_file_state = self._read_unit_state()
+            if not unit_file_state:
+                # No unit file behind the memoized name: detect the unit again on the next poll.
+                self._service_name_stale = True
+            is_active = active_state == b"active"
+            is_enabled = unit_file_state in ENABLED_UNIT_FILE_STATES
+
+            status_output: Optional[str] = None
+            if verbose:
+                _, status_bytes, _ = self._run_command([
+                    "systemctl",
+                    "status",
+                    self.service_name,
+                    "--no-pager",
+                ], check=False, text=False)
+                status_output = (status_bytes or b"").decode("utf-8", errors="replace")
             
-            return {
+            result = {
                 "success": True,
                 "service_name": self.service_name,
                 "is_active": is_active,
                 "is_enabled": is_enabled,
-                "status_output": stdout,
+                "status_output": status_output,
                 "is_mock": not self.is_production
             }
+            if not verbose:
+                with self._status_cache_lock:
+                    self._status_cache = (time.monotonic(), dict(result))
+            return result
             
         except Exception as e:
+            self._service_name_stale = True
             logger.error(f"Service status check failed: {e}")
             return {
                 "success": False,
@@ -3592,34 +3879,171 @@ if __name__ == "__main__":
                 "error": str(e)
             }
     
-    def control_service(self, action: str) -> Dict[str, any]:
+    def _get_systemd_unit(self) -> Optional[Any]:
+        """Return a loaded pystemd unit for the current service, or None to use systemctl."""
+        if SystemdUnit is None or not self.is_production:
+            return None
+
+        cached = self._systemd_unit
+        if cached is not None and cached[0] == self.service_name:
+            return cached[1]
+
+        unit_name = self.service_name if "." in self.service_name else f"{self.service_name}.service"
+        try:
+            unit = SystemdUnit(unit_name.encode())
+            unit.load()
+        except Exception as exc:
+            logger.debug("pystemd unit load failed for %s, using systemctl: %s", unit_name, exc)
+            return None
+
+        self._systemd_unit = (self.service_name, unit)
+        return unit
+
+    def _read_unit_state(self) -> Tuple[bytes, bytes]:
+        """Return raw (ActiveState, UnitFileState) for the OpenVPN unit."""
+        unit = self._get_systemd_unit()
+        if unit is not None:
+            try:
+                return bytes(unit.Unit.ActiveState), bytes(unit.Unit.UnitFileState)
+            except Exception as exc:
+                logger.debug("pystemd state read failed, using systemctl: %s", exc)
+                self._systemd_unit = None
+
+        _, stdout, _ = self._run_command([
+            "systemctl",
+            "show",
+            self.service_name,
+            f"--property={SYSTEMCTL_SHOW_PROPERTIES}",
+            "--no-pager",
+        ], check=False, text=False)
+
+        # Parse KEY=value properties without decoding the payload
+        properties = dict(SYSTEMCTL_SHOW_RE.findall(stdout or b""))
+        return properties.get(b"ActiveState", b""), properties.get(b"UnitFileState", b"")
+
+    def _queue_unit_job_via_dbus(self, action: str) -> Optional[Any]:
+        """Queue a start/stop/reload-or-restart job over D-Bus; None means fall back to systemctl."""
+        method_name = SYSTEMD_UNIT_JOB_METHODS.get(action)
+        unit = self._get_systemd_unit() if method_name else None
+        if unit is None:
+            return None
+        try:
+            getattr(unit.Unit, method_name)(b"replace")
+            return unit
+        except Exception as exc:
+            logger.warning("pystemd %s failed for %s, using systemctl: %s", action, self.service_name, exc)
+            self._systemd_unit = None
+            return None
+
+    def _read_unit_job_state(self, unit: Optional[Any]) -> Tuple[bool, bytes]:
+        """Return (job still queued or running, raw ActiveState) for the OpenVPN unit."""
+        if unit is not None:
+            job = unit.Unit.Job
+            return bool(job and job[0]), bytes(unit.Unit.ActiveState)
+
+        _, stdout, _ = self._run_command([
+            "systemctl",
+            "show",
+            self.service_name,
+            "--property=ActiveState,Job",
+            "--no-pager",
+        ], check=False, text=False)
+        properties = dict(SYSTEMCTL_JOB_SHOW_RE.findall(stdout or b""))
+        return properties.get(b"Job", b"") not in (b"", b"0"), properties.get(b"ActiveState", b"")
+
+    def _wait_for_unit_job(self, unit: Optional[Any], action: str) -> Tuple[Optional[bool], bytes]:
+        """
+        Poll a queued job for up to SERVICE_JOB_SETTLE_TIMEOUT_SECONDS.
+
+        Returns (True, b"") once the unit reaches the expected state, (False, error) if it
+        doesn't, and (None, b"") if the job is still running at the deadline.
+        """
+        deadline = time.monotonic() + SERVICE_JOB_SETTLE_TIMEOUT_SECONDS
+        while True:
+            try:
+                job_pending, active_state = self._read_unit_job_state(unit)
+            except Exception as exc:
+                return False, str(exc).encode("utf-8", errors="replace")
+            if not job_pending and active_state not in TRANSITIONAL_ACTIVE_STATES:
+                break
+            if time.monotonic() >= deadline:
+                return None, b""
+            time.sleep(SERVICE_JOB_POLL_INTERVAL_SECONDS)
+
+        expected_states = {b"inactive", b"failed"} if action == "stop" else {b"active"}
+        if active_state in expected_states:
+            return True, b""
+        return False, b"unit is " + (active_state or b"unknown")
+
+    def invalidate_service_status_cache(self) -> None:
+        """Drop the cached service status so the next poll observes fresh state."""
+        with self._status_cache_lock:
+            self._status_cache = None
+
+    def control_service(self, action: str, wait: bool = True) -> Dict[str, any]:
         """
         Control OpenVPN service (start/stop/restart).
+
+        start/stop/restart are queued as systemd jobs without blocking; restart is issued
+        as reload-or-restart so a unit with ExecReload re-reads server.conf in place.
         
         Args:
-            action: start, stop, restart, or enable
+            action: start, stop, restart, enable, or disable
+            wait: Poll the queued job (bounded by SERVICE_JOB_SETTLE_TIMEOUT_SECONDS) and
+                report whether the unit reached the expected state. Config-apply callers
+                rely on this to surface a server.conf that openvpn refuses to start with.
             
         Returns:
             Dict with operation result
         """
-        if action not in ["start", "stop", "restart", "enable", "disable"]:
+        if action not in SERVICE_CONTROL_ACTIONS:
             return {
                 "success": False,
                 "message": f"Invalid action: {action}"
             }
         
         try:
-            success, stdout, stderr = self._run_command([
-                "systemctl",
-                action,
-                self.service_name
-            ])
+            stderr = b""
+            is_job = action in SYSTEMCTL_JOB_VERBS
+            unit = self._queue_unit_job_via_dbus(action)
+            if unit is not None:
+                success = True
+            elif is_job:
+                # stderr stays as raw bytes and is only decoded on the failure path
+                success, _, stderr = self._run_command(
+                    ["systemctl", "--no-block", SYSTEMCTL_JOB_VERBS[action], self.service_name],
+                    text=False,
+                )
+            else:
+                success, _, stderr = self._run_command(["systemctl", action, self.service_name], text=False)
+
+            outcome = "queued" if is_job and not wait else "completed"
+            # Mock-mode systemctl has no unit to poll, so only real queued jobs are waited on.
+            if success and is_job and wait and (unit is not None or self.is_production):
+                settled, stderr = self._wait_for_unit_job(unit, action)
+                if settled is None:
+                    outcome = "still in progress"
+                else:
+                    success = settled
+            # Status polls (cache invalidated here) observe the outcome of a queued job.
+            self.invalidate_service_status_cache()
+            self._service_name_stale = True
             
+            if not success:
+                error_text = (stderr or b"").decode("utf-8", errors="replace").strip()
+                return {
+                    "success": False,
+                    "action": action,
+                    "service_name": self.service_name,
+                    "message": f"Service {action} failed: {error_text}" if error_text else f"Service {action} failed",
+                    "is_mock": not self.is_production
+                }
+
             return {
                 "success": success,
                 "action": action,
                 "service_name": self.service_name,
-                "message": f"Service {action} completed",
+                "message": f"Service {action} {outcome}",
                 "is_mock": not self.is_production
             }
             
@@ -4,12 +4,19 @@ import platform
 import shutil
 import subprocess
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
 
 logger = logging.getLogger(__name__)
 
+# revoke_client() regenerates the CRL itself, so ensure_ready() only needs to renew
+# a placed CRL once it is older than this (Easy-RSA CRLs are valid for 180 days).
+CRL_REFRESH_SECONDS = 24 * 60 * 60
+# Matches the Easy-RSA default key size used by `easyrsa gen-dh`.
+DH_PARAMS_BITS = 2048
+
 
 class PKIManager:
     """Production-safe Easy-RSA/OpenVPN PKI lifecycle manager."""
@@ -39,6 +46,8 @@ class PKIManager:
         self.server_key_path = self.pki_dir / "private" / "server.key"
         self.dh_params_path = self.pki_dir / "dh.pem"
         self.is_production = bool(is_production)
+        self._easyrsa_cmd: Optional[List[str]] = None
+        self._easyrsa_resolved = False
 
     def _chmod_if_exists(self, path: Path, mode: int) -> None:
         if not self._is_supported_runtime():
@@ -53,6 +62,13 @@ class PKIManager:
         return self.is_production and platform.system() == "Linux"
 
     def _find_easyrsa_executable(self) -> Optional[List[str]]:
+        # Resolved once per process; call refresh_tools() after installing Easy-RSA.
+        if not self._easyrsa_resolved:
+            self._easyrsa_cmd = self._resolve_easyrsa_executable()
+            self._easyrsa_resolved = True
+        return list(self._easyrsa_cmd) if self._easyrsa_cmd else None
+
+    def _resolve_easyrsa_executable(self) -> Optional[List[str]]:
         local_bin = self.easyrsa_dir / "easyrsa"
         if local_bin.exists():
             return [str(local_bin)]
@@ -63,6 +79,11 @@ class PKIManager:
 
         return None
 
+    def refresh_tools(self) -> None:
+        """Forget the cached Easy-RSA location so the next lookup searches again."""
+        self._easyrsa_cmd = None
+        self._easyrsa_resolved = False
+
     def is_easyrsa_available(self) -> bool:
         return self._find_easyrsa_executable() is not None
 
@@ -120,6 +141,31 @@ class PKIManager:
         self._chmod_if_exists(self.openvpn_crl_path, 0o644)
         return {"success": True, "crl_path": str(self.openvpn_crl_path)}
 
+    def _is_crl_current(self) -> bool:
+        """True when OpenVPN already has the latest CRL and it is not due for renewal."""
+        try:
+            pki_crl_mtime = self.pki_crl_path.stat().st_mtime
+            if self.openvpn_crl_path.stat().st_mtime < pki_crl_mtime:
+                return False
+        except OSError:
+            return False
+        return time.time() - pki_crl_mtime < CRL_REFRESH_SECONDS
+
+    def _generate_dh_params(self) -> Tuple[bool, str, str]:
+        # Plain openssl instead of `easyrsa gen-dh`: Easy-RSA 3.2 holds a PKI lock file,
+        # so a second easyrsa process cannot run next to build-ca.
+        tmp_path = self.dh_params_path.with_name(f"{self.dh_params_path.name}.tmp")
+        ok, out, err = self._run_command(
+            ["openssl", "dhparam", "-out", str(tmp_path), str(DH_PARAMS_BITS)],
+            check=False,
+        )
+        if ok:
+            try:
+                os.replace(tmp_path, self.dh_params_path)
+            except OSError as exc:
+                return False, out, str(exc)
+        return ok, out, err
+
     def ensure_ready(self) -> Dict[str, Any]:
         """Auto-init PKI and server materials if missing; never crash in dev."""
         if not self._is_supported_runtime():
@@ -146,6 +192,13 @@ class PKIManager:
         dh_exists = self.dh_params_path.exists()
 
         if ca_exists and ta_exists and server_cert_exists and server_key_exists and dh_exists:
+            if self._is_crl_current():
+                return {
+                    "success": True,
+                    "message": "PKI already initialized",
+                    "auto_initialized": False,
+                    "crl_path": str(self.openvpn_crl_path),
+                }
             crl_result = self._ensure_crl_available(easyrsa_cmd)
             if not crl_result.get("success"):
                 return crl_result
@@ -165,6 +218,14 @@ class PKIManager:
             if not ok:
                 return {"success": False, "message": f"init-pki failed: {err or out}"}
 
+        dh_future: Optional[Future] = None
+        if not dh_exists and shutil.which("openssl"):
+            # DH params dominate first-run setup and need nothing from the CA, so
+            # generate them alongside the CA/server signing below.
+            executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="atlas-pki-dh")
+            dh_future = executor.submit(self._generate_dh_params)
+            executor.shutdown(wait=False)
+
         if not ca_exists:
             ok, out, err = self._run_command(
                 [*easyrsa_cmd, "build-ca", "nopass"],
@@ -185,7 +246,10 @@ class PKIManager:
                 return {"success": False, "message": f"build-server-full failed: {err or out}"}
 
         if not dh_exists:
-            ok, out, err = self._run_command([*easyrsa_cmd, "gen-dh"], cwd=self.easyrsa_dir, check=False)
+            if dh_future is not None:
+                ok, out, err = dh_future.result()
+            else:
+                ok, out, err = self._run_command([*easyrsa_cmd, "gen-dh"], cwd=self.easyrsa_dir, check=False)
             if not ok:
                 return {"success": False, "message": f"gen-dh failed: {err or out}"}
 
@@ -630,6 +630,7 @@ class WireGuardManager:
         from backend.models.general_settings import GeneralSettings
         from backend.models.vpn_user import VPNUser
         from backend.models.wireguard_settings import WireGuardSettings
+        from sqlalchemy.orm import selectinload
 
         settings = db.query(WireGuardSettings).order_by(WireGuardSettings.id.asc()).first()
         if not settings:
@@ -644,7 +645,7 @@ class WireGuardManager:
         wan_interface = (getattr(general_settings, "wan_interface", "") or "").strip() or None
 
         peers: list[dict[str, str]] = []
-        users = db.query(VPNUser).all()
+        users = db.query(VPNUser).options(selectinload(VPNUser.configs)).all()
         for user in users:
             if not bool(getattr(user, "is_enabled", False)):
                 continue
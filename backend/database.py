@@ -1,7 +1,13 @@
+import hashlib
 import ipaddress
 from urllib.request import urlopen
 
-from sqlalchemy import create_engine, text
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX development hosts
+    fcntl = None
+
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from backend.config import settings
@@ -10,13 +16,195 @@ settings.DATA_DIR.mkdir(parents=True, exist_ok=True)
 
 engine = create_engine(
     settings.DATABASE_URL,
-    connect_args={"check_same_thread": False}
+    connect_args={"check_same_thread": False},
+    pool_size=5,
+    max_overflow=10,
+)
+
+# Applied once per pooled connection. WAL lets readers proceed during writes and, with
+# synchronous=NORMAL, commits no longer fsync the main database file every time.
+SQLITE_CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA busy_timeout=5000",
 )
 
+
+@event.listens_for(engine, "connect")
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in SQLITE_CONNECTION_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
+# Folded into the PRAGMA user_version stamp together with the model columns (see
+# _schema_stamp), so adding a column re-runs the migrations on its own. Bump only when a
+# data backfill changes without any column change.
+SCHEMA_VERSION = 3
+
+# Serializes init_db across worker processes sharing the data directory.
+MIGRATION_LOCK_PATH = settings.DATA_DIR / ".migrate.lock"
+
+# An empty table missing more columns than this is recreated from its model instead of altered.
+EMPTY_TABLE_REBUILD_MIN_MISSING_COLUMNS = 5
+
+# Additive column migrations for existing deployments, keyed by column name.
+VPN_USERS_COLUMN_MIGRATIONS = {
+    "max_devices": "ALTER TABLE vpn_users ADD COLUMN max_devices INTEGER NOT NULL DEFAULT 1",
+    "traffic_limit_bytes": "ALTER TABLE vpn_users ADD COLUMN traffic_limit_bytes BIGINT",
+    "traffic_used_bytes": "ALTER TABLE vpn_users ADD COLUMN traffic_used_bytes BIGINT NOT NULL DEFAULT 0",
+    "access_start_at": "ALTER TABLE vpn_users ADD COLUMN access_start_at DATETIME",
+    "access_expires_at": "ALTER TABLE vpn_users ADD COLUMN access_expires_at DATETIME",
+    "max_concurrent_connections": "ALTER TABLE vpn_users ADD COLUMN max_concurrent_connections INTEGER NOT NULL DEFAULT 1",
+    "current_connections": "ALTER TABLE vpn_users ADD COLUMN current_connections INTEGER NOT NULL DEFAULT 0",
+    "is_connection_limit_exceeded": "ALTER TABLE vpn_users ADD COLUMN is_connection_limit_exceeded BOOLEAN NOT NULL DEFAULT 0",
+    "wg_private_key": "ALTER TABLE vpn_users ADD COLUMN wg_private_key VARCHAR(128)",
+    "wg_public_key": "ALTER TABLE vpn_users ADD COLUMN wg_public_key VARCHAR(128)",
+    "wg_allocated_ip": "ALTER TABLE vpn_users ADD COLUMN wg_allocated_ip VARCHAR(64)",
+    "enable_openvpn": "ALTER TABLE vpn_users ADD COLUMN enable_openvpn BOOLEAN NOT NULL DEFAULT 1",
+    "enable_l2tp": "ALTER TABLE vpn_users ADD COLUMN enable_l2tp BOOLEAN NOT NULL DEFAULT 0",
+    "enable_openconnect": "ALTER TABLE vpn_users ADD COLUMN enable_openconnect BOOLEAN NOT NULL DEFAULT 1",
+    "ppp_password": "ALTER TABLE vpn_users ADD COLUMN ppp_password VARCHAR(255)",
+    "vless_uuid": "ALTER TABLE vpn_users ADD COLUMN vless_uuid VARCHAR(36)",
+}
+
+# openvpn_settings ALTERs are derived from the model; these override the derived statement.
+OPENVPN_SETTINGS_COLUMN_OVERRIDES = {
+    # Existing rows keep NULL; only new rows get the model's default host.
+    "spoofed_host": "ALTER TABLE openvpn_settings ADD COLUMN spoofed_host VARCHAR(255)",
+}
+
+# Post-migration value fixes for openvpn_settings as (required columns, SET expression),
+# fused into one UPDATE so the table is rewritten once. No expression reads a column
+# another one assigns, so evaluating them together matches running them in sequence.
+OPENVPN_SETTINGS_NORMALIZATIONS = (
+    (
+        frozenset({"obfuscation_mode"}),
+        """obfuscation_mode = CASE LOWER(TRIM(COALESCE(obfuscation_mode, 'standard')))
+            WHEN 'native_stealth' THEN 'stealth'
+            WHEN 'tls_tunnel' THEN 'standard'
+            WHEN 'websocket_cdn' THEN 'standard'
+            ELSE LOWER(TRIM(COALESCE(obfuscation_mode, 'standard')))
+        END""",
+    ),
+    (
+        frozenset({"resolv_retry_mode"}),
+        """resolv_retry_mode = CASE
+            WHEN resolv_retry_mode IS NULL OR TRIM(resolv_retry_mode) = '' THEN 'infinite'
+            ELSE resolv_retry_mode
+        END""",
+    ),
+    (frozenset({"persist_key"}), "persist_key = COALESCE(persist_key, 1)"),
+    (frozenset({"persist_tun"}), "persist_tun = COALESCE(persist_tun, 1)"),
+    (frozenset({"mtu", "tun_mtu"}), "tun_mtu = COALESCE(tun_mtu, mtu)"),
+    (
+        frozenset({"proxy_server", "proxy_address"}),
+        """proxy_server = CASE
+            WHEN proxy_server IS NULL OR TRIM(proxy_server) = ''
+                THEN COALESCE(NULLIF(TRIM(proxy_server), ''), NULLIF(TRIM(proxy_address), ''), proxy_server)
+            ELSE proxy_server
+        END""",
+    ),
+    (
+        frozenset({"ws_path"}),
+        """ws_path = CASE
+            WHEN ws_path IS NULL OR TRIM(ws_path) = '' OR ws_path = '/vpn-ws' THEN '/stream'
+            ELSE ws_path
+        END""",
+    ),
+    # Update default values for improved settings
+    (
+        frozenset({"tls_version_min"}),
+        "tls_version_min = CASE WHEN tls_version_min = '1.2' THEN '1.3' ELSE tls_version_min END",
+    ),
+    (frozenset({"sndbuf"}), "sndbuf = CASE WHEN sndbuf = 393216 THEN 0 ELSE sndbuf END"),
+    (frozenset({"rcvbuf"}), "rcvbuf = CASE WHEN rcvbuf = 393216 THEN 0 ELSE rcvbuf END"),
+)
+
+# Columns split out of the legacy "network netmask" / "network/prefix" pool strings.
+OPENVPN_POOL_COLUMNS = frozenset({"ipv4_pool", "ipv4_network", "ipv4_netmask", "ipv6_pool", "ipv6_network", "ipv6_prefix"})
+
+TROJAN_INBOUNDS_COLUMN_MIGRATIONS = {
+    "password": "ALTER TABLE trojan_inbounds ADD COLUMN password VARCHAR(255) NOT NULL DEFAULT ''",
+    "cert_mode": "ALTER TABLE trojan_inbounds ADD COLUMN cert_mode VARCHAR(32) NOT NULL DEFAULT 'self_signed'",
+    "cert_pem": "ALTER TABLE trojan_inbounds ADD COLUMN cert_pem TEXT",
+    "key_pem": "ALTER TABLE trojan_inbounds ADD COLUMN key_pem TEXT",
+}
+
+WIREGUARD_SETTINGS_COLUMN_MIGRATIONS = {
+    "interface_name": "ALTER TABLE wireguard_settings ADD COLUMN interface_name VARCHAR(32) NOT NULL DEFAULT 'wg0'",
+    "listen_port": "ALTER TABLE wireguard_settings ADD COLUMN listen_port INTEGER NOT NULL DEFAULT 51820",
+    "address_range": "ALTER TABLE wireguard_settings ADD COLUMN address_range VARCHAR(64) NOT NULL DEFAULT '10.9.0.0/24'",
+    "endpoint_address": "ALTER TABLE wireguard_settings ADD COLUMN endpoint_address VARCHAR(255)",
+    "server_private_key": "ALTER TABLE wireguard_settings ADD COLUMN server_private_key VARCHAR(128)",
+    "server_public_key": "ALTER TABLE wireguard_settings ADD COLUMN server_public_key VARCHAR(128)",
+    "created_at": "ALTER TABLE wireguard_settings ADD COLUMN created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP",
+    "updated_at": "ALTER TABLE wireguard_settings ADD COLUMN updated_at DATETIME",
+}
+
+GENERAL_SETTINGS_COLUMN_MIGRATIONS = {
+    "server_address": "ALTER TABLE general_settings ADD COLUMN server_address VARCHAR(255)",
+    "public_ipv4_address": "ALTER TABLE general_settings ADD COLUMN public_ipv4_address VARCHAR(64)",
+    "public_ipv6_address": "ALTER TABLE general_settings ADD COLUMN public_ipv6_address VARCHAR(64)",
+    "global_ipv6_support": "ALTER TABLE general_settings ADD COLUMN global_ipv6_support BOOLEAN NOT NULL DEFAULT 1",
+    "wan_interface": "ALTER TABLE general_settings ADD COLUMN wan_interface VARCHAR(32) NOT NULL DEFAULT 'eth0'",
+    "server_system_dns_primary": "ALTER TABLE general_settings ADD COLUMN server_system_dns_primary VARCHAR(64) NOT NULL DEFAULT '1.1.1.1'",
+    "server_system_dns_secondary": "ALTER TABLE general_settings ADD COLUMN server_system_dns_secondary VARCHAR(64) NOT NULL DEFAULT '8.8.8.8'",
+    "l2tp_ipsec_psk": "ALTER TABLE general_settings ADD COLUMN l2tp_ipsec_psk VARCHAR(255) NOT NULL DEFAULT 'atlas-change-me-strong-psk'",
+    "l2tp_client_subnet": "ALTER TABLE general_settings ADD COLUMN l2tp_client_subnet VARCHAR(32) NOT NULL DEFAULT '10.10.11.0/24'",
+    "ocserv_port": "ALTER TABLE general_settings ADD COLUMN ocserv_port INTEGER NOT NULL DEFAULT 4433",
+    "ocserv_client_subnet": "ALTER TABLE general_settings ADD COLUMN ocserv_client_subnet VARCHAR(32) NOT NULL DEFAULT '10.10.12.0/24'",
+    "singbox_log_level": "ALTER TABLE general_settings ADD COLUMN singbox_log_level VARCHAR(16) NOT NULL DEFAULT 'info'",
+    "enable_vless": "ALTER TABLE general_settings ADD COLUMN enable_vless BOOLEAN NOT NULL DEFAULT 1",
+    "vless_port": "ALTER TABLE general_settings ADD COLUMN vless_port INTEGER NOT NULL DEFAULT 443",
+    "singbox_reality_sni": "ALTER TABLE general_settings ADD COLUMN singbox_reality_sni VARCHAR(255) NOT NULL DEFAULT 'yahoo.com'",
+    "singbox_reality_public_key": "ALTER TABLE general_settings ADD COLUMN singbox_reality_public_key TEXT NOT NULL DEFAULT ''",
+    "singbox_reality_private_key": "ALTER TABLE general_settings ADD COLUMN singbox_reality_private_key TEXT NOT NULL DEFAULT ''",
+    "singbox_reality_short_ids": "ALTER TABLE general_settings ADD COLUMN singbox_reality_short_ids VARCHAR(255) NOT NULL DEFAULT '0123456789abcdef'",
+    "is_tunnel_enabled": "ALTER TABLE general_settings ADD COLUMN is_tunnel_enabled BOOLEAN NOT NULL DEFAULT 0",
+    "foreign_server_ip": "ALTER TABLE general_settings ADD COLUMN foreign_server_ip VARCHAR(64)",
+    "foreign_server_port": "ALTER TABLE general_settings ADD COLUMN foreign_server_port INTEGER NOT NULL DEFAULT 22",
+    "foreign_ssh_user": "ALTER TABLE general_settings ADD COLUMN foreign_ssh_user VARCHAR(64) NOT NULL DEFAULT 'root'",
+    "foreign_ssh_password": "ALTER TABLE general_settings ADD COLUMN foreign_ssh_password VARCHAR(255)",
+    "admin_allowed_ips": "ALTER TABLE general_settings ADD COLUMN admin_allowed_ips TEXT NOT NULL DEFAULT '0.0.0.0/0'",
+    "login_max_failed_attempts": "ALTER TABLE general_settings ADD COLUMN login_max_failed_attempts INTEGER NOT NULL DEFAULT 5",
+    "login_block_duration_minutes": "ALTER TABLE general_settings ADD COLUMN login_block_duration_minutes INTEGER NOT NULL DEFAULT 15",
+    "panel_domain": "ALTER TABLE general_settings ADD COLUMN panel_domain VARCHAR(255) NOT NULL DEFAULT ''",
+    "panel_https_port": "ALTER TABLE general_settings ADD COLUMN panel_https_port INTEGER NOT NULL DEFAULT 2053",
+    "subscription_domain": "ALTER TABLE general_settings ADD COLUMN subscription_domain VARCHAR(255) NOT NULL DEFAULT ''",
+    "subscription_https_port": "ALTER TABLE general_settings ADD COLUMN subscription_https_port INTEGER NOT NULL DEFAULT 2083",
+    "ssl_mode": "ALTER TABLE general_settings ADD COLUMN ssl_mode VARCHAR(32) NOT NULL DEFAULT 'none'",
+    "letsencrypt_email": "ALTER TABLE general_settings ADD COLUMN letsencrypt_email VARCHAR(255)",
+    "force_https": "ALTER TABLE general_settings ADD COLUMN force_https BOOLEAN NOT NULL DEFAULT 0",
+    "auto_renew_ssl": "ALTER TABLE general_settings ADD COLUMN auto_renew_ssl BOOLEAN NOT NULL DEFAULT 1",
+    "custom_ssl_certificate": "ALTER TABLE general_settings ADD COLUMN custom_ssl_certificate TEXT",
+    "custom_ssl_private_key": "ALTER TABLE general_settings ADD COLUMN custom_ssl_private_key TEXT",
+    "system_timezone": "ALTER TABLE general_settings ADD COLUMN system_timezone VARCHAR(64) NOT NULL DEFAULT 'UTC'",
+    "ntp_server": "ALTER TABLE general_settings ADD COLUMN ntp_server VARCHAR(255) NOT NULL DEFAULT 'pool.ntp.org'",
+    "created_at": "ALTER TABLE general_settings ADD COLUMN created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP",
+    "updated_at": "ALTER TABLE general_settings ADD COLUMN updated_at DATETIME",
+}
+
+ROUTING_RULES_COLUMN_MIGRATIONS = {
+    "protocol": "ALTER TABLE routing_rules ADD COLUMN protocol VARCHAR(8) NOT NULL DEFAULT 'tcp'",
+    "dest_cidr": "ALTER TABLE routing_rules ADD COLUMN dest_cidr VARCHAR(64) NOT NULL DEFAULT '0.0.0.0/0'",
+    "description": "ALTER TABLE routing_rules ADD COLUMN description VARCHAR(255)",
+    "table_id": "ALTER TABLE routing_rules ADD COLUMN table_id INTEGER NOT NULL DEFAULT 0",
+    "table_name": "ALTER TABLE routing_rules ADD COLUMN table_name VARCHAR(64) NOT NULL DEFAULT ''",
+    "status": "ALTER TABLE routing_rules ADD COLUMN status VARCHAR(16) NOT NULL DEFAULT 'active'",
+    "created_at": "ALTER TABLE routing_rules ADD COLUMN created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP",
+    "updated_at": "ALTER TABLE routing_rules ADD COLUMN updated_at DATETIME",
+}
+
 
 def _detect_public_ipv4() -> str | None:
     endpoints = (
@@ -36,59 +224,172 @@ def _detect_public_ipv4() -> str | None:
     return None
 
 
+def _sqlite_literal(value) -> str:
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, (int, float)):
+        return str(value)
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _model_column_migrations(table_name: str) -> dict:
+    """
+    Build ADD COLUMN statements from a model's declared columns.
+
+    Only columns SQLite can add in place are included: primary keys and NOT NULL
+    columns without a scalar default are skipped.
+    """
+    model_table = Base.metadata.tables.get(table_name)
+    if model_table is None:
+        return {}
+
+    migrations = {}
+    for column in model_table.columns:
+        if column.primary_key:
+            continue
+        default = column.default.arg if column.default is not None and column.default.is_scalar else None
+        if not column.nullable and default is None:
+            continue
+        ddl = f"ALTER TABLE {table_name} ADD COLUMN {column.name} {column.type.compile(dialect=engine.dialect)}"
+        if not column.nullable:
+            ddl += " NOT NULL"
+        if default is not None:
+            ddl += f" DEFAULT {_sqlite_literal(default)}"
+        migrations[column.name] = ddl
+    return migrations
+
+
+def _schema_stamp() -> int:
+    """user_version for the declared models; any table, column, type or nullability change alters it."""
+    digest = hashlib.blake2b(str(SCHEMA_VERSION).encode("ascii"), digest_size=4)
+    for table in sorted(Base.metadata.tables.values(), key=lambda model_table: model_table.name):
+        for column in table.columns:
+            column_type = column.type.compile(dialect=engine.dialect)
+            digest.update(f"\0{table.name}.{column.name}:{column_type}:{column.nullable}".encode("utf-8"))
+    # user_version is a signed 32-bit integer and 0 means "never stamped".
+    return (int.from_bytes(digest.digest(), "big") & 0x7FFFFFFF) or 1
+
+
+def _split_ipv4_pool(pool: str | None, network: str | None, netmask: str | None) -> tuple:
+    """Return (network, netmask) parsed from an "address netmask" pool string."""
+    if pool is None:
+        return network, netmask
+    pool_network, _, pool_netmask = pool.strip().partition(" ")
+    return (
+        pool_network or network or "10.8.0.0",
+        pool_netmask.strip() or netmask or "255.255.255.0",
+    )
+
+
+def _split_ipv6_pool(pool: str | None, network: str | None, prefix: int | None) -> tuple:
+    """Return (network, prefix) parsed from an "address/prefix" pool string."""
+    if pool is None or "/" not in pool:
+        return network, prefix
+    pool_network, _, pool_prefix = pool.partition("/")
+    pool_prefix = pool_prefix.strip()
+    return (
+        pool_network.strip() or network,
+        int(pool_prefix) if pool_prefix.isdigit() else prefix,
+    )
+
+
+def _backfill_openvpn_pool_columns(connection) -> None:
+    """Split ipv4_pool / ipv6_pool into their network columns in one pass over the rows."""
+    rows = connection.exec_driver_sql(
+        "SELECT id, ipv4_pool, ipv4_network, ipv4_netmask, ipv6_pool, ipv6_network, ipv6_prefix FROM openvpn_settings"
+    ).fetchall()
+    updates = []
+    for row_id, ipv4_pool, ipv4_network, ipv4_netmask, ipv6_pool, ipv6_network, ipv6_prefix in rows:
+        current = (ipv4_network, ipv4_netmask, ipv6_network, ipv6_prefix)
+        parsed = (
+            *_split_ipv4_pool(ipv4_pool, ipv4_network, ipv4_netmask),
+            *_split_ipv6_pool(ipv6_pool, ipv6_network, ipv6_prefix),
+        )
+        if parsed != current:
+            updates.append((*parsed, row_id))
+    if updates:
+        connection.exec_driver_sql(
+            "UPDATE openvpn_settings SET ipv4_network = ?, ipv4_netmask = ?, ipv6_network = ?, ipv6_prefix = ? WHERE id = ?",
+            updates,
+        )
+
+
+def _apply_column_migrations(connection, table_name: str, column_migrations: dict, rebuild_if_empty: bool = False) -> set:
+    """Add the columns a table is missing using one schema introspection.
+
+    Returns the table's column names after migrating, so callers don't need to
+    re-read ``PRAGMA table_info``.
+    """
+    columns = connection.execute(text(f"PRAGMA table_info({table_name})")).fetchall()
+    column_names = {col[1] for col in columns}
+    missing = [column_name for column_name in column_migrations if column_name not in column_names]
+    if not missing:
+        return column_names
+
+    model_table = Base.metadata.tables.get(table_name)
+    if (
+        rebuild_if_empty
+        and model_table is not None
+        and len(missing) > EMPTY_TABLE_REBUILD_MIN_MISSING_COLUMNS
+        and connection.execute(text(f"SELECT COUNT(*) FROM {table_name}")).scalar_one() == 0
+    ):
+        model_table.drop(connection)
+        model_table.create(connection)
+        return {column.name for column in model_table.columns}
+
+    for column_name in missing:
+        connection.exec_driver_sql(column_migrations[column_name])
+    column_names.update(missing)
+    return column_names
+
+
 def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+    with SessionLocal() as db:
+        try:
+            yield db
+        except Exception:
+            # Hand the pooled connection back clean instead of mid-transaction.
+            db.rollback()
+            raise
 
 
 def init_db():
+    """Create and migrate the schema, one process at a time across workers."""
+    if fcntl is None:
+        _init_db_locked()
+        return
+
+    with open(MIGRATION_LOCK_PATH, "w") as lock_file:
+        # Later workers block here, then hit the user_version short-circuit.
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            _init_db_locked()
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _init_db_locked():
     from backend.models.vless_inbound import VlessInbound  # noqa: F401
     from backend.models.hysteria_inbound import HysteriaInbound  # noqa: F401
     from backend.models.trojan_inbound import TrojanInbound  # noqa: F401
     from backend.models.tuic_inbound import TuicInbound  # noqa: F401
     from backend.models.shadowsocks_inbound import ShadowsocksInbound  # noqa: F401
+    from backend.models.openvpn_settings import OpenVPNSettings  # noqa: F401
 
     Base.metadata.create_all(bind=engine)
+    schema_stamp = _schema_stamp()
     # Lightweight SQLite migration for existing deployments
     with engine.begin() as connection:
+        if connection.execute(text("PRAGMA user_version")).scalar_one() == schema_stamp:
+            return
+
         table_exists = connection.execute(
             text("SELECT name FROM sqlite_master WHERE type='table' AND name='vpn_users'")
         ).fetchone()
         if not table_exists:
             return
 
-        columns = connection.execute(text("PRAGMA table_info(vpn_users)")).fetchall()
-        column_names = {col[1] for col in columns}
-        if "max_devices" not in column_names:
-            connection.execute(
-                text("ALTER TABLE vpn_users ADD COLUMN max_devices INTEGER NOT NULL DEFAULT 1")
-            )
-        vpn_user_column_migrations = {
-            "traffic_limit_bytes": "ALTER TABLE vpn_users ADD COLUMN traffic_limit_bytes BIGINT",
-            "traffic_used_bytes": "ALTER TABLE vpn_users ADD COLUMN traffic_used_bytes BIGINT NOT NULL DEFAULT 0",
-            "access_start_at": "ALTER TABLE vpn_users ADD COLUMN access_start_at DATETIME",
-            "access_expires_at": "ALTER TABLE vpn_users ADD COLUMN access_expires_at DATETIME",
-            "max_concurrent_connections": "ALTER TABLE vpn_users ADD COLUMN max_concurrent_connections INTEGER NOT NULL DEFAULT 1",
-            "current_connections": "ALTER TABLE vpn_users ADD COLUMN current_connections INTEGER NOT NULL DEFAULT 0",
-            "is_connection_limit_exceeded": "ALTER TABLE vpn_users ADD COLUMN is_connection_limit_exceeded BOOLEAN NOT NULL DEFAULT 0",
-            "wg_private_key": "ALTER TABLE vpn_users ADD COLUMN wg_private_key VARCHAR(128)",
-            "wg_public_key": "ALTER TABLE vpn_users ADD COLUMN wg_public_key VARCHAR(128)",
-            "wg_allocated_ip": "ALTER TABLE vpn_users ADD COLUMN wg_allocated_ip VARCHAR(64)",
-            "enable_openvpn": "ALTER TABLE vpn_users ADD COLUMN enable_openvpn BOOLEAN NOT NULL DEFAULT 1",
-            "enable_l2tp": "ALTER TABLE vpn_users ADD COLUMN enable_l2tp BOOLEAN NOT NULL DEFAULT 0",
-            "enable_openconnect": "ALTER TABLE vpn_users ADD COLUMN enable_openconnect BOOLEAN NOT NULL DEFAULT 1",
-            "ppp_password": "ALTER TABLE vpn_users ADD COLUMN ppp_password VARCHAR(255)",
-            "vless_uuid": "ALTER TABLE vpn_users ADD COLUMN vless_uuid VARCHAR(36)",
-        }
-        for column_name, migration_sql in vpn_user_column_migrations.items():
-            if column_name not in column_names:
-                connection.execute(text(migration_sql))
-
-        columns = connection.execute(text("PRAGMA table_info(vpn_users)")).fetchall()
-        column_names = {col[1] for col in columns}
+        column_names = _apply_column_migrations(connection, "vpn_users", VPN_USERS_COLUMN_MIGRATIONS)
         if "vless_uuid" in column_names:
             connection.execute(
                 text(
@@ -191,209 +492,23 @@ def init_db():
             text("SELECT name FROM sqlite_master WHERE type='table' AND name='openvpn_settings'")
         ).fetchone()
         if openvpn_settings_table_exists:
-            openvpn_columns = connection.execute(text("PRAGMA table_info(openvpn_settings)")).fetchall()
-            openvpn_column_names = {col[1] for col in openvpn_columns}
-
-            openvpn_column_migrations = {
-                "ipv4_network": "ALTER TABLE openvpn_settings ADD COLUMN ipv4_network VARCHAR(32) NOT NULL DEFAULT '10.8.0.0'",
-                "ipv4_netmask": "ALTER TABLE openvpn_settings ADD COLUMN ipv4_netmask VARCHAR(32) NOT NULL DEFAULT '255.255.255.0'",
-                "ipv6_network": "ALTER TABLE openvpn_settings ADD COLUMN ipv6_network VARCHAR(64)",
-                "ipv6_prefix": "ALTER TABLE openvpn_settings ADD COLUMN ipv6_prefix INTEGER",
-                "ipv6_pool": "ALTER TABLE openvpn_settings ADD COLUMN ipv6_pool VARCHAR(64)",
-                "max_clients": "ALTER TABLE openvpn_settings ADD COLUMN max_clients INTEGER NOT NULL DEFAULT 100",
-                "client_to_client": "ALTER TABLE openvpn_settings ADD COLUMN client_to_client BOOLEAN NOT NULL DEFAULT 0",
-                "primary_dns": "ALTER TABLE openvpn_settings ADD COLUMN primary_dns VARCHAR(64) NOT NULL DEFAULT '8.8.8.8'",
-                "secondary_dns": "ALTER TABLE openvpn_settings ADD COLUMN secondary_dns VARCHAR(64) NOT NULL DEFAULT '1.1.1.1'",
-                "block_outside_dns": "ALTER TABLE openvpn_settings ADD COLUMN block_outside_dns BOOLEAN NOT NULL DEFAULT 0",
-                "push_custom_routes": "ALTER TABLE openvpn_settings ADD COLUMN push_custom_routes TEXT",
-                "tls_mode": "ALTER TABLE openvpn_settings ADD COLUMN tls_mode VARCHAR(16) NOT NULL DEFAULT 'tls-crypt'",
-                "reneg_sec": "ALTER TABLE openvpn_settings ADD COLUMN reneg_sec INTEGER NOT NULL DEFAULT 3600",
-                "tun_mtu": "ALTER TABLE openvpn_settings ADD COLUMN tun_mtu INTEGER NOT NULL DEFAULT 1500",
-                "mssfix": "ALTER TABLE openvpn_settings ADD COLUMN mssfix INTEGER NOT NULL DEFAULT 1450",
-                "sndbuf": "ALTER TABLE openvpn_settings ADD COLUMN sndbuf INTEGER NOT NULL DEFAULT 393216",
-                "rcvbuf": "ALTER TABLE openvpn_settings ADD COLUMN rcvbuf INTEGER NOT NULL DEFAULT 393216",
-                "explicit_exit_notify": "ALTER TABLE openvpn_settings ADD COLUMN explicit_exit_notify INTEGER NOT NULL DEFAULT 1",
-                "tcp_nodelay": "ALTER TABLE openvpn_settings ADD COLUMN tcp_nodelay BOOLEAN NOT NULL DEFAULT 0",
-                "keepalive_ping": "ALTER TABLE openvpn_settings ADD COLUMN keepalive_ping INTEGER NOT NULL DEFAULT 10",
-                "keepalive_timeout": "ALTER TABLE openvpn_settings ADD COLUMN keepalive_timeout INTEGER NOT NULL DEFAULT 120",
-                "inactive_timeout": "ALTER TABLE openvpn_settings ADD COLUMN inactive_timeout INTEGER NOT NULL DEFAULT 300",
-                "management_port": "ALTER TABLE openvpn_settings ADD COLUMN management_port INTEGER NOT NULL DEFAULT 5555",
-                "verbosity": "ALTER TABLE openvpn_settings ADD COLUMN verbosity INTEGER NOT NULL DEFAULT 3",
-                "advanced_client_push": "ALTER TABLE openvpn_settings ADD COLUMN advanced_client_push TEXT",
-                "obfuscation_mode": "ALTER TABLE openvpn_settings ADD COLUMN obfuscation_mode VARCHAR(32) NOT NULL DEFAULT 'standard'",
-                "proxy_server": "ALTER TABLE openvpn_settings ADD COLUMN proxy_server VARCHAR(255)",
-                "proxy_address": "ALTER TABLE openvpn_settings ADD COLUMN proxy_address VARCHAR(255)",
-                "proxy_port": "ALTER TABLE openvpn_settings ADD COLUMN proxy_port INTEGER NOT NULL DEFAULT 8080",
-                "spoofed_host": "ALTER TABLE openvpn_settings ADD COLUMN spoofed_host VARCHAR(255)",
-                "socks_server": "ALTER TABLE openvpn_settings ADD COLUMN socks_server VARCHAR(255)",
-                "socks_port": "ALTER TABLE openvpn_settings ADD COLUMN socks_port INTEGER",
-                "stunnel_port": "ALTER TABLE openvpn_settings ADD COLUMN stunnel_port INTEGER NOT NULL DEFAULT 443",
-                "sni_domain": "ALTER TABLE openvpn_settings ADD COLUMN sni_domain VARCHAR(255)",
-                "cdn_domain": "ALTER TABLE openvpn_settings ADD COLUMN cdn_domain VARCHAR(255)",
-                "ws_path": "ALTER TABLE openvpn_settings ADD COLUMN ws_path VARCHAR(255) NOT NULL DEFAULT '/stream'",
-                "ws_port": "ALTER TABLE openvpn_settings ADD COLUMN ws_port INTEGER NOT NULL DEFAULT 8080",
-                "custom_ios": "ALTER TABLE openvpn_settings ADD COLUMN custom_ios TEXT",
-                "custom_android": "ALTER TABLE openvpn_settings ADD COLUMN custom_android TEXT",
-                "custom_windows": "ALTER TABLE openvpn_settings ADD COLUMN custom_windows TEXT",
-                "custom_mac": "ALTER TABLE openvpn_settings ADD COLUMN custom_mac TEXT",
-                "enable_auth_nocache": "ALTER TABLE openvpn_settings ADD COLUMN enable_auth_nocache BOOLEAN NOT NULL DEFAULT 1",
-                "resolv_retry_mode": "ALTER TABLE openvpn_settings ADD COLUMN resolv_retry_mode VARCHAR(16) NOT NULL DEFAULT 'infinite'",
-                "persist_key": "ALTER TABLE openvpn_settings ADD COLUMN persist_key BOOLEAN NOT NULL DEFAULT 1",
-                "persist_tun": "ALTER TABLE openvpn_settings ADD COLUMN persist_tun BOOLEAN NOT NULL DEFAULT 1",
-                "enable_dns_leak_protection": "ALTER TABLE openvpn_settings ADD COLUMN enable_dns_leak_protection BOOLEAN NOT NULL DEFAULT 1",
-            }
-
-            for column_name, migration_sql in openvpn_column_migrations.items():
-                if column_name not in openvpn_column_names:
-                    connection.execute(text(migration_sql))
-
-            openvpn_columns = connection.execute(text("PRAGMA table_info(openvpn_settings)")).fetchall()
-            openvpn_column_names = {col[1] for col in openvpn_columns}
-
-            if "obfuscation_mode" in openvpn_column_names:
-                connection.execute(
-                    text(
-                        """
-                        UPDATE openvpn_settings
-                        SET obfuscation_mode = CASE LOWER(TRIM(COALESCE(obfuscation_mode, 'standard')))
-                            WHEN 'native_stealth' THEN 'stealth'
-                            WHEN 'tls_tunnel' THEN 'standard'
-                            WHEN 'websocket_cdn' THEN 'standard'
-                            ELSE LOWER(TRIM(COALESCE(obfuscation_mode, 'standard')))
-                        END
-                        """
-                    )
-                )
-
-            if "resolv_retry_mode" in openvpn_column_names:
-                connection.execute(
-                    text(
-                        """
-                        UPDATE openvpn_settings
-                        SET resolv_retry_mode = 'infinite'
-                        WHERE resolv_retry_mode IS NULL OR TRIM(resolv_retry_mode) = ''
-                        """
-                    )
-                )
-
-            if "persist_key" in openvpn_column_names:
-                connection.execute(
-                    text(
-                        """
-                        UPDATE openvpn_settings
-                        SET persist_key = 1
-                        WHERE persist_key IS NULL
-                        """
-                    )
-                )
-
-            if "persist_tun" in openvpn_column_names:
-                connection.execute(
-                    text(
-                        """
-                        UPDATE openvpn_settings
-                        SET persist_tun = 1
-                        WHERE persist_tun IS NULL
-                        """
-                    )
-                )
-
-            if "mtu" in openvpn_column_names and "tun_mtu" in openvpn_column_names:
-                connection.execute(
-                    text("UPDATE openvpn_settings SET tun_mtu = COALESCE(tun_mtu, mtu)")
-                )
-
-            if {"proxy_server", "proxy_address"}.issubset(openvpn_column_names):
-                connection.execute(
-                    text(
-                        """
-                        UPDATE openvpn_settings
-                        SET proxy_server = COALESCE(NULLIF(TRIM(proxy_server), ''), NULLIF(TRIM(proxy_address), ''), proxy_server)
-                        WHERE proxy_server IS NULL OR TRIM(proxy_server) = ''
-                        """
-                    )
-                )
-
-            if "ws_path" in openvpn_column_names:
-                connection.execute(
-                    text(
-                        """
-                        UPDATE openvpn_settings
-                        SET ws_path = '/stream'
-                        WHERE ws_path IS NULL OR TRIM(ws_path) = '' OR ws_path = '/vpn-ws'
-                        """
-                    )
-                )
-            
-            # Update default values for improved settings
-            if "tls_version_min" in openvpn_column_names:
-                connection.execute(
-                    text(
-                        """
-                        UPDATE openvpn_settings
-                        SET tls_version_min = '1.3'
-                        WHERE tls_version_min = '1.2'
-                        """
-                    )
-                )
-            
-            if "sndbuf" in openvpn_column_names:
-                connection.execute(
-                    text(
-                        """
-                        UPDATE openvpn_settings
-                        SET sndbuf = 0
-                        WHERE sndbuf = 393216
-                        """
-                    )
-                )
-            
-            if "rcvbuf" in openvpn_column_names:
-                connection.execute(
-                    text(
-                        """
-                        UPDATE openvpn_settings
-                        SET rcvbuf = 0
-                        WHERE rcvbuf = 393216
-                        """
-                    )
-                )
-
-            if {"ipv4_pool", "ipv4_network", "ipv4_netmask"}.issubset(openvpn_column_names):
-                connection.execute(
-                    text(
-                        """
-                        UPDATE openvpn_settings
-                        SET ipv4_network = COALESCE(NULLIF(TRIM(substr(ipv4_pool, 1, instr(ipv4_pool || ' ', ' ') - 1)), ''), ipv4_network, '10.8.0.0'),
-                            ipv4_netmask = COALESCE(NULLIF(TRIM(substr(ipv4_pool || ' ', instr(ipv4_pool || ' ', ' ') + 1)), ''), ipv4_netmask, '255.255.255.0')
-                        WHERE ipv4_pool IS NOT NULL
-                        """
-                    )
-                )
+            openvpn_column_names = _apply_column_migrations(
+                connection,
+                "openvpn_settings",
+                {**_model_column_migrations("openvpn_settings"), **OPENVPN_SETTINGS_COLUMN_OVERRIDES},
+                rebuild_if_empty=True,
+            )
 
-            if {"ipv6_pool", "ipv6_network"}.issubset(openvpn_column_names):
-                connection.execute(
-                    text(
-                        """
-                        UPDATE openvpn_settings
-                        SET ipv6_network = COALESCE(NULLIF(TRIM(substr(ipv6_pool, 1, instr(ipv6_pool || '/', '/') - 1)), ''), ipv6_network)
-                        WHERE ipv6_pool IS NOT NULL
-                          AND instr(ipv6_pool, '/') > 0
-                        """
-                    )
-                )
+            normalization_expressions = [
+                expression
+                for required_columns, expression in OPENVPN_SETTINGS_NORMALIZATIONS
+                if required_columns.issubset(openvpn_column_names)
+            ]
+            if normalization_expressions:
+                connection.exec_driver_sql("UPDATE openvpn_settings SET " + ", ".join(normalization_expressions))
 
-            if {"ipv6_pool", "ipv6_prefix"}.issubset(openvpn_column_names):
-                connection.execute(
-                    text(
-                        """
-                        UPDATE openvpn_settings
-                        SET ipv6_prefix = COALESCE(CAST(NULLIF(TRIM(substr(ipv6_pool || '/', instr(ipv6_pool || '/', '/') + 1)), '') AS INTEGER), ipv6_prefix)
-                        WHERE ipv6_pool IS NOT NULL
-                          AND instr(ipv6_pool, '/') > 0
-                        """
-                    )
-                )
+            if OPENVPN_POOL_COLUMNS.issubset(openvpn_column_names):
+                _backfill_openvpn_pool_columns(connection)
 
             settings_row_count = connection.execute(
                 text("SELECT COUNT(*) FROM openvpn_settings")
@@ -435,20 +550,7 @@ def init_db():
             text("SELECT name FROM sqlite_master WHERE type='table' AND name='trojan_inbounds'")
         ).fetchone()
         if trojan_inbounds_table_exists:
-            trojan_columns = connection.execute(text("PRAGMA table_info(trojan_inbounds)")).fetchall()
-            trojan_column_names = {col[1] for col in trojan_columns}
-            trojan_column_migrations = {
-                "password": "ALTER TABLE trojan_inbounds ADD COLUMN password VARCHAR(255) NOT NULL DEFAULT ''",
-                "cert_mode": "ALTER TABLE trojan_inbounds ADD COLUMN cert_mode VARCHAR(32) NOT NULL DEFAULT 'self_signed'",
-                "cert_pem": "ALTER TABLE trojan_inbounds ADD COLUMN cert_pem TEXT",
-                "key_pem": "ALTER TABLE trojan_inbounds ADD COLUMN key_pem TEXT",
-            }
-            for column_name, migration_sql in trojan_column_migrations.items():
-                if column_name not in trojan_column_names:
-                    connection.execute(text(migration_sql))
-
-            trojan_columns = connection.execute(text("PRAGMA table_info(trojan_inbounds)")).fetchall()
-            trojan_column_names = {col[1] for col in trojan_columns}
+            trojan_column_names = _apply_column_migrations(connection, "trojan_inbounds", TROJAN_INBOUNDS_COLUMN_MIGRATIONS)
             if "password" in trojan_column_names:
                 connection.execute(
                     text(
@@ -490,23 +592,7 @@ def init_db():
             text("SELECT name FROM sqlite_master WHERE type='table' AND name='wireguard_settings'")
         ).fetchone()
         if wireguard_settings_table_exists:
-            wireguard_columns = connection.execute(text("PRAGMA table_info(wireguard_settings)")).fetchall()
-            wireguard_column_names = {col[1] for col in wireguard_columns}
-
-            wireguard_column_migrations = {
-                "interface_name": "ALTER TABLE wireguard_settings ADD COLUMN interface_name VARCHAR(32) NOT NULL DEFAULT 'wg0'",
-                "listen_port": "ALTER TABLE wireguard_settings ADD COLUMN listen_port INTEGER NOT NULL DEFAULT 51820",
-                "address_range": "ALTER TABLE wireguard_settings ADD COLUMN address_range VARCHAR(64) NOT NULL DEFAULT '10.9.0.0/24'",
-                "endpoint_address": "ALTER TABLE wireguard_settings ADD COLUMN endpoint_address VARCHAR(255)",
-                "server_private_key": "ALTER TABLE wireguard_settings ADD COLUMN server_private_key VARCHAR(128)",
-                "server_public_key": "ALTER TABLE wireguard_settings ADD COLUMN server_public_key VARCHAR(128)",
-                "created_at": "ALTER TABLE wireguard_settings ADD COLUMN created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP",
-                "updated_at": "ALTER TABLE wireguard_settings ADD COLUMN updated_at DATETIME",
-            }
-
-            for column_name, migration_sql in wireguard_column_migrations.items():
-                if column_name not in wireguard_column_names:
-                    connection.execute(text(migration_sql))
+            _apply_column_migrations(connection, "wireguard_settings", WIREGUARD_SETTINGS_COLUMN_MIGRATIONS)
 
             wireguard_row_count = connection.execute(
                 text("SELECT COUNT(*) FROM wireguard_settings")
@@ -539,58 +625,7 @@ def init_db():
         ).fetchone()
         if general_settings_table_exists:
             detected_public_ipv4 = _detect_public_ipv4()
-            general_columns = connection.execute(text("PRAGMA table_info(general_settings)")).fetchall()
-            general_column_names = {col[1] for col in general_columns}
-
-            general_column_migrations = {
-                "server_address": "ALTER TABLE general_settings ADD COLUMN server_address VARCHAR(255)",
-                "public_ipv4_address": "ALTER TABLE general_settings ADD COLUMN public_ipv4_address VARCHAR(64)",
-                "public_ipv6_address": "ALTER TABLE general_settings ADD COLUMN public_ipv6_address VARCHAR(64)",
-                "global_ipv6_support": "ALTER TABLE general_settings ADD COLUMN global_ipv6_support BOOLEAN NOT NULL DEFAULT 1",
-                "wan_interface": "ALTER TABLE general_settings ADD COLUMN wan_interface VARCHAR(32) NOT NULL DEFAULT 'eth0'",
-                "server_system_dns_primary": "ALTER TABLE general_settings ADD COLUMN server_system_dns_primary VARCHAR(64) NOT NULL DEFAULT '1.1.1.1'",
-                "server_system_dns_secondary": "ALTER TABLE general_settings ADD COLUMN server_system_dns_secondary VARCHAR(64) NOT NULL DEFAULT '8.8.8.8'",
-                "l2tp_ipsec_psk": "ALTER TABLE general_settings ADD COLUMN l2tp_ipsec_psk VARCHAR(255) NOT NULL DEFAULT 'atlas-change-me-strong-psk'",
-                "l2tp_client_subnet": "ALTER TABLE general_settings ADD COLUMN l2tp_client_subnet VARCHAR(32) NOT NULL DEFAULT '10.10.11.0/24'",
-                "ocserv_port": "ALTER TABLE general_settings ADD COLUMN ocserv_port INTEGER NOT NULL DEFAULT 4433",
-                "ocserv_client_subnet": "ALTER TABLE general_settings ADD COLUMN ocserv_client_subnet VARCHAR(32) NOT NULL DEFAULT '10.10.12.0/24'",
-                "singbox_log_level": "ALTER TABLE general_settings ADD COLUMN singbox_log_level VARCHAR(16) NOT NULL DEFAULT 'info'",
-                "enable_vless": "ALTER TABLE general_settings ADD COLUMN enable_vless BOOLEAN NOT NULL DEFAULT 1",
-                "vless_port": "ALTER TABLE general_settings ADD COLUMN vless_port INTEGER NOT NULL DEFAULT 443",
-                "singbox_reality_sni": "ALTER TABLE general_settings ADD COLUMN singbox_reality_sni VARCHAR(255) NOT NULL DEFAULT 'yahoo.com'",
-                "singbox_reality_public_key": "ALTER TABLE general_settings ADD COLUMN singbox_reality_public_key TEXT NOT NULL DEFAULT ''",
-                "singbox_reality_private_key": "ALTER TABLE general_settings ADD COLUMN singbox_reality_private_key TEXT NOT NULL DEFAULT ''",
-                "singbox_reality_short_ids": "ALTER TABLE general_settings ADD COLUMN singbox_reality_short_ids VARCHAR(255) NOT NULL DEFAULT '0123456789abcdef'",
-                "is_tunnel_enabled": "ALTER TABLE general_settings ADD COLUMN is_tunnel_enabled BOOLEAN NOT NULL DEFAULT 0",
-                "foreign_server_ip": "ALTER TABLE general_settings ADD COLUMN foreign_server_ip VARCHAR(64)",
-                "foreign_server_port": "ALTER TABLE general_settings ADD COLUMN foreign_server_port INTEGER NOT NULL DEFAULT 22",
-                "foreign_ssh_user": "ALTER TABLE general_settings ADD COLUMN foreign_ssh_user VARCHAR(64) NOT NULL DEFAULT 'root'",
-                "foreign_ssh_password": "ALTER TABLE general_settings ADD COLUMN foreign_ssh_password VARCHAR(255)",
-                "admin_allowed_ips": "ALTER TABLE general_settings ADD COLUMN admin_allowed_ips TEXT NOT NULL DEFAULT '0.0.0.0/0'",
-                "login_max_failed_attempts": "ALTER TABLE general_settings ADD COLUMN login_max_failed_attempts INTEGER NOT NULL DEFAULT 5",
-                "login_block_duration_minutes": "ALTER TABLE general_settings ADD COLUMN login_block_duration_minutes INTEGER NOT NULL DEFAULT 15",
-                "panel_domain": "ALTER TABLE general_settings ADD COLUMN panel_domain VARCHAR(255) NOT NULL DEFAULT ''",
-                "panel_https_port": "ALTER TABLE general_settings ADD COLUMN panel_https_port INTEGER NOT NULL DEFAULT 2053",
-                "subscription_domain": "ALTER TABLE general_settings ADD COLUMN subscription_domain VARCHAR(255) NOT NULL DEFAULT ''",
-                "subscription_https_port": "ALTER TABLE general_settings ADD COLUMN subscription_https_port INTEGER NOT NULL DEFAULT 2083",
-                "ssl_mode": "ALTER TABLE general_settings ADD COLUMN ssl_mode VARCHAR(32) NOT NULL DEFAULT 'none'",
-                "letsencrypt_email": "ALTER TABLE general_settings ADD COLUMN letsencrypt_email VARCHAR(255)",
-                "force_https": "ALTER TABLE general_settings ADD COLUMN force_https BOOLEAN NOT NULL DEFAULT 0",
-                "auto_renew_ssl": "ALTER TABLE general_settings ADD COLUMN auto_renew_ssl BOOLEAN NOT NULL DEFAULT 1",
-                "custom_ssl_certificate": "ALTER TABLE general_settings ADD COLUMN custom_ssl_certificate TEXT",
-                "custom_ssl_private_key": "ALTER TABLE general_settings ADD COLUMN custom_ssl_private_key TEXT",
-                "system_timezone": "ALTER TABLE general_settings ADD COLUMN system_timezone VARCHAR(64) NOT NULL DEFAULT 'UTC'",
-                "ntp_server": "ALTER TABLE general_settings ADD COLUMN ntp_server VARCHAR(255) NOT NULL DEFAULT 'pool.ntp.org'",
-                "created_at": "ALTER TABLE general_settings ADD COLUMN created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP",
-                "updated_at": "ALTER TABLE general_settings ADD COLUMN updated_at DATETIME",
-            }
-
-            for column_name, migration_sql in general_column_migrations.items():
-                if column_name not in general_column_names:
-                    connection.execute(text(migration_sql))
-
-            general_columns = connection.execute(text("PRAGMA table_info(general_settings)")).fetchall()
-            general_column_names = {col[1] for col in general_columns}
+            general_column_names = _apply_column_migrations(connection, "general_settings", GENERAL_SETTINGS_COLUMN_MIGRATIONS)
 
             if {"server_address", "public_ipv4_address"}.issubset(general_column_names):
                 connection.execute(
@@ -860,21 +895,7 @@ def init_db():
             connection.execute(text("CREATE INDEX IF NOT EXISTS ix_routing_rules_fwmark ON routing_rules (fwmark)"))
             connection.execute(text("CREATE INDEX IF NOT EXISTS ix_routing_rules_status ON routing_rules (status)"))
         else:
-            routing_columns = connection.execute(text("PRAGMA table_info(routing_rules)")).fetchall()
-            routing_column_names = {col[1] for col in routing_columns}
-            routing_column_migrations = {
-                "protocol": "ALTER TABLE routing_rules ADD COLUMN protocol VARCHAR(8) NOT NULL DEFAULT 'tcp'",
-                "dest_cidr": "ALTER TABLE routing_rules ADD COLUMN dest_cidr VARCHAR(64) NOT NULL DEFAULT '0.0.0.0/0'",
-                "description": "ALTER TABLE routing_rules ADD COLUMN description VARCHAR(255)",
-                "table_id": "ALTER TABLE routing_rules ADD COLUMN table_id INTEGER NOT NULL DEFAULT 0",
-                "table_name": "ALTER TABLE routing_rules ADD COLUMN table_name VARCHAR(64) NOT NULL DEFAULT ''",
-                "status": "ALTER TABLE routing_rules ADD COLUMN status VARCHAR(16) NOT NULL DEFAULT 'active'",
-                "created_at": "ALTER TABLE routing_rules ADD COLUMN created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP",
-                "updated_at": "ALTER TABLE routing_rules ADD COLUMN updated_at DATETIME",
-            }
-            for column_name, migration_sql in routing_column_migrations.items():
-                if column_name not in routing_column_names:
-                    connection.execute(text(migration_sql))
+            _apply_column_migrations(connection, "routing_rules", ROUTING_RULES_COLUMN_MIGRATIONS)
 
             connection.execute(
                 text(
@@ -947,3 +968,5 @@ def init_db():
             connection.execute(text("CREATE INDEX IF NOT EXISTS ix_audit_logs_action ON audit_logs (action)"))
             connection.execute(text("CREATE INDEX IF NOT EXISTS ix_audit_logs_resource_type ON audit_logs (resource_type)"))
             connection.execute(text("CREATE INDEX IF NOT EXISTS ix_audit_logs_created_at ON audit_logs (created_at)"))
+
+        connection.execute(text(f"PRAGMA user_version = {schema_stamp}"))
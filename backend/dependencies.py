@@ -1,17 +1,64 @@
+from collections import OrderedDict
+import hashlib
 import ipaddress
+import threading
+import time
 
 from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import bindparam, select
 from sqlalchemy.orm import Session
 
 from backend.database import get_db
 from backend.models.general_settings import GeneralSettings
-from backend.services.auth_service import decode_access_token
+from backend.services.auth_service import decode_access_token_payload
 from backend.services.audit_service import extract_client_ip, record_audit_event
 from backend.models.user import Admin
 
 security = HTTPBearer()
 
+# Built once so the per-request auth path reuses the same statements (and their cache keys).
+ADMIN_BY_USERNAME_QUERY = select(Admin).where(Admin.username == bindparam("username"))
+FIRST_GENERAL_SETTINGS_QUERY = select(GeneralSettings).order_by(GeneralSettings.id.asc()).limit(1)
+
+# Verified bearer tokens map to their admin id for this long, so most requests skip JWT
+# verification and the username lookup. The Admin row itself is still re-read every time.
+TOKEN_CACHE_TTL_SECONDS = 30.0
+TOKEN_CACHE_MAX_ENTRIES = 4096
+
+_token_cache: "OrderedDict[bytes, tuple[float, int]]" = OrderedDict()
+_token_cache_lock = threading.Lock()
+
+
+def _token_cache_key(token: str) -> bytes:
+    return hashlib.blake2b(token.encode("utf-8"), digest_size=16).digest()
+
+
+def _get_cached_admin_id(cache_key: bytes) -> int | None:
+    with _token_cache_lock:
+        entry = _token_cache.get(cache_key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del _token_cache[cache_key]
+            return None
+        _token_cache.move_to_end(cache_key)
+        return entry[1]
+
+
+def _cache_admin_id(cache_key: bytes, admin_id: int, token_expires_at: float | None) -> None:
+    """Remember a verified token, never past the token's own `exp` claim."""
+    ttl = TOKEN_CACHE_TTL_SECONDS
+    if token_expires_at is not None:
+        ttl = min(ttl, token_expires_at - time.time())
+    if ttl <= 0:
+        return
+    with _token_cache_lock:
+        _token_cache[cache_key] = (time.monotonic() + ttl, admin_id)
+        _token_cache.move_to_end(cache_key)
+        while len(_token_cache) > TOKEN_CACHE_MAX_ENTRIES:
+            _token_cache.popitem(last=False)
+
 
 def _parse_admin_allowed_ips(raw_value: str) -> list[str]:
     normalized = (raw_value or "").replace("\n", ",")
@@ -56,23 +103,34 @@ def get_current_user(
     db: Session = Depends(get_db)
 ) -> Admin:
     token = credentials.credentials
-    username = decode_access_token(token)
-    
-    if username is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication credentials",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    
-    user = db.query(Admin).filter(Admin.username == username).first()
+    cache_key = _token_cache_key(token)
+    cached_admin_id = _get_cached_admin_id(cache_key)
+    user = db.get(Admin, cached_admin_id) if cached_admin_id is not None else None
+
     if user is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    
+        payload = decode_access_token_payload(token)
+        username = payload.get("sub") if payload else None
+
+        if username is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid authentication credentials",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+
+        # Tokens issued at login carry the admin id, which allows a primary-key lookup.
+        admin_id = payload.get("uid")
+        user = db.get(Admin, admin_id) if isinstance(admin_id, int) else None
+        if user is None or user.username != username:
+            user = db.execute(ADMIN_BY_USERNAME_QUERY, {"username": username}).scalar_one_or_none()
+        if user is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User not found",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        _cache_admin_id(cache_key, user.id, payload.get("exp"))
+
     if not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -80,7 +138,7 @@ def get_current_user(
         )
 
     client_ip = extract_client_ip(request)
-    general_settings = db.query(GeneralSettings).order_by(GeneralSettings.id.asc()).first()
+    general_settings = db.execute(FIRST_GENERAL_SETTINGS_QUERY).scalar_one_or_none()
     allowed_entries = _parse_admin_allowed_ips(general_settings.admin_allowed_ips if general_settings else "")
     if allowed_entries and not _is_ip_allowed_by_policy(client_ip, allowed_entries):
         record_audit_event(
@@ -2,11 +2,17 @@
 # Phase 0: skeleton only — no operational logic yet
 
 from fastapi import FastAPI, Request
-from fastapi.responses import FileResponse, RedirectResponse
+from fastapi.responses import ORJSONResponse, RedirectResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from contextlib import asynccontextmanager
+import asyncio
 from datetime import datetime, timezone
+import gzip
+import hashlib
 import json
 from pathlib import Path
 from urllib.parse import urlparse
@@ -19,6 +25,7 @@ from backend.models.user import Admin
 from backend.routers import auth, openvpn, settings as server_settings, vpn_users, audit_logs, dashboard, system, terminal, routing, vless_inbounds, hysteria_inbounds, trojan_inbounds, tuic_inbounds, shadowsocks_inbounds
 from backend.services.scheduler_service import get_scheduler
 from backend.services.auth_service import is_default_admin_password_hash
+from backend.services.https_redirect_service import get_cached_force_https, load_force_https
 
 _LOG_RESERVED_ATTRS = {
     "name",
@@ -77,25 +84,22 @@ configure_json_logging()
 logger = logging.getLogger(__name__)
 
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    # Startup
-    init_db()
-    db = SessionLocal()
+def _warn_if_default_admin_password() -> None:
     try:
-        admin = db.query(Admin).filter(Admin.username == settings.ADMIN_USERNAME).first()
-        if admin and is_default_admin_password_hash(admin.hashed_password):
-            logger.critical(
-                (
-                    "SECURITY ALERT: The default admin password is still active. "
-                    "Immediate password rotation is required."
+        with SessionLocal() as db:
+            admin = db.query(Admin).filter(Admin.username == settings.ADMIN_USERNAME).first()
+            if admin and is_default_admin_password_hash(admin.hashed_password):
+                logger.critical(
+                    (
+                        "SECURITY ALERT: The default admin password is still active. "
+                        "Immediate password rotation is required."
+                    )
                 )
-            )
     except Exception as exc:
         logger.exception("Failed to run startup default-password security check: %s", exc)
-    finally:
-        db.close()
 
+
+def _sync_routing_rules_on_startup() -> None:
     try:
         sync_result = PBRManager().apply_all_active_rules()
         if not sync_result.get("success"):
@@ -107,6 +111,18 @@ async def lifespan(app: FastAPI):
             )
     except Exception as exc:
         logger.exception("Unexpected error during routing startup sync: %s", exc)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Startup
+    init_db()
+    # Both only need the migrated schema: the password check spends its time in the KDF,
+    # the routing sync in `ip rule`/`ip route` subprocesses, so run them side by side.
+    await asyncio.gather(
+        run_in_threadpool(_warn_if_default_admin_password),
+        run_in_threadpool(_sync_routing_rules_on_startup),
+    )
     
     # Start background scheduler for limit enforcement
     scheduler = get_scheduler()
@@ -188,6 +204,12 @@ def _origin_candidates(value: str, default_port: int | None = None) -> set[str]:
     return origins
 
 
+# Explicit lists let CORSMiddleware answer preflights with a precomputed header set
+# instead of echoing whatever the browser asks for.
+CORS_ALLOWED_METHODS = ["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"]
+CORS_ALLOWED_HEADERS = ["Authorization", "Content-Type"]
+
+
 def _build_allowed_cors_origins() -> list[str]:
     origins = {
         "http://localhost",
@@ -202,21 +224,19 @@ def _build_allowed_cors_origins() -> list[str]:
         "http://127.0.0.1:8000",
     }
 
-    db = SessionLocal()
     try:
-        general = db.query(GeneralSettings).order_by(GeneralSettings.id.asc()).first()
-        if not general:
-            return sorted(origins)
-
-        panel_port = int(general.panel_https_port or 0) or None
-        origins.update(_origin_candidates(general.panel_domain or "", default_port=panel_port))
-        origins.update(_origin_candidates(general.server_address or ""))
-        origins.update(_origin_candidates(general.public_ipv4_address or ""))
-        origins.update(_origin_candidates(general.public_ipv6_address or ""))
+        with SessionLocal() as db:
+            general = db.query(GeneralSettings).order_by(GeneralSettings.id.asc()).first()
+            if not general:
+                return sorted(origins)
+
+            panel_port = int(general.panel_https_port or 0) or None
+            origins.update(_origin_candidates(general.panel_domain or "", default_port=panel_port))
+            origins.update(_origin_candidates(general.server_address or ""))
+            origins.update(_origin_candidates(general.public_ipv4_address or ""))
+            origins.update(_origin_candidates(general.public_ipv6_address or ""))
     except Exception:
         pass
-    finally:
-        db.close()
 
     return sorted(origins)
 
@@ -227,6 +247,7 @@ app = FastAPI(
     docs_url=f"{settings.API_PREFIX}/docs",
     redoc_url=f"{settings.API_PREFIX}/redoc",
     openapi_url=f"{settings.API_PREFIX}/openapi.json",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -234,45 +255,149 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=_build_allowed_cors_origins(),
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=CORS_ALLOWED_METHODS,
+    allow_headers=CORS_ALLOWED_HEADERS,
 )
 
 
-@app.middleware("http")
-async def force_https_middleware(request: Request, call_next):
-    forwarded_proto = request.headers.get("x-forwarded-proto", "")
-    request_scheme = (forwarded_proto or request.url.scheme).lower()
-    host = (request.url.hostname or "").lower()
-
-    if request_scheme == "http" and host not in {"localhost", "127.0.0.1"}:
-        db = SessionLocal()
-        try:
-            general = db.query(GeneralSettings).order_by(GeneralSettings.id.asc()).first()
-            if general and general.force_https:
-                secure_url = request.url.replace(scheme="https")
-                return RedirectResponse(url=str(secure_url), status_code=307)
-        finally:
-            db.close()
-
-    return await call_next(request)
+class ForceHTTPSMiddleware:
+    """Redirect plain-HTTP panel requests to HTTPS when `force_https` is enabled."""
 
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
 
-@app.middleware("http")
-async def security_headers_middleware(request: Request, call_next):
-    response = await call_next(request)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-    response.headers["X-Frame-Options"] = "DENY"
-    response.headers["X-Content-Type-Options"] = "nosniff"
-    response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-    response.headers["Permissions-Policy"] = "camera=(), microphone=(), geolocation=()"
+        # Decide from the raw scope first; HTTPS traffic never needs the parsed URL.
+        forwarded_proto = Headers(scope=scope).get("x-forwarded-proto", "")
+        request_scheme = (forwarded_proto or scope.get("scheme", "http")).lower()
+        if request_scheme != "http":
+            await self.app(scope, receive, send)
+            return
 
-    forwarded_proto = (request.headers.get("x-forwarded-proto") or "").lower()
-    request_scheme = (forwarded_proto or request.url.scheme).lower()
-    if request_scheme == "https":
-        response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
+        request = Request(scope)
+        host = (request.url.hostname or "").lower()
 
-    return response
+        if host not in {"localhost", "127.0.0.1"}:
+            force_https = get_cached_force_https()
+            if force_https is None:
+                force_https = await run_in_threadpool(load_force_https)
+            if force_https:
+                secure_url = request.url.replace(scheme="https")
+                response = RedirectResponse(url=str(secure_url), status_code=307)
+                await response(scope, receive, send)
+                return
+
+        await self.app(scope, receive, send)
+
+
+class SecurityHeadersMiddleware:
+    """Attach the panel's security headers to every HTTP response."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        forwarded_proto = (request_headers.get("x-forwarded-proto") or "").lower()
+        request_scheme = (forwarded_proto or scope.get("scheme", "http")).lower()
+
+        async def send_with_security_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers["X-Frame-Options"] = "DENY"
+                headers["X-Content-Type-Options"] = "nosniff"
+                headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
+                headers["Permissions-Policy"] = "camera=(), microphone=(), geolocation=()"
+                if request_scheme == "https":
+                    headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
+            await send(message)
+
+        await self.app(scope, receive, send_with_security_headers)
+
+
+# Polled API GETs answer 304 when the client already holds the same JSON body.
+API_ETAG_CACHE_CONTROL = "private, no-cache"
+
+
+class ETagMiddleware:
+    """Tag JSON GET responses under the API prefix and honour If-None-Match with a 304."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "GET"
+            or not scope["path"].startswith(settings.API_PREFIX)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        if_none_match = Headers(scope=scope).get("if-none-match", "")
+        start_message: Message | None = None
+        passthrough = False
+
+        async def send_with_etag(message: Message) -> None:
+            nonlocal start_message, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                if (
+                    message["status"] != 200
+                    or "etag" in headers
+                    or not headers.get("content-type", "").startswith("application/json")
+                ):
+                    passthrough = True
+                    await send(message)
+                    return
+                start_message = message
+                return
+
+            if start_message is None or message.get("more_body", False):
+                # Streamed bodies are not buffered; release what was held back.
+                passthrough = True
+                if start_message is not None:
+                    await send(start_message)
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+            headers = MutableHeaders(scope=start_message)
+            headers["ETag"] = etag
+            headers.setdefault("Cache-Control", API_ETAG_CACHE_CONTROL)
+
+            if etag in (candidate.strip() for candidate in if_none_match.split(",")):
+                del headers["content-length"]
+                del headers["content-type"]
+                start_message["status"] = 304
+                await send(start_message)
+                await send({"type": "http.response.body", "body": b""})
+                return
+
+            await send(start_message)
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
+
+
+# Pure ASGI middleware: no per-request task group or body streaming like @app.middleware("http").
+# Added last means outermost, so redirects also carry the security headers.
+app.add_middleware(ETagMiddleware)
+app.add_middleware(ForceHTTPSMiddleware)
+app.add_middleware(SecurityHeadersMiddleware)
 
 # Register routers
 app.include_router(auth.router, prefix=settings.API_PREFIX)
@@ -292,6 +417,67 @@ app.include_router(shadowsocks_inbounds.router, prefix=settings.API_PREFIX)
 
 frontend_path = Path(__file__).parent.parent / "frontend"
 
+# Panel pages are a few hundred KB of HTML; compress each file version once and serve
+# it from memory instead of re-reading the file on every navigation.
+FRONTEND_PAGE_GZIP_MIN_BYTES = 1024
+FRONTEND_PAGE_CACHE_CONTROL = "no-cache"
+
+_frontend_page_cache: dict[Path, tuple[tuple[int, int], bytes, bytes | None, str]] = {}
+
+
+def _load_frontend_page(path: Path) -> tuple[tuple[int, int], bytes, bytes | None, str]:
+    stat = path.stat()
+    version = (stat.st_mtime_ns, stat.st_size)
+    cached = _frontend_page_cache.get(path)
+    if cached is not None and cached[0] == version:
+        return cached
+
+    body = path.read_bytes()
+    compressed = gzip.compress(body, mtime=0) if len(body) >= FRONTEND_PAGE_GZIP_MIN_BYTES else None
+    etag = f'"{version[0]:x}-{version[1]:x}"'
+    entry = (version, body, compressed, etag)
+    _frontend_page_cache[path] = entry
+    return entry
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """Honour Accept-Encoding q-values: `gzip;q=0` refuses gzip, `*` stands in for unlisted codings."""
+    wildcard_q: float | None = None
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value.strip())
+                except ValueError:
+                    q = 0.0
+        if coding == "gzip":
+            return q > 0
+        if coding == "*":
+            wildcard_q = q
+    return bool(wildcard_q)
+
+
+def _frontend_page_response(request: Request, path: Path) -> Response:
+    _, body, compressed, etag = _load_frontend_page(path)
+    use_gzip = compressed is not None and _accepts_gzip(request.headers.get("accept-encoding", ""))
+    if use_gzip:
+        # Each content coding is its own representation and needs its own strong validator.
+        etag = f'{etag[:-1]}-gz"'
+    headers = {"ETag": etag, "Cache-Control": FRONTEND_PAGE_CACHE_CONTROL, "Vary": "Accept-Encoding"}
+
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in (candidate.strip() for candidate in if_none_match.split(",")):
+        return Response(status_code=304, headers=headers)
+
+    if use_gzip:
+        headers["Content-Encoding"] = "gzip"
+        return Response(compressed, media_type="text/html", headers=headers)
+    return Response(body, media_type="text/html", headers=headers)
+
 
 @app.get("/", include_in_schema=False)
 def root_redirect() -> RedirectResponse:
@@ -299,23 +485,23 @@ def root_redirect() -> RedirectResponse:
 
 
 @app.get("/login", include_in_schema=False)
-def login_page() -> FileResponse:
-    return FileResponse(frontend_path / "templates" / "login.html")
+def login_page(request: Request) -> Response:
+    return _frontend_page_response(request, frontend_path / "templates" / "login.html")
 
 
 @app.get("/dashboard", include_in_schema=False)
-def dashboard_page() -> FileResponse:
-    return FileResponse(frontend_path / "dashboard.html")
+def dashboard_page(request: Request) -> Response:
+    return _frontend_page_response(request, frontend_path / "dashboard.html")
 
 
 @app.get("/clients", include_in_schema=False)
-def clients_page() -> FileResponse:
-    return FileResponse(frontend_path / "templates" / "clients.html")
+def clients_page(request: Request) -> Response:
+    return _frontend_page_response(request, frontend_path / "templates" / "clients.html")
 
 
 @app.get("/settings", include_in_schema=False)
-def settings_page() -> FileResponse:
-    return FileResponse(frontend_path / "settings.html")
+def settings_page(request: Request) -> Response:
+    return _frontend_page_response(request, frontend_path / "settings.html")
 
 
 @app.get("/dashboard.html", include_in_schema=False)
@@ -347,4 +533,11 @@ app.mount("/", StaticFiles(directory=str(frontend_path), html=True), name="front
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("backend.main:app", host="0.0.0.0", port=8000, reload=True)
+    uvicorn.run(
+        "backend.main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        reload=settings.DEBUG,
+    )
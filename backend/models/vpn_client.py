@@ -1,7 +1,7 @@
 # Atlas — VPN client/peer ORM model
 # Phase 2: OpenVPN client management
 
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, Enum as SQLEnum
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, Boolean, Text, Enum as SQLEnum
 from datetime import datetime
 from backend.database import Base
 import enum
@@ -54,8 +54,8 @@ class VPNClient(Base):
     singbox_config = Column(Text, nullable=True)  # JSON config
     
     # Traffic and usage statistics
-    total_bytes_sent = Column(Integer, default=0)
-    total_bytes_received = Column(Integer, default=0)
+    total_bytes_sent = Column(BigInteger, default=0)
+    total_bytes_received = Column(BigInteger, default=0)
     last_connected_at = Column(DateTime, nullable=True)
     last_disconnected_at = Column(DateTime, nullable=True)
     
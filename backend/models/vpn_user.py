@@ -1,7 +1,8 @@
 # Atlas — VPN User and Config ORM models
 # Phase 2 Enhancements: Multi-protocol architecture
 
-from sqlalchemy import Column, Integer, BigInteger, String, DateTime, Boolean, Text, Float, ForeignKey
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, Boolean, Text, Float, ForeignKey, and_, false, func, or_
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from backend.database import Base
@@ -42,8 +43,8 @@ class VPNUser(Base):
     current_connections = Column(Integer, nullable=False, default=0)
     
     # Usage tracking
-    total_bytes_sent = Column(Integer, default=0)
-    total_bytes_received = Column(Integer, default=0)
+    total_bytes_sent = Column(BigInteger, default=0)
+    total_bytes_received = Column(BigInteger, default=0)
     last_connected_at = Column(DateTime, nullable=True)
     last_disconnected_at = Column(DateTime, nullable=True)
     
@@ -67,7 +68,7 @@ class VPNUser(Base):
     def __repr__(self):
         return f"<VPNUser(username={self.username}, enabled={self.is_enabled})>"
     
-    @property
+    @hybrid_property
     def is_active(self) -> bool:
         """Check if user is active and can connect"""
         if self.access_start_at and datetime.utcnow() < self.access_start_at:
@@ -79,6 +80,17 @@ class VPNUser(Base):
             not self.is_connection_limit_exceeded
         )
 
+    @is_active.expression
+    def is_active(cls):
+        """SQL form of is_active so callers can filter in the query instead of in Python."""
+        return and_(
+            cls.is_enabled.is_(True),
+            func.coalesce(cls.is_expired, false()).is_(False),
+            func.coalesce(cls.is_data_limit_exceeded, false()).is_(False),
+            func.coalesce(cls.is_connection_limit_exceeded, false()).is_(False),
+            or_(cls.access_start_at.is_(None), cls.access_start_at <= datetime.utcnow()),
+        )
+
     @property
     def effective_max_concurrent_connections(self) -> int:
         """Canonical concurrent connection limit with legacy fallback."""
@@ -15,6 +15,8 @@ from backend.schemas.user import (
 )
 from backend.services.auth_service import (
     verify_password,
+    verify_password_cached,
+    clear_password_verify_cache,
     create_access_token,
     get_password_hash,
     is_default_admin_password_hash,
@@ -125,7 +127,7 @@ def _authenticate_and_issue_token(login_data: LoginRequest, db: Session) -> Dict
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
-    if not verify_password(login_data.password, user.hashed_password):
+    if not verify_password_cached(login_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -141,7 +143,7 @@ def _authenticate_and_issue_token(login_data: LoginRequest, db: Session) -> Dict
     user.last_login = datetime.utcnow()
     db.commit()
 
-    access_token = create_access_token(data={"sub": user.username})
+    access_token = create_access_token(data={"sub": user.username, "uid": user.id})
     return {
         "access_token": access_token,
         "token_type": "bearer",
@@ -254,6 +256,7 @@ def change_admin_password(
 
     current_user.hashed_password = get_password_hash(payload.new_password)
     db.commit()
+    clear_password_verify_cache()
 
     record_audit_event(
         action="admin_password_changed",
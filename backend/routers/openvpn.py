@@ -1,7 +1,7 @@
 # Atlas — OpenVPN router (Phase 2)
 # OpenVPN management API endpoints with authentication
 
-from fastapi import APIRouter, Depends, HTTPException, status, Response
+from fastapi import APIRouter, Depends, HTTPException, Query, status, Response
 from sqlalchemy.orm import Session
 from typing import Optional, Tuple
 from datetime import datetime
@@ -232,7 +232,8 @@ def revoke_client(
     
     try:
         # Revoke certificate using OpenVPN manager
-        revoke_result = openvpn_service.revoke_client_certificate(client.name)
+        revoked_at = datetime.utcnow()
+        revoke_result = openvpn_service.revoke_client_certificate(client.name, revoked_at=revoked_at)
         
         if not revoke_result.get("success"):
             raise HTTPException(
@@ -242,10 +243,10 @@ def revoke_client(
         
         # Update database record
         client.status = VPNClientStatus.REVOKED
-        client.revoked_at = datetime.utcnow()
+        client.revoked_at = revoked_at
         client.revoked_reason = revoke_data.reason
         client.is_enabled = False
-        client.updated_at = datetime.utcnow()
+        client.updated_at = revoked_at
         
         db.commit()
         db.refresh(client)
@@ -312,6 +313,7 @@ def get_client_config(
     client_id: int,
     include_qr: bool = False,
     server_address: Optional[str] = None,
+    os_type: Optional[str] = Query(None, alias="os"),
     db: Session = Depends(get_db),
     current_user: Admin = Depends(get_current_user)
 ):
@@ -343,6 +345,7 @@ def get_client_config(
             server_address=server_address,
             server_port=server_port,
             protocol=protocol,
+            os_type=os_type or "default",
         )
         
         if not config_content:
@@ -351,9 +354,9 @@ def get_client_config(
                 detail="Failed to generate configuration file"
             )
         
-        # Generate QR code if requested
+        # Generate QR code if requested (never for desktop platforms)
         qr_code = None
-        if include_qr:
+        if openvpn_service.should_generate_qr(include_qr, os_type):
             qr_code = openvpn_service.generate_qr_code(config_content)
         
         return VPNClientConfigResponse(
@@ -427,6 +430,7 @@ def download_client_config(
 
 @router.get("/service/status", response_model=VPNServiceStatusResponse)
 def get_service_status(
+    verbose: bool = Query(False, description="Include full systemctl status output"),
     current_user: Admin = Depends(get_current_user)
 ):
     """
@@ -434,7 +438,7 @@ def get_service_status(
     Requires authentication.
     """
     try:
-        status_result = openvpn_service.get_status()
+        status_result = openvpn_service.get_status(verbose=verbose)
         
         if not status_result.get("success"):
             raise HTTPException(
@@ -489,7 +493,8 @@ def control_service(
     Requires authentication.
     """
     try:
-        control_result = openvpn_service.control_service(control_data.action)
+        # Manual control only queues the job; the status endpoint reports the outcome.
+        control_result = openvpn_service.control_service(control_data.action, wait=False)
         
         if not control_result.get("success"):
             raise HTTPException(
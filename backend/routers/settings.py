@@ -29,6 +29,7 @@ from backend.schemas.general_settings import (
 from backend.schemas.openvpn_settings import OpenVPNSettingsResponse, OpenVPNSettingsUpdate
 from backend.schemas.wireguard_settings import WireGuardSettingsResponse, WireGuardSettingsUpdate
 from backend.services.audit_service import extract_client_ip, record_audit_event
+from backend.services.https_redirect_service import invalidate_force_https_cache
 from backend.services.protocols.registry import protocol_registry
 
 router = APIRouter(prefix="/settings", tags=["Server Settings"])
@@ -533,6 +534,7 @@ def _to_wireguard_response(settings: WireGuardSettings) -> WireGuardSettingsResp
 
 def _sync_openvpn_auth_db_snapshot() -> None:
     """Best-effort sync of OpenVPN auth DB snapshot after settings updates."""
+    openvpn_service.invalidate_settings_cache()
     try:
         result = openvpn_service.sync_auth_database_snapshot()
         if not result.get("success"):
@@ -879,6 +881,7 @@ def update_general_settings(
         PBRManager(db=db).flush_routing_rules(out_iface=detected_wan)
 
     db.commit()
+    invalidate_force_https_cache()
     _sync_openvpn_auth_db_snapshot()
     db.refresh(settings)
 
@@ -962,9 +965,9 @@ def issue_ssl_certificate(
             detail="At least one domain is required in payload to issue SSL certificates",
         )
 
-    def sse_stream():
+    async def sse_stream():
         try:
-            for line in openvpn_service.stream_ssl_issue_logs(
+            async for line in openvpn_service.stream_ssl_issue_logs(
                 domains=domains,
                 email=letsencrypt_email,
             ):
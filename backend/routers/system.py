@@ -4,6 +4,7 @@ from datetime import datetime, timezone
 import os
 from pathlib import Path
 import shutil
+import sqlite3
 import subprocess
 import tarfile
 import tempfile
@@ -26,6 +27,7 @@ from backend.models.user import Admin
 from backend.schemas.tunnel import TunnelCommandRequest
 from backend.schemas.tunnel_response import TunnelCommandResponse
 from backend.services.audit_service import extract_client_ip, record_audit_event
+from backend.services.https_redirect_service import invalidate_force_https_cache
 from backend.services.protocols.registry import protocol_registry
 
 router = APIRouter(prefix="/system", tags=["System"])
@@ -37,6 +39,8 @@ tunnel_manager = TunnelManager()
 
 MAX_BACKUP_UPLOAD_BYTES = 512 * 1024 * 1024  # 512MB safety ceiling
 LOG_TAIL_LINES = 100
+# WAL-mode companions of atlas.db; they belong to one database file and move with it.
+SQLITE_SIDECAR_SUFFIXES = ("-wal", "-shm")
 ALLOWED_SERVICE_ACTIONS = {"restart", "stop", "start"}
 DEFAULT_BACKEND_SYSTEMD_UNIT = os.getenv("ATLAS_BACKEND_SYSTEMD_UNIT", "atlas-backend")
 BACKEND_SERVICE_CANDIDATES = (
@@ -266,6 +270,24 @@ def _sqlite_database_path() -> Path:
     return Path(db_url.replace("sqlite:///", "", 1)).resolve()
 
 
+def _snapshot_sqlite_database(source_path: Path, destination_path: Path) -> None:
+    """Write a consistent single-file copy of a live database, including commits still in its WAL."""
+    source = sqlite3.connect(str(source_path))
+    try:
+        destination = sqlite3.connect(str(destination_path))
+        try:
+            source.backup(destination)
+        finally:
+            destination.close()
+    finally:
+        source.close()
+
+
+def _remove_sqlite_sidecars(db_path: Path) -> None:
+    for suffix in SQLITE_SIDECAR_SUFFIXES:
+        Path(f"{db_path}{suffix}").unlink(missing_ok=True)
+
+
 def _ensure_systemctl_available() -> None:
     if shutil.which("systemctl") is None:
         raise HTTPException(status_code=503, detail="systemctl is not available on this host")
@@ -491,8 +513,11 @@ def download_full_backup(
         raise HTTPException(status_code=500, detail="Critical TLS key missing: expected ta.key or tc.key")
 
     try:
+        db_snapshot_path = temp_dir / "atlas.db"
+        _snapshot_sqlite_database(db_path, db_snapshot_path)
+
         with tarfile.open(archive_path, "w:gz") as archive:
-            archive.add(db_path, arcname="atlas_backup/database/atlas.db")
+            archive.add(db_snapshot_path, arcname="atlas_backup/database/atlas.db")
 
             if pki_dir.exists() and pki_dir.is_dir():
                 archive.add(pki_dir, arcname="atlas_backup/openvpn/server/pki")
@@ -577,11 +602,16 @@ async def restore_full_backup(
 
         db_backup_copy = db_path.with_suffix(f".pre-restore-{datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S')}.bak")
         if db_path.exists():
-            shutil.copy2(db_path, db_backup_copy)
+            _snapshot_sqlite_database(db_path, db_backup_copy)
 
         restored_db_tmp = db_path.with_suffix(".restored.tmp")
         shutil.copy2(backup_db, restored_db_tmp)
+        # Stale -wal/-shm files would be replayed onto the restored database by the next connection.
+        _remove_sqlite_sidecars(db_path)
         os.replace(restored_db_tmp, db_path)
+        invalidate_force_https_cache()
+        # The whole database changed under the cached openvpn/general settings snapshot.
+        openvpn_service.invalidate_settings_cache()
 
         if _restore_openvpn_server_payload(backup_root, warnings):
             restored_components.append("openvpn_pki")
@@ -741,6 +771,9 @@ def run_service_action(
         )
         raise HTTPException(status_code=504, detail="Service operation timed out")
 
+    if target_alias == "openvpn":
+        openvpn_service.invalidate_service_status_cache()
+
     success = code == 0
     record_audit_event(
         action="system_service_action",
@@ -3,7 +3,7 @@
 
 from fastapi import APIRouter, Depends, HTTPException, status, Response, Request, Query
 from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from sqlalchemy import and_, asc, desc, func, or_
 from typing import Any, Dict, List, Optional, Set, Tuple
 from datetime import datetime, timedelta
@@ -524,7 +524,8 @@ async def list_users(
         query = query.order_by(asc(VPNUser.created_at) if sort_ascending else desc(VPNUser.created_at))
 
     total = query.count()
-    users = query.offset(skip).limit(limit).all()
+    # has_openvpn/has_wireguard/has_singbox walk user.configs; batch-load them for the page.
+    users = query.options(selectinload(VPNUser.configs)).offset(skip).limit(limit).all()
     runtime_stats, runtime_available = _get_openvpn_runtime_stats()
     ppp_runtime_stats = _get_ppp_runtime_stats()
     for username, ppp_item in ppp_runtime_stats.items():
@@ -1279,10 +1280,11 @@ async def get_config(
     protocol: str,
     include_qr: bool = False,
     server_address: Optional[str] = None,
+    os_type: Optional[str] = Query(None, alias="os"),
     current_user: Admin = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get VPN config with optional QR code"""
+    """Get VPN config with optional QR code (mobile/unspecified platforms only)"""
     user = db.query(VPNUser).filter(VPNUser.id == user_id).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
@@ -1298,12 +1300,13 @@ async def get_config(
             _validate_required_settings(db)
             
             config_content = openvpn_service.generate_client_config(
-                user.username
+                user.username,
+                os_type=os_type or "default"
             )
             config_content += "\nauth-user-pass\n"
             
             qr_code = None
-            if include_qr:
+            if openvpn_service.should_generate_qr(include_qr, os_type):
                 qr_code = openvpn_service.generate_qr_code(config_content)
             
             return VPNConfigFileResponse(
@@ -115,6 +115,9 @@ def run() -> None:
         "app": "backend.main:app",
         "host": "0.0.0.0",
         "reload": False,
+        # C event loop and HTTP parser (shipped with uvicorn[standard]) instead of asyncio/h11.
+        "loop": "uvloop",
+        "http": "httptools",
     }
 
     if cert_path and key_path:
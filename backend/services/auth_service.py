@@ -1,8 +1,12 @@
 import base64
+from collections import OrderedDict
 from datetime import datetime, timedelta
+from functools import lru_cache
 import hashlib
 import hmac
 import secrets
+import threading
+import time
 from typing import Optional
 
 import bcrypt
@@ -13,6 +17,14 @@ from backend.config import settings
 PBKDF2_SCHEME = "pbkdf2_sha256"
 PBKDF2_ITERATIONS = 390000
 DEFAULT_ADMIN_PASSWORD_FALLBACK = "admin123"
+# Successful verifications are remembered briefly so bursty re-logins skip the slow KDF.
+PASSWORD_VERIFY_CACHE_TTL_SECONDS = 60.0
+PASSWORD_VERIFY_CACHE_MAX_ENTRIES = 1024
+
+# Per-process key: cached digests are useless outside this process.
+_password_verify_cache_key = secrets.token_bytes(32)
+_password_verify_cache: "OrderedDict[bytes, float]" = OrderedDict()
+_password_verify_cache_lock = threading.Lock()
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -41,6 +53,45 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         return False
 
 
+def _password_verify_cache_entry(plain_password: str, hashed_password: str) -> bytes:
+    # Keyed on the stored hash too, so a password change never matches an old entry.
+    digest = hashlib.blake2b(key=_password_verify_cache_key, digest_size=16)
+    digest.update(hashed_password.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(plain_password.encode("utf-8"))
+    return digest.digest()
+
+
+def verify_password_cached(plain_password: str, hashed_password: str) -> bool:
+    """verify_password() that skips the KDF for a recently verified password.
+
+    Only successful checks are cached; failures always pay the full cost.
+    """
+    entry = _password_verify_cache_entry(plain_password, hashed_password)
+    now = time.monotonic()
+    with _password_verify_cache_lock:
+        valid_until = _password_verify_cache.get(entry)
+        if valid_until is not None:
+            if now < valid_until:
+                return True
+            del _password_verify_cache[entry]
+
+    if not verify_password(plain_password, hashed_password):
+        return False
+
+    with _password_verify_cache_lock:
+        _password_verify_cache[entry] = now + PASSWORD_VERIFY_CACHE_TTL_SECONDS
+        _password_verify_cache.move_to_end(entry)
+        while len(_password_verify_cache) > PASSWORD_VERIFY_CACHE_MAX_ENTRIES:
+            _password_verify_cache.popitem(last=False)
+    return True
+
+
+def clear_password_verify_cache() -> None:
+    with _password_verify_cache_lock:
+        _password_verify_cache.clear()
+
+
 def get_password_hash(password: str) -> str:
     salt = secrets.token_bytes(16)
     digest = hashlib.pbkdf2_hmac(
@@ -63,15 +114,21 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
-def decode_access_token(token: str) -> Optional[str]:
+def decode_access_token_payload(token: str) -> Optional[dict]:
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        username: str = payload.get("sub")
-        return username
+        return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
     except JWTError:
         return None
 
 
+def decode_access_token(token: str) -> Optional[str]:
+    payload = decode_access_token_payload(token)
+    if payload is None:
+        return None
+    username: str = payload.get("sub")
+    return username
+
+
 def default_admin_password_candidates() -> tuple[str, ...]:
     candidates: list[str] = []
     configured_default = str(getattr(settings, "ADMIN_PASSWORD", "") or "").strip()
@@ -86,7 +143,14 @@ def is_default_admin_password_hash(hashed_password: str) -> bool:
     normalized_hash = str(hashed_password or "").strip()
     if not normalized_hash:
         return False
+    return _matches_default_admin_password(normalized_hash)
+
+
+# The candidates come from static settings, so the answer only depends on the hash;
+# without this every admin login re-derives the KDF once per candidate.
+@lru_cache(maxsize=32)
+def _matches_default_admin_password(hashed_password: str) -> bool:
     for candidate in default_admin_password_candidates():
-        if verify_password(candidate, normalized_hash):
+        if verify_password(candidate, hashed_password):
             return True
     return False
@@ -0,0 +1,47 @@
+import logging
+import threading
+import time
+from typing import Optional
+
+from backend.database import SessionLocal
+from backend.models.general_settings import GeneralSettings
+
+logger = logging.getLogger(__name__)
+
+# The redirect policy is read on every plain-HTTP request; a short TTL bounds staleness
+# for writers that don't invalidate explicitly (e.g. a restored database).
+FORCE_HTTPS_CACHE_TTL_SECONDS = 5.0
+
+_force_https_cache: Optional[tuple[float, bool]] = None
+_force_https_cache_lock = threading.Lock()
+
+
+def get_cached_force_https() -> Optional[bool]:
+    """Return the cached force_https flag, or None when it must be reloaded."""
+    cached = _force_https_cache
+    if cached is None or time.monotonic() >= cached[0]:
+        return None
+    return cached[1]
+
+
+def load_force_https() -> bool:
+    """Read force_https from general settings and cache it (blocking; run off the event loop)."""
+    global _force_https_cache
+    try:
+        with SessionLocal() as db:
+            general = db.query(GeneralSettings).order_by(GeneralSettings.id.asc()).first()
+            force_https = bool(general and general.force_https)
+    except Exception as exc:
+        logger.warning("Failed to load force_https setting: %s", exc)
+        force_https = False
+
+    with _force_https_cache_lock:
+        _force_https_cache = (time.monotonic() + FORCE_HTTPS_CACHE_TTL_SECONDS, force_https)
+    return force_https
+
+
+def invalidate_force_https_cache() -> None:
+    """Drop the cached flag so the next request observes freshly saved settings."""
+    global _force_https_cache
+    with _force_https_cache_lock:
+        _force_https_cache = None
@@ -3,10 +3,11 @@
 
 from __future__ import annotations
 
+from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Iterator, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
-from backend.core.openvpn import OpenVPNManager, validate_openvpn_readiness
+from backend.core.openvpn import OpenVPNManager, qr_code_enabled_for_os, validate_openvpn_readiness
 from backend.services.protocols.base import BaseProtocolService
 
 
@@ -38,47 +39,10 @@ class OpenVPNService(BaseProtocolService):
     def kill_user(self, username: str) -> Dict[str, Any]:
         return self.stop_client(username)
 
-    def get_status(self, db: Optional[Any] = None) -> Dict[str, Any]:
+    def get_status(self, db: Optional[Any] = None, verbose: bool = False) -> Dict[str, Any]:
         _ = db
-        try:
-            resolved_service_name = self._manager._resolve_service_name()
-            if resolved_service_name:
-                self._manager.service_name = resolved_service_name
-        except Exception:
-            pass
-
-        status_result = self._manager.get_service_status()
-        service_name = str(status_result.get("service_name") or self._manager.service_name).strip()
-
-        if not service_name:
-            return status_result
-
-        try:
-            active_ok, active_stdout, _ = self._manager._run_command(
-                ["systemctl", "is-active", service_name],
-                check=False,
-            )
-            enabled_ok, enabled_stdout, _ = self._manager._run_command(
-                ["systemctl", "is-enabled", service_name],
-                check=False,
-            )
-
-            is_active = active_ok and str(active_stdout or "").strip().lower() == "active"
-            enabled_state = str(enabled_stdout or "").strip().lower()
-            is_enabled = enabled_ok and enabled_state in {"enabled", "static", "indirect", "generated"}
-
-            status_result.update(
-                {
-                    "success": True,
-                    "service_name": service_name,
-                    "is_active": bool(is_active),
-                    "is_enabled": bool(is_enabled),
-                }
-            )
-        except Exception:
-            pass
-
-        return status_result
+        # The manager memoizes the unit name; a cached poll costs no subprocess at all.
+        return self._manager.get_service_status(verbose=verbose)
 
     async def enforce_limits(self, db: Any) -> Dict[str, Any]:
         _ = db
@@ -97,8 +61,8 @@ class OpenVPNService(BaseProtocolService):
     def create_client_certificate(self, client_name: str) -> Dict[str, Any]:
         return self._manager.create_client_certificate(client_name)
 
-    def revoke_client_certificate(self, client_name: str) -> Dict[str, Any]:
-        return self._manager.revoke_client_certificate(client_name)
+    def revoke_client_certificate(self, client_name: str, revoked_at: Optional[datetime] = None) -> Dict[str, Any]:
+        return self._manager.revoke_client_certificate(client_name, revoked_at=revoked_at)
 
     def generate_client_config(self, client_name: str, **kwargs: Any) -> Optional[str]:
         return self._manager.generate_client_config(client_name=client_name, **kwargs)
@@ -106,8 +70,18 @@ class OpenVPNService(BaseProtocolService):
     def generate_qr_code(self, config_content: str) -> Optional[str]:
         return self._manager.generate_qr_code(config_content)
 
-    def control_service(self, action: str) -> Dict[str, Any]:
-        return self._manager.control_service(action)
+    def should_generate_qr(self, include_qr: bool, os_type: Optional[str] = None) -> bool:
+        """QR codes are opt-in and skipped entirely for desktop client platforms."""
+        return bool(include_qr) and qr_code_enabled_for_os(os_type)
+
+    def control_service(self, action: str, wait: bool = True) -> Dict[str, Any]:
+        return self._manager.control_service(action, wait=wait)
+
+    def invalidate_service_status_cache(self) -> None:
+        self._manager.invalidate_service_status_cache()
+
+    def invalidate_settings_cache(self) -> None:
+        self._manager.invalidate_settings_cache()
 
     def get_runtime_health(self) -> Dict[str, Any]:
         return self._manager.get_runtime_health()
@@ -115,7 +89,7 @@ class OpenVPNService(BaseProtocolService):
     def sync_auth_database_snapshot(self) -> Dict[str, Any]:
         return self._manager.sync_auth_database_snapshot()
 
-    def stream_ssl_issue_logs(self, domains: List[str], email: str) -> Iterator[str]:
+    def stream_ssl_issue_logs(self, domains: List[str], email: str) -> AsyncIterator[str]:
         return self._manager.stream_ssl_issue_logs(domains=domains, email=email)
 
     def sync_system_general_settings(
@@ -311,17 +311,12 @@ class SingBoxService(BaseProtocolService):
         raw_level = str(getattr(settings, "singbox_log_level", "info") or "info").strip().lower() if settings else "info"
         log_level = raw_level if raw_level in self._allowed_log_levels else "info"
 
-        vpn_users = (
+        active_users: list[VPNUser] = (
             db.query(VPNUser)
-            .filter(VPNUser.is_enabled.is_(True))
+            .filter(VPNUser.is_active)
             .order_by(VPNUser.id.asc())
             .all()
         )
-        active_users: list[VPNUser] = []
-        for user in vpn_users:
-            if not bool(getattr(user, "is_active", False)):
-                continue
-            active_users.append(user)
 
         def _user_uuid(user: VPNUser) -> str:
             candidate = getattr(user, "uuid", None)
@@ -244,7 +244,7 @@ After=network.target
 Type=simple
 WorkingDirectory=${PROJECT_ROOT}
 Environment=PYTHONPATH=${PROJECT_ROOT}
-ExecStart=${PROJECT_ROOT}/.venv/bin/uvicorn backend.main:app --host 0.0.0.0 --port 8000
+ExecStart=${PROJECT_ROOT}/.venv/bin/uvicorn backend.main:app --host 0.0.0.0 --port 8000 --loop uvloop --http httptools
 Restart=always
 RestartSec=3
 User=root
@@ -0,0 +1,14 @@
+import os
+import shutil
+import tempfile
+
+# Point the app at a throwaway data directory before any backend module builds its engine,
+# so running the suite never writes into data/. Assigned rather than defaulted so a
+# developer's environment or .env can't aim the tests at a real database.
+_TEST_DATA_DIR = tempfile.mkdtemp(prefix="atlas-tests-")
+os.environ["DATA_DIR"] = _TEST_DATA_DIR
+os.environ["DATABASE_URL"] = f"sqlite:///{_TEST_DATA_DIR}/atlas.db"
+
+
+def pytest_unconfigure(config):
+    shutil.rmtree(_TEST_DATA_DIR, ignore_errors=True)
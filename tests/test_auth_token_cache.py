@@ -0,0 +1,91 @@
+from types import SimpleNamespace
+
+import pytest
+from fastapi.security import HTTPAuthorizationCredentials
+from starlette.requests import Request
+
+import backend.dependencies as dependencies
+
+
+class _Clock:
+    def __init__(self):
+        self.wall = 1_000_000.0
+        self.mono = 50.0
+
+    def time(self):
+        return self.wall
+
+    def monotonic(self):
+        return self.mono
+
+    def advance(self, seconds):
+        self.wall += seconds
+        self.mono += seconds
+
+
+class _Result:
+    def scalar_one_or_none(self):
+        return None
+
+
+class _Session:
+    def __init__(self, admin):
+        self._admin = admin
+
+    def get(self, _model, admin_id):
+        return self._admin if admin_id == self._admin.id else None
+
+    def execute(self, *args, **kwargs):
+        return _Result()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake_clock = _Clock()
+    monkeypatch.setattr(dependencies, "time", fake_clock)
+    monkeypatch.setattr(dependencies, "_token_cache", type(dependencies._token_cache)())
+    return fake_clock
+
+
+def test_cached_token_expires_at_exp_claim(clock):
+    key = dependencies._token_cache_key("token-a")
+    dependencies._cache_admin_id(key, 7, clock.wall + 5)
+
+    assert dependencies._get_cached_admin_id(key) == 7
+    clock.advance(4.9)
+    assert dependencies._get_cached_admin_id(key) == 7
+    clock.advance(0.2)
+    assert dependencies._get_cached_admin_id(key) is None
+
+
+def test_cache_ttl_is_capped_and_expired_tokens_are_not_cached(clock):
+    key = dependencies._token_cache_key("token-b")
+    dependencies._cache_admin_id(key, 7, clock.wall + 3600)
+    clock.advance(dependencies.TOKEN_CACHE_TTL_SECONDS + 0.1)
+    assert dependencies._get_cached_admin_id(key) is None
+
+    stale_key = dependencies._token_cache_key("token-c")
+    dependencies._cache_admin_id(stale_key, 7, clock.wall - 1)
+    assert dependencies._get_cached_admin_id(stale_key) is None
+
+
+def test_get_current_user_skips_jwt_decode_while_cached(clock, monkeypatch):
+    admin = SimpleNamespace(id=7, username="admin", is_active=True)
+    decoded = []
+
+    def _decode(token):
+        decoded.append(token)
+        return {"sub": "admin", "uid": 7, "exp": clock.wall + 600}
+
+    monkeypatch.setattr(dependencies, "decode_access_token_payload", _decode)
+    request = Request({"type": "http", "headers": [], "client": ("127.0.0.1", 1234)})
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials="token-d")
+    session = _Session(admin)
+
+    assert dependencies.get_current_user(request, credentials, session) is admin
+    assert dependencies.get_current_user(request, credentials, session) is admin
+    assert decoded == ["token-d"]
+
+    clock.advance(dependencies.TOKEN_CACHE_TTL_SECONDS + 1)
+    assert dependencies.get_current_user(request, credentials, session) is admin
+    assert decoded == ["token-d", "token-d"]
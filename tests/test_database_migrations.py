@@ -0,0 +1,80 @@
+import sqlite3
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import Column, Integer, MetaData, String, Table, create_engine
+
+import backend.database as database
+
+
+@pytest.fixture
+def legacy_db(tmp_path, monkeypatch):
+    db_path = tmp_path / "atlas.db"
+    engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+    monkeypatch.setattr(database, "engine", engine)
+    monkeypatch.setattr(database, "MIGRATION_LOCK_PATH", tmp_path / ".migrate.lock")
+    monkeypatch.setattr(database, "_detect_public_ipv4", lambda: None)
+    yield db_path
+    engine.dispose()
+
+
+def _columns(connection, table_name):
+    return {row[1] for row in connection.execute(f"PRAGMA table_info({table_name})")}
+
+
+def test_schema_stamp_tracks_model_columns(monkeypatch):
+    metadata = MetaData()
+    table = Table("probe", metadata, Column("id", Integer, primary_key=True))
+    monkeypatch.setattr(database, "Base", SimpleNamespace(metadata=metadata))
+
+    before = database._schema_stamp()
+    table.append_column(Column("added", String(32), nullable=True))
+    after_column = database._schema_stamp()
+    monkeypatch.setattr(database, "SCHEMA_VERSION", database.SCHEMA_VERSION + 1)
+    after_bump = database._schema_stamp()
+
+    assert len({before, after_column, after_bump}) == 3
+    assert all(0 < stamp < 2 ** 31 for stamp in (before, after_column, after_bump))
+
+
+def test_populated_legacy_tables_are_altered_and_stamped(legacy_db):
+    connection = sqlite3.connect(str(legacy_db))
+    connection.execute(
+        "CREATE TABLE vpn_users (id INTEGER PRIMARY KEY, username VARCHAR(100) NOT NULL, password VARCHAR(255) NOT NULL)"
+    )
+    connection.execute("INSERT INTO vpn_users (username, password) VALUES ('alice', 'x')")
+    connection.execute("CREATE TABLE openvpn_settings (id INTEGER PRIMARY KEY, port INTEGER)")
+    connection.execute("INSERT INTO openvpn_settings (port) VALUES (1194)")
+    # Stamp from before the stamp was derived from the models.
+    connection.execute("PRAGMA user_version = 3")
+    connection.commit()
+
+    database.init_db()
+
+    assert set(database.VPN_USERS_COLUMN_MIGRATIONS) <= _columns(connection, "vpn_users")
+    row = connection.execute("SELECT username, vless_uuid, max_devices FROM vpn_users").fetchone()
+    assert row[0] == "alice" and row[1] and row[2] == 1
+
+    # The populated table is altered column by column from the model, not rebuilt.
+    assert set(database._model_column_migrations("openvpn_settings")) <= _columns(connection, "openvpn_settings")
+    row = connection.execute("SELECT port, spoofed_host, resolv_retry_mode FROM openvpn_settings").fetchone()
+    assert row == (1194, None, "infinite")
+
+    assert connection.execute("PRAGMA user_version").fetchone()[0] == database._schema_stamp()
+    connection.close()
+
+    # A second start at the current stamp is a no-op.
+    database.init_db()
+
+
+def test_empty_legacy_openvpn_settings_table_is_rebuilt_from_model(legacy_db):
+    connection = sqlite3.connect(str(legacy_db))
+    connection.execute("CREATE TABLE vpn_users (id INTEGER PRIMARY KEY, username VARCHAR(100), password VARCHAR(255))")
+    connection.execute("CREATE TABLE openvpn_settings (id INTEGER PRIMARY KEY, port INTEGER)")
+    connection.commit()
+
+    database.init_db()
+
+    expected = {column.name for column in database.Base.metadata.tables["openvpn_settings"].columns}
+    assert _columns(connection, "openvpn_settings") == expected
+    connection.close()
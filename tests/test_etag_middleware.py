@@ -0,0 +1,75 @@
+import asyncio
+
+from backend.config import settings
+from backend.main import ETagMiddleware
+
+
+def _json_app(body=b'{"users": []}', status=200, content_type=b"application/json", chunks=None):
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": status, "headers": [(b"content-type", content_type), (b"content-length", str(len(body)).encode())]})
+        if chunks:
+            for index, chunk in enumerate(chunks):
+                await send({"type": "http.response.body", "body": chunk, "more_body": index < len(chunks) - 1})
+        else:
+            await send({"type": "http.response.body", "body": body})
+
+    return app
+
+
+def _call(app, path=None, method="GET", headers=()):
+    scope = {
+        "type": "http",
+        "method": method,
+        "path": path or f"{settings.API_PREFIX}/users",
+        "headers": [(name.encode(), value.encode()) for name, value in headers],
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(ETagMiddleware(app)(scope, receive, send))
+    start = messages[0]
+    return start["status"], dict(start["headers"]), b"".join(m.get("body", b"") for m in messages[1:])
+
+
+def test_matching_if_none_match_returns_empty_304():
+    status, headers, body = _call(_json_app())
+    assert status == 200
+    assert body == b'{"users": []}'
+    etag = headers[b"etag"].decode()
+
+    status, headers, body = _call(_json_app(), headers=[("if-none-match", f'"other", {etag}')])
+    assert status == 304
+    assert body == b""
+    assert headers[b"etag"].decode() == etag
+    assert b"content-length" not in headers
+    assert b"content-type" not in headers
+
+
+def test_changed_body_gets_a_new_etag():
+    _, first, _ = _call(_json_app(b'{"a": 1}'))
+    status, second, body = _call(_json_app(b'{"a": 2}'), headers=[("if-none-match", first[b"etag"].decode())])
+    assert status == 200
+    assert body == b'{"a": 2}'
+    assert first[b"etag"] != second[b"etag"]
+
+
+def test_streamed_non_json_and_non_api_responses_pass_through():
+    status, headers, body = _call(_json_app(chunks=[b"data: 1\n\n", b"data: 2\n\n"], content_type=b"text/event-stream"))
+    assert (status, body, b"etag" in headers) == (200, b"data: 1\n\ndata: 2\n\n", False)
+
+    status, headers, body = _call(_json_app(chunks=[b"[1,", b"2]"]))
+    assert (status, body, b"etag" in headers) == (200, b"[1,2]", False)
+
+    status, headers, _ = _call(_json_app(status=404))
+    assert b"etag" not in headers
+
+    status, headers, _ = _call(_json_app(), path="/settings")
+    assert b"etag" not in headers
+
+    status, headers, _ = _call(_json_app(), method="POST")
+    assert b"etag" not in headers
@@ -0,0 +1,58 @@
+import gzip
+
+from starlette.requests import Request
+
+from backend.main import _accepts_gzip, _frontend_page_response
+
+
+def _request(*headers):
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/settings",
+            "headers": [(name.encode(), value.encode()) for name, value in headers],
+        }
+    )
+
+
+def test_accept_encoding_q_values():
+    assert _accepts_gzip("gzip, deflate, br") is True
+    assert _accepts_gzip("gzip;q=0") is False
+    assert _accepts_gzip("gzip;q=0, *") is False
+    assert _accepts_gzip("br, *;q=0.1") is True
+    assert _accepts_gzip("br") is False
+    assert _accepts_gzip("") is False
+
+
+def test_gzip_and_identity_variants_have_distinct_validators(tmp_path):
+    page = tmp_path / "page.html"
+    page.write_bytes(b"<html>" + b"x" * 4096 + b"</html>")
+
+    identity = _frontend_page_response(_request(), page)
+    compressed = _frontend_page_response(_request(("accept-encoding", "gzip")), page)
+
+    assert identity.headers.get("content-encoding") is None
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert gzip.decompress(compressed.body) == identity.body
+    assert identity.headers["etag"] != compressed.headers["etag"]
+
+    refused = _frontend_page_response(_request(("accept-encoding", "gzip;q=0")), page)
+    assert refused.headers.get("content-encoding") is None
+    assert refused.headers["etag"] == identity.headers["etag"]
+
+
+def test_if_none_match_only_matches_the_served_variant(tmp_path):
+    page = tmp_path / "page.html"
+    page.write_bytes(b"<html>" + b"x" * 4096 + b"</html>")
+    identity_etag = _frontend_page_response(_request(), page).headers["etag"]
+
+    revalidated = _frontend_page_response(_request(("if-none-match", identity_etag)), page)
+    assert revalidated.status_code == 304
+    assert revalidated.body == b""
+
+    other_variant = _frontend_page_response(
+        _request(("if-none-match", identity_etag), ("accept-encoding", "gzip")),
+        page,
+    )
+    assert other_variant.status_code == 200
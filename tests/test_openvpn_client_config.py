@@ -0,0 +1,35 @@
+from backend.core.openvpn import CLIENT_CONFIG_BUILDERS, QR_CODE_OS_TYPES, OpenVPNManager, qr_code_enabled_for_os
+
+
+def _inject(lines, redirect_gateway=False):
+    OpenVPNManager._inject_ipv6_client_directives(
+        lines,
+        server_ipv6="2001:db8::1",
+        server_port=1194,
+        redirect_gateway=redirect_gateway,
+    )
+    return lines
+
+
+def test_ipv6_remote_follows_primary_remote_wherever_it_is():
+    lines = _inject(["# header", "# extra header line", "client", "remote 203.0.113.1 1194", "nobind"])
+    assert lines[3:5] == ["remote 203.0.113.1 1194", "remote 2001:db8::1 1194"]
+
+    # remote-cert-tls is not a remote line.
+    lines = _inject(["client", "remote-cert-tls server", "remote 203.0.113.1 1194"])
+    assert lines[2:] == ["remote 203.0.113.1 1194", "remote 2001:db8::1 1194"]
+
+
+def test_ipv6_remote_is_not_duplicated():
+    lines = _inject(["client", "remote 2001:db8::1 1194", "nobind"], redirect_gateway=True)
+    assert lines.count("remote 2001:db8::1 1194") == 1
+    assert lines[-1] == "route-ipv6 2000::/3"
+
+    lines = _inject(["client", "remote 203.0.113.1 1194", "remote 2001:db8::1 1194"])
+    assert lines.count("remote 2001:db8::1 1194") == 1
+
+
+def test_qr_codes_only_for_platforms_with_a_mobile_builder():
+    assert QR_CODE_OS_TYPES <= set(CLIENT_CONFIG_BUILDERS)
+    assert qr_code_enabled_for_os(" iOS ") and qr_code_enabled_for_os(None)
+    assert not qr_code_enabled_for_os("mac_ios") and not qr_code_enabled_for_os("windows")
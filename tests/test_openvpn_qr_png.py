@@ -0,0 +1,74 @@
+import base64
+import struct
+import zlib
+
+import qrcode
+
+import backend.core.openvpn as openvpn_core
+
+
+def _decode_png(png_bytes):
+    assert png_bytes.startswith(openvpn_core.QR_PNG_SIGNATURE)
+    offset = len(openvpn_core.QR_PNG_SIGNATURE)
+    chunks = {}
+    while offset < len(png_bytes):
+        (length,) = struct.unpack(">I", png_bytes[offset:offset + 4])
+        chunk_type = png_bytes[offset + 4:offset + 8]
+        data = png_bytes[offset + 8:offset + 8 + length]
+        (crc,) = struct.unpack(">I", png_bytes[offset + 8 + length:offset + 12 + length])
+        assert crc == zlib.crc32(chunk_type + data)
+        chunks[chunk_type] = data
+        offset += 12 + length
+
+    width, height, bit_depth, color_type, _, _, _ = struct.unpack(">IIBBBBB", chunks[b"IHDR"])
+    assert (bit_depth, color_type) == (1, 0)
+    assert b"IEND" in chunks
+
+    raw = zlib.decompress(chunks[b"IDAT"])
+    row_bytes = (width + 7) // 8
+    assert len(raw) == height * (row_bytes + 1)
+    rows = []
+    for y in range(height):
+        scanline = raw[y * (row_bytes + 1):(y + 1) * (row_bytes + 1)]
+        assert scanline[0] == 0
+        bits = "".join(f"{byte:08b}" for byte in scanline[1:])[:width]
+        rows.append([bit == "0" for bit in bits])  # dark pixels are 0 in greyscale
+    return rows
+
+
+def _sample_modules(pixels, module_count, box_size, border):
+    return [
+        [pixels[(border + row) * box_size + box_size // 2][(border + col) * box_size + box_size // 2] for col in range(module_count)]
+        for row in range(module_count)
+    ]
+
+
+def test_png_encoder_round_trips_module_matrix():
+    modules = [[(row * 7 + col * 3) % 5 == 0 for col in range(21)] for row in range(21)]
+
+    pixels = _decode_png(openvpn_core._encode_qr_png(modules, box_size=3, border=2))
+
+    assert len(pixels) == (21 + 4) * 3
+    assert _sample_modules(pixels, 21, 3, 2) == modules
+    assert not any(pixels[0]) and not any(pixels[-1])
+
+
+def test_rendered_data_uri_matches_qrcode_matrix():
+    config = "client\nremote vpn.example.com 1194 udp\n" + "x" * 300
+    payload = config.encode("utf-8")
+
+    data_uri = openvpn_core.render_qr_data_uri(config)
+    prefix = openvpn_core.PNG_DATA_URI_PREFIX.decode("ascii")
+    assert data_uri.startswith(prefix)
+    pixels = _decode_png(base64.b64decode(data_uri[len(prefix):]))
+
+    reference = qrcode.QRCode(
+        version=openvpn_core._qr_version_for_payload(payload),
+        error_correction=openvpn_core.QR_ERROR_CORRECTION,
+        mask_pattern=openvpn_core.QR_MASK_PATTERN,
+    )
+    reference.add_data(payload, optimize=0)
+    reference.make(fit=False)
+    expected = [[bool(module) for module in row] for row in reference.modules]
+
+    assert _sample_modules(pixels, len(expected), openvpn_core.QR_BOX_SIZE, openvpn_core.QR_BORDER) == expected
@@ -0,0 +1,137 @@
+from types import SimpleNamespace
+
+import backend.core.openvpn as openvpn_core
+from backend.core.openvpn import OpenVPNManager
+
+
+class _FakeUnitInterface:
+    """Replays (Job, ActiveState) snapshots like a pystemd unit during a queued job."""
+
+    def __init__(self, snapshots):
+        self._snapshots = list(snapshots)
+        self.queued = []
+
+    def _queue(self, mode):
+        self.queued.append(mode)
+
+    Start = Stop = ReloadOrRestart = _queue
+
+    @property
+    def Job(self):
+        return self._snapshots[0][0]
+
+    @property
+    def ActiveState(self):
+        state = self._snapshots[0][1]
+        if len(self._snapshots) > 1:
+            self._snapshots.pop(0)
+        return state
+
+
+def _build_manager(monkeypatch, snapshots=None):
+    monkeypatch.setattr(openvpn_core, "IS_LINUX", False)
+    monkeypatch.setattr(openvpn_core, "SERVICE_JOB_POLL_INTERVAL_SECONDS", 0)
+    manager = OpenVPNManager()
+    unit = SimpleNamespace(Unit=_FakeUnitInterface(snapshots)) if snapshots else None
+    monkeypatch.setattr(manager, "_get_systemd_unit", lambda: unit)
+    return manager, unit
+
+
+def test_blocking_restart_reports_unit_that_failed_to_start(monkeypatch):
+    manager, unit = _build_manager(
+        monkeypatch,
+        [((1, b"/job/1"), b"active"), ((1, b"/job/1"), b"activating"), ((0, b"/"), b"failed")],
+    )
+
+    result = manager.control_service("restart")
+
+    assert unit.Unit.queued == [b"replace"]
+    assert result["success"] is False
+    assert "failed" in result["message"]
+
+
+def test_blocking_restart_waits_for_job_to_finish(monkeypatch):
+    manager, _ = _build_manager(
+        monkeypatch,
+        [((1, b"/job/1"), b"active"), ((1, b"/job/1"), b"activating"), ((0, b"/"), b"active")],
+    )
+
+    result = manager.control_service("restart")
+
+    assert result["success"] is True
+    assert result["message"] == "Service restart completed"
+
+
+def test_blocking_wait_is_capped_while_the_job_keeps_running(monkeypatch):
+    manager, _ = _build_manager(monkeypatch, [((1, b"/job/1"), b"reloading")])
+    monkeypatch.setattr(openvpn_core, "SERVICE_JOB_SETTLE_TIMEOUT_SECONDS", 0)
+
+    result = manager.control_service("restart")
+
+    assert result["success"] is True
+    assert result["message"] == "Service restart still in progress"
+
+
+def test_systemctl_fallback_never_blocks_on_the_job(monkeypatch):
+    manager, _ = _build_manager(monkeypatch)
+    commands = []
+    monkeypatch.setattr(
+        manager,
+        "_run_command",
+        lambda command, **kwargs: (commands.append(command), (True, b"", b""))[1],
+    )
+
+    queued = manager.control_service("restart", wait=False)
+    blocking = manager.control_service("restart")
+
+    assert commands == [["systemctl", "--no-block", "reload-or-restart", manager.service_name]] * 2
+    assert queued["message"] == "Service restart queued"
+    assert blocking["message"] == "Service restart completed"
+
+
+def test_systemctl_fallback_polls_the_queued_job(monkeypatch):
+    manager, _ = _build_manager(monkeypatch)
+    manager.is_production = True
+    show_outputs = [b"ActiveState=reloading\nJob=42\n", b"ActiveState=failed\nJob=\n"]
+    commands = []
+
+    def fake_run_command(command, **kwargs):
+        commands.append(command)
+        if command[1] == "show":
+            return True, show_outputs.pop(0), b""
+        return True, b"", b""
+
+    monkeypatch.setattr(manager, "_run_command", fake_run_command)
+
+    result = manager.control_service("restart")
+
+    assert commands[0][:3] == ["systemctl", "--no-block", "reload-or-restart"]
+    assert [command[1] for command in commands[1:]] == ["show", "show"]
+    assert result["success"] is False
+    assert result["message"] == "Service restart failed: unit is failed"
+
+
+def test_status_polls_reuse_memoized_unit_name(monkeypatch):
+    manager, _ = _build_manager(monkeypatch)
+    manager.is_production = True
+    resolutions = []
+    monkeypatch.setattr(
+        manager,
+        "_resolve_service_name",
+        lambda: (resolutions.append(1), "openvpn-server@server")[1],
+    )
+    monkeypatch.setattr(
+        manager,
+        "_run_command",
+        lambda command, **kwargs: (True, b"ActiveState=active\nUnitFileState=enabled\n", b""),
+    )
+
+    for _ in range(3):
+        manager.invalidate_service_status_cache()
+        assert manager.get_service_status()["is_active"] is True
+    assert resolutions == []
+
+    manager.control_service("restart")
+    manager.get_service_status()
+    manager.get_service_status()
+    assert resolutions == [1]
@@ -0,0 +1,56 @@
+from types import SimpleNamespace
+
+import pytest
+
+import backend.services.auth_service as auth_service
+
+
+@pytest.fixture
+def counted_verify(monkeypatch):
+    calls = []
+    original = auth_service.verify_password
+
+    def _verify(plain_password, hashed_password):
+        calls.append(plain_password)
+        return original(plain_password, hashed_password)
+
+    monkeypatch.setattr(auth_service, "verify_password", _verify)
+    auth_service.clear_password_verify_cache()
+    yield calls
+    auth_service.clear_password_verify_cache()
+
+
+def test_successful_verification_is_reused(counted_verify):
+    hashed = auth_service.get_password_hash("s3cret-pass")
+
+    assert auth_service.verify_password_cached("s3cret-pass", hashed) is True
+    assert auth_service.verify_password_cached("s3cret-pass", hashed) is True
+    assert counted_verify == ["s3cret-pass"]
+
+
+def test_failures_are_never_cached(counted_verify):
+    hashed = auth_service.get_password_hash("s3cret-pass")
+
+    assert auth_service.verify_password_cached("wrong", hashed) is False
+    assert auth_service.verify_password_cached("wrong", hashed) is False
+    assert counted_verify == ["wrong", "wrong"]
+
+
+def test_entry_does_not_survive_a_password_change(counted_verify):
+    old_hash = auth_service.get_password_hash("s3cret-pass")
+    assert auth_service.verify_password_cached("s3cret-pass", old_hash) is True
+
+    new_hash = auth_service.get_password_hash("another-pass")
+    assert auth_service.verify_password_cached("s3cret-pass", new_hash) is False
+
+
+def test_entries_expire_after_ttl(counted_verify, monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(auth_service, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    hashed = auth_service.get_password_hash("s3cret-pass")
+
+    auth_service.verify_password_cached("s3cret-pass", hashed)
+    now[0] += auth_service.PASSWORD_VERIFY_CACHE_TTL_SECONDS + 1
+    auth_service.verify_password_cached("s3cret-pass", hashed)
+
+    assert counted_verify == ["s3cret-pass", "s3cret-pass"]
@@ -0,0 +1,36 @@
+import sqlite3
+
+from backend.routers.system import _remove_sqlite_sidecars, _snapshot_sqlite_database
+
+
+def test_snapshot_includes_commits_still_in_wal(tmp_path):
+    db_path = tmp_path / "atlas.db"
+    writer = sqlite3.connect(str(db_path))
+    try:
+        writer.execute("PRAGMA journal_mode=WAL")
+        writer.execute("PRAGMA wal_autocheckpoint=0")
+        writer.execute("CREATE TABLE items (name TEXT)")
+        writer.execute("INSERT INTO items VALUES ('only-in-wal')")
+        writer.commit()
+        assert (tmp_path / "atlas.db-wal").stat().st_size > 0
+
+        snapshot_path = tmp_path / "snapshot.db"
+        _snapshot_sqlite_database(db_path, snapshot_path)
+    finally:
+        writer.close()
+
+    snapshot = sqlite3.connect(str(snapshot_path))
+    try:
+        assert snapshot.execute("SELECT name FROM items").fetchall() == [("only-in-wal",)]
+    finally:
+        snapshot.close()
+
+
+def test_remove_sidecars_drops_wal_and_shm_only(tmp_path):
+    db_path = tmp_path / "atlas.db"
+    for name in ("atlas.db", "atlas.db-wal", "atlas.db-shm"):
+        (tmp_path / name).write_bytes(b"x")
+
+    _remove_sqlite_sidecars(db_path)
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["atlas.db"]